@@ -0,0 +1,84 @@
+"""Memory used by ``FsNode`` objects of a large listing, does not require Nextcloud instance."""
+
+import email.utils
+import sys
+import tracemalloc
+from time import perf_counter
+
+from nc_py_api.files import FsNode, FsNodeTable
+
+RECORDS = 200_000
+
+
+class DictFsNodeInfo:
+    """``FsNodeInfo`` as it was before: with ``__dict__`` and parsing of the ``last_modified`` in constructor."""
+
+    def __init__(self, **kwargs):
+        self.size = kwargs.get("size", 0)
+        self.content_length = kwargs.get("content_length", 0)
+        self.permissions = kwargs.get("permissions", "")
+        self.favorite = kwargs.get("favorite", False)
+        self.fileid = kwargs.get("fileid", 0)
+        self._last_modified = email.utils.parsedate_to_datetime(kwargs["last_modified"])
+
+
+class DictFsNode:
+    def __init__(self, full_path: str, **kwargs):
+        self.full_path = full_path
+        self.file_id = kwargs.get("file_id", "")
+        self.etag = kwargs.get("etag", "")
+        self.info = DictFsNodeInfo(**kwargs)
+
+
+def create_nodes(fs_node_class, intern_permissions: bool) -> list:
+    return [
+        fs_node_class(
+            f"files/admin/folder/file_{i}.txt",
+            file_id=f"{i:08d}ocxxxxxxx",
+            etag=f'"{i:032x}"',
+            size=i,
+            content_length=i,
+            fileid=i,
+            permissions=sys.intern("RGDNVW") if intern_permissions else "RGDNVW"[:-1] + "W",
+            favorite=False,
+            last_modified=f"Sat, 29 Jul 2023 11:{i % 60:02d}:31 GMT",
+        )
+        for i in range(RECORDS)
+    ]
+
+
+def create_table(*_) -> FsNodeTable:
+    table = FsNodeTable()
+    for i in range(RECORDS):
+        table.append(
+            f"files/admin/folder/file_{i}.txt",
+            size=i,
+            content_length=i,
+            fileid=i,
+            permissions=sys.intern("RGDNVW"),
+            favorite=False,
+            last_modified=f"Sat, 29 Jul 2023 11:{i % 60:02d}:31 GMT",
+        )
+    return table
+
+
+def measure(fs_node_class, intern_permissions: bool, create=create_nodes) -> tuple[int, float]:
+    start_time = perf_counter()
+    create(fs_node_class, intern_permissions)
+    end_time = perf_counter()
+    tracemalloc.start()
+    nodes = create(fs_node_class, intern_permissions)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(nodes) == RECORDS
+    return used // (1024 * 1024), round(end_time - start_time, 3)
+
+
+if __name__ == "__main__":
+    print(f"{RECORDS} nodes")
+    memory, time = measure(DictFsNode, False)
+    print(f"dict, eager last_modified: {memory} Mb, {time}s")
+    memory, time = measure(FsNode, True)
+    print(f"slots, lazy last_modified: {memory} Mb, {time}s")
+    memory, time = measure(None, True, create_table)
+    print(f"FsNodeTable: {memory} Mb, {time}s")
@@ -0,0 +1,86 @@
+"""Micro-benchmark of the multistatus response parsing, does not require Nextcloud instance."""
+
+import tracemalloc
+from json import dumps, loads
+from time import perf_counter
+from urllib.parse import unquote
+
+import xmltodict
+
+from nc_py_api.files import FsNode
+from nc_py_api.files._files import iter_parse_webdav_response
+
+RECORDS = 100_000
+ITERS = 3
+DAV_URL_SUFFIX = "/remote.php/dav"
+
+
+def generate_response(records: int) -> bytes:
+    response = [
+        '<?xml version="1.0"?>'
+        '<d:multistatus xmlns:d="DAV:" xmlns:s="http://sabredav.org/ns" xmlns:oc="http://owncloud.org/ns"'
+        ' xmlns:nc="http://nextcloud.org/ns">'
+    ]
+    for i in range(records):
+        response.append(
+            f"<d:response><d:href>/remote.php/dav/files/admin/folder/file_{i}.txt</d:href><d:propstat><d:prop>"
+            "<d:getlastmodified>Sat, 29 Jul 2023 11:56:31 GMT</d:getlastmodified>"
+            f"<d:getcontentlength>{i}</d:getcontentlength><d:resourcetype/>"
+            f'<d:getetag>"{i:032x}"</d:getetag><oc:size>{i}</oc:size><oc:id>{i:08d}ocxxxxxxx</oc:id>'
+            f"<oc:fileid>{i}</oc:fileid><oc:permissions>RGDNVW</oc:permissions><oc:favorite>0</oc:favorite>"
+            "</d:prop><d:status>HTTP/1.1 200 OK</d:status></d:propstat></d:response>"
+        )
+    response.append("</d:multistatus>")
+    return "".join(response).encode("utf-8")
+
+
+def xmltodict_parse(body: bytes) -> list[FsNode]:
+    """The way responses were parsed before the streaming parser."""
+    response_data = loads(dumps(xmltodict.parse(body.decode("utf-8"))))
+    result = []
+    for record in response_data["d:multistatus"]["d:response"]:
+        full_path = unquote(record["d:href"]).replace(DAV_URL_SUFFIX, "").lstrip("/")
+        prop = record["d:propstat"]["d:prop"]
+        result.append(
+            FsNode(
+                full_path,
+                file_id=prop["oc:id"],
+                fileid=int(prop["oc:fileid"]),
+                size=int(prop["oc:size"]),
+                content_length=int(prop["d:getcontentlength"]),
+                etag=prop["d:getetag"],
+                last_modified=prop["d:getlastmodified"],
+                permissions=prop["oc:permissions"],
+                favorite=bool(int(prop["oc:favorite"])),
+            )
+        )
+    return result
+
+
+def streaming_parse(body: bytes) -> list[FsNode]:
+    chunks = (body[i : i + 65536] for i in range(0, len(body), 65536))
+    return list(iter_parse_webdav_response(DAV_URL_SUFFIX, chunks, "benchmark"))
+
+
+def measure(parse, body: bytes) -> float:
+    start_time = perf_counter()
+    for _ in range(ITERS):
+        assert len(parse(body)) == RECORDS
+    return round((perf_counter() - start_time) / ITERS, 3)
+
+
+def measure_peak_memory(parse, body: bytes) -> int:
+    tracemalloc.start()
+    parse(body)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak // (1024 * 1024)
+
+
+if __name__ == "__main__":
+    response_body = generate_response(RECORDS)
+    print(f"{RECORDS} records, {len(response_body) // (1024 * 1024)} Mb, {ITERS} iters")
+    print(f"xmltodict: {measure(xmltodict_parse, response_body)}s")
+    print(f"streaming: {measure(streaming_parse, response_body)}s")
+    print(f"xmltodict peak memory: {measure_peak_memory(xmltodict_parse, response_body)} Mb")
+    print(f"streaming peak memory: {measure_peak_memory(streaming_parse, response_body)} Mb")
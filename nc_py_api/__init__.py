@@ -7,6 +7,15 @@ from ._exceptions import (
     NextcloudMissingCapabilities,
 )
 from ._version import __version__
-from .files import FilePermissions, FsNode
+from .files import (
+    DownloadCache,
+    FilePermissions,
+    FilesCache,
+    FsNode,
+    FsNodeTable,
+    SearchQuery,
+    SyncPlan,
+    TransferStats,
+)
 from .files.sharing import ShareType
-from .nextcloud import Nextcloud, NextcloudApp
+from .nextcloud import AsyncNextcloud, AsyncNextcloudApp, Nextcloud, NextcloudApp
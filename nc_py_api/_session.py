@@ -3,18 +3,19 @@
 import asyncio
 import hmac
 from abc import ABC, abstractmethod
-from collections.abc import Iterator
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from contextlib import AbstractAsyncContextManager
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import IntEnum
 from hashlib import sha256
 from json import dumps, loads
 from os import environ
-from typing import Optional, TypedDict, Union
+from typing import Optional, TypedDict, Union, cast
 from urllib.parse import quote, urlencode
 
 from fastapi import Request
-from httpx import Client
+from httpx import AsyncClient, Client
 from httpx import Headers as HttpxHeaders
 from httpx import Limits, ReadTimeout, Response
 
@@ -133,8 +134,33 @@ class AppConfig(BasicConfig):
         self.app_secret = self._get_config_value("app_secret", **kwargs).encode("UTF-8")
 
 
-class NcSessionBasic(ABC):
-    adapter: Client
+class _BufferContent:
+    """Request body sent as the slices of a buffer.
+
+    It is not a generator, so httpx iterates it again when it follows a redirect that resends the body.
+    """
+
+    def __init__(self, data: memoryview):
+        self.data = data
+
+    def __iter__(self) -> Iterator[memoryview]:
+        for i in range(0, self.data.nbytes, 1024 * 1024):
+            yield self.data[i : i + 1024 * 1024]
+
+
+class _AsyncBufferContent:
+    """Same as :py:class:`_BufferContent`, for ``httpx.AsyncClient``, which accepts only async iterables."""
+
+    def __init__(self, data: memoryview):
+        self.data = data
+
+    async def __aiter__(self) -> AsyncIterator[memoryview]:
+        for i in range(0, self.data.nbytes, 1024 * 1024):
+            yield self.data[i : i + 1024 * 1024]
+
+
+class NcSessionBase(ABC):
+    adapter: Union[AsyncClient, Client]
     cfg: BasicConfig
     user: str
     custom_headers: dict
@@ -150,6 +176,93 @@ class NcSessionBasic(ABC):
         self.init_adapter()
         self.response_headers = HttpxHeaders()
 
+    def init_adapter(self, restart=False) -> None:
+        if getattr(self, "adapter", None) is None or restart:
+            self.adapter = self._create_adapter()
+            self.adapter.headers.update({"OCS-APIRequest": "true"})
+            if self.custom_headers:
+                self.adapter.headers.update(self.custom_headers)
+            if options.XDEBUG_SESSION:
+                self.adapter.cookies.set("XDEBUG_SESSION", options.XDEBUG_SESSION)
+            self._capabilities = {}
+
+    @abstractmethod
+    def _create_adapter(self) -> Union[AsyncClient, Client]:
+        pass  # pragma: no cover
+
+    @property
+    def ae_url(self) -> str:
+        """Return base url for the App Ecosystem endpoints."""
+        return "/ocs/v1.php/apps/app_ecosystem_v2/api/v1"
+
+    @staticmethod
+    def _ocs_prepare(
+        path: str,
+        params: Optional[dict],
+        data: Optional[Union[bytes, str]],
+        json: Optional[Union[dict, list]],
+        headers: dict,
+    ) -> tuple[str, Optional[bytes]]:
+        if params is None:
+            params = {}
+        params.update({"format": "json"})
+        data_bytes = None
+        if data is not None:
+            data_bytes = data.encode("UTF-8") if isinstance(data, str) else data
+        elif json is not None:
+            headers.update({"Content-Type": "application/json"})
+            data_bytes = dumps(json).encode("utf-8")
+        return f"{quote(path)}?{urlencode(params, True)}", data_bytes
+
+    def _ocs_response(self, response: Response, info: str) -> dict:
+        self.response_headers = response.headers
+        check_error(response.status_code, info)
+        return loads(response.text)["ocs"]
+
+    @staticmethod
+    def _ocs_password_confirmation_required(ocs_meta: dict) -> bool:
+        return (
+            ocs_meta["status"] != "ok"
+            and ocs_meta["statuscode"] == 403
+            and str(ocs_meta["message"]).lower().find("password confirmation is required") != -1
+        )
+
+    @staticmethod
+    def _ocs_data(ocs_response: dict, info: str):
+        ocs_meta = ocs_response["meta"]
+        if ocs_meta["status"] != "ok":
+            if ocs_meta["statuscode"] in (404, OCSRespond.RESPOND_NOT_FOUND):
+                raise NextcloudExceptionNotFound(reason=ocs_meta["message"], info=info)
+            raise NextcloudException(status_code=ocs_meta["statuscode"], reason=ocs_meta["message"], info=info)
+        return ocs_response["data"]
+
+    def data_hasher(self):
+        """Returns a new hash object for the request bodies if the requests are signed, otherwise ``None``.
+
+        Allows hashing the body while reading it, its ``hexdigest`` is then passed to ``dav`` as **data_hash**.
+        """
+        return None
+
+    @staticmethod
+    def _data_as_bytes(data: Optional[Union[str, bytes, memoryview]]) -> Optional[Union[bytes, memoryview]]:
+        if data is None:
+            return None
+        return data.encode("UTF-8") if isinstance(data, str) else data
+
+    def _parse_server_version(self) -> ServerVersion:
+        v = self._capabilities["version"]
+        return ServerVersion(
+            major=v["major"],
+            minor=v["minor"],
+            micro=v["micro"],
+            string=v["string"],
+            extended_support=v["extendedSupport"],
+        )
+
+
+class NcSessionBasic(NcSessionBase, ABC):
+    adapter: Client
+
     def __del__(self):
         if hasattr(self, "adapter") and self.adapter:
             self.adapter.close()
@@ -175,18 +288,9 @@ class NcSessionBasic(ABC):
         json: Optional[Union[dict, list]] = None,
         **kwargs,
     ):
-        method = method.upper()
-        if params is None:
-            params = {}
-        params.update({"format": "json"})
         headers = kwargs.pop("headers", {})
-        data_bytes = None
-        if data is not None:
-            data_bytes = data.encode("UTF-8") if isinstance(data, str) else data
-        elif json is not None:
-            headers.update({"Content-Type": "application/json"})
-            data_bytes = dumps(json).encode("utf-8")
-        return self._ocs(method, f"{quote(path)}?{urlencode(params, True)}", headers, data=data_bytes, **kwargs)
+        path_params, data_bytes = self._ocs_prepare(path, params, data, json, headers)
+        return self._ocs(method.upper(), path_params, headers, data=data_bytes, **kwargs)
 
     def _ocs(self, method: str, path_params: str, headers: dict, data: Optional[bytes], **kwargs):
         self.init_adapter()
@@ -204,67 +308,59 @@ class NcSessionBasic(ABC):
         except ReadTimeout:
             raise NextcloudException(408, info=info) from None
 
-        self.response_headers = response.headers
-        check_error(response.status_code, info)
-        response_data = loads(response.text)
-        ocs_meta = response_data["ocs"]["meta"]
-        if ocs_meta["status"] != "ok":
-            if (
-                not nested_req
-                and ocs_meta["statuscode"] == 403
-                and str(ocs_meta["message"]).lower().find("password confirmation is required") != -1
-            ):
-                self.adapter.close()
-                self.init_adapter(restart=True)
-                return self._ocs(method, path_params, headers, data, **kwargs, nested_req=True)
-            if ocs_meta["statuscode"] in (404, OCSRespond.RESPOND_NOT_FOUND):
-                raise NextcloudExceptionNotFound(reason=ocs_meta["message"], info=info)
-            raise NextcloudException(status_code=ocs_meta["statuscode"], reason=ocs_meta["message"], info=info)
-        return response_data["ocs"]["data"]
+        ocs_response = self._ocs_response(response, info)
+        if not nested_req and self._ocs_password_confirmation_required(ocs_response["meta"]):
+            self.init_adapter(restart=True)
+            return self._ocs(method, path_params, headers, data, **kwargs, nested_req=True)
+        return self._ocs_data(ocs_response, info)
 
-    def dav(self, method: str, path: str, data: Optional[Union[str, bytes]] = None, **kwargs) -> Response:
+    def dav(self, method: str, path: str, data: Optional[Union[str, bytes, memoryview]] = None, **kwargs) -> Response:
         headers = kwargs.pop("headers", {})
-        data_bytes = None
-        if data is not None:
-            data_bytes = data.encode("UTF-8") if isinstance(data, str) else data
+        data_bytes = self._data_as_bytes(data)
         return self._dav(method, quote(self.cfg.dav_url_suffix + path), headers, data_bytes, **kwargs)
 
     def dav_stream(
-        self, method: str, path: str, data: Optional[Union[str, bytes]] = None, **kwargs
+        self, method: str, path: str, data: Optional[Union[str, bytes, memoryview]] = None, **kwargs
     ) -> Iterator[Response]:
         headers = kwargs.pop("headers", {})
-        data_bytes = None
-        if data is not None:
-            data_bytes = data.encode("UTF-8") if isinstance(data, str) else data
+        data_bytes = self._data_as_bytes(data)
         return self._dav_stream(method, quote(self.cfg.dav_url_suffix + path), headers, data_bytes, **kwargs)
 
-    def _dav(self, method: str, path: str, headers: dict, data: Optional[bytes], **kwargs) -> Response:
+    def _dav(
+        self, method: str, path: str, headers: dict, data: Optional[Union[bytes, memoryview]], **kwargs
+    ) -> Response:
         self.init_adapter()
         timeout = kwargs.pop("timeout", self.cfg.options.timeout_dav)
+        kwargs.pop("data_hash", None)  # used only to sign the requests
+        content = self._dav_content(headers, data)
         result = self.adapter.request(
-            method, self.cfg.endpoint + path, headers=headers, content=data, timeout=timeout, **kwargs
+            method, self.cfg.endpoint + path, headers=headers, content=content, timeout=timeout, **kwargs
         )
         self.response_headers = result.headers
         return result
 
-    def _dav_stream(self, method: str, path: str, headers: dict, data: Optional[bytes], **kwargs) -> Iterator[Response]:
+    def _dav_stream(
+        self, method: str, path: str, headers: dict, data: Optional[Union[bytes, memoryview]], **kwargs
+    ) -> Iterator[Response]:
         self.init_adapter()
         timeout = kwargs.pop("timeout", self.cfg.options.timeout_dav)
+        kwargs.pop("data_hash", None)  # used only to sign the requests
+        content = self._dav_content(headers, data)
         return self.adapter.stream(
-            method, self.cfg.endpoint + path, headers=headers, content=data, timeout=timeout, **kwargs
+            method, self.cfg.endpoint + path, headers=headers, content=content, timeout=timeout, **kwargs
         )
 
+    @staticmethod
+    def _dav_content(headers: dict, data: Optional[Union[bytes, memoryview]]) -> Union[bytes, Iterable[bytes], None]:
+        if not isinstance(data, memoryview):
+            return data
+        headers["Content-Length"] = str(data.nbytes)  # httpx sends buffers, other than bytes, only as iterables
+        return cast(Iterable[bytes], _BufferContent(data))  # the slices are written to the socket as they are
+
     def init_adapter(self, restart=False) -> None:
-        if getattr(self, "adapter", None) is None or restart:
-            if restart and hasattr(self, "adapter"):
-                self.adapter.close()
-            self.adapter = self._create_adapter()
-            self.adapter.headers.update({"OCS-APIRequest": "true"})
-            if self.custom_headers:
-                self.adapter.headers.update(self.custom_headers)
-            if options.XDEBUG_SESSION:
-                self.adapter.cookies.set("XDEBUG_SESSION", options.XDEBUG_SESSION)
-            self._capabilities = {}
+        if restart and getattr(self, "adapter", None) is not None:
+            self.adapter.close()
+        super().init_adapter(restart=restart)
 
     @abstractmethod
     def _create_adapter(self) -> Client:
@@ -283,19 +379,128 @@ class NcSessionBasic(ABC):
     def nc_version(self) -> ServerVersion:
         if not self._capabilities:
             self.update_server_info()
-        v = self._capabilities["version"]
-        return ServerVersion(
-            major=v["major"],
-            minor=v["minor"],
-            micro=v["micro"],
-            string=v["string"],
-            extended_support=v["extendedSupport"],
+        return self._parse_server_version()
+
+
+class AsyncNcSessionBasic(NcSessionBase, ABC):
+    adapter: AsyncClient
+
+    def get_stream(self, path: str, params: Optional[dict] = None, **kwargs) -> AbstractAsyncContextManager[Response]:
+        return self._get_stream(
+            f"{quote(path)}?{urlencode(params, True)}" if params else quote(path), kwargs.get("headers", {}), **kwargs
         )
 
-    @property
-    def ae_url(self) -> str:
-        """Return base url for the App Ecosystem endpoints."""
-        return "/ocs/v1.php/apps/app_ecosystem_v2/api/v1"
+    def _get_stream(self, path_params: str, headers: dict, **kwargs) -> AbstractAsyncContextManager[Response]:
+        self.init_adapter()
+        timeout = kwargs.pop("timeout", self.cfg.options.timeout)
+        return self.adapter.stream(
+            "GET", f"{self.cfg.endpoint}{path_params}", headers=headers, timeout=timeout, **kwargs
+        )
+
+    async def ocs(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict] = None,
+        data: Optional[Union[bytes, str]] = None,
+        json: Optional[Union[dict, list]] = None,
+        **kwargs,
+    ):
+        headers = kwargs.pop("headers", {})
+        path_params, data_bytes = self._ocs_prepare(path, params, data, json, headers)
+        return await self._ocs(method.upper(), path_params, headers, data=data_bytes, **kwargs)
+
+    async def _ocs(self, method: str, path_params: str, headers: dict, data: Optional[bytes], **kwargs):
+        self.init_adapter()
+        url_params = f"{self.cfg.endpoint}{path_params}"
+        info = f"request: method={method}, url={url_params}"
+        nested_req = kwargs.pop("nested_req", False)
+        try:
+            timeout = kwargs.pop("timeout", self.cfg.options.timeout)
+            if method == "GET":
+                response = await self.adapter.get(url_params, headers=headers, timeout=timeout, **kwargs)
+            else:
+                response = await self.adapter.request(
+                    method, url_params, headers=headers, content=data, timeout=timeout, **kwargs
+                )
+        except ReadTimeout:
+            raise NextcloudException(408, info=info) from None
+
+        ocs_response = self._ocs_response(response, info)
+        if not nested_req and self._ocs_password_confirmation_required(ocs_response["meta"]):
+            await self.adapter.aclose()
+            self.init_adapter(restart=True)
+            return await self._ocs(method, path_params, headers, data, **kwargs, nested_req=True)
+        return self._ocs_data(ocs_response, info)
+
+    async def dav(
+        self, method: str, path: str, data: Optional[Union[str, bytes, memoryview]] = None, **kwargs
+    ) -> Response:
+        headers = kwargs.pop("headers", {})
+        data_bytes = self._data_as_bytes(data)
+        return await self._dav(method, quote(self.cfg.dav_url_suffix + path), headers, data_bytes, **kwargs)
+
+    def dav_stream(
+        self, method: str, path: str, data: Optional[Union[str, bytes, memoryview]] = None, **kwargs
+    ) -> AbstractAsyncContextManager[Response]:
+        headers = kwargs.pop("headers", {})
+        data_bytes = self._data_as_bytes(data)
+        return self._dav_stream(method, quote(self.cfg.dav_url_suffix + path), headers, data_bytes, **kwargs)
+
+    async def _dav(
+        self, method: str, path: str, headers: dict, data: Optional[Union[bytes, memoryview]], **kwargs
+    ) -> Response:
+        self.init_adapter()
+        timeout = kwargs.pop("timeout", self.cfg.options.timeout_dav)
+        kwargs.pop("data_hash", None)  # used only to sign the requests
+        content = self._dav_content(headers, data)
+        result = await self.adapter.request(
+            method, self.cfg.endpoint + path, headers=headers, content=content, timeout=timeout, **kwargs
+        )
+        self.response_headers = result.headers
+        return result
+
+    def _dav_stream(
+        self, method: str, path: str, headers: dict, data: Optional[Union[bytes, memoryview]], **kwargs
+    ) -> AbstractAsyncContextManager[Response]:
+        self.init_adapter()
+        timeout = kwargs.pop("timeout", self.cfg.options.timeout_dav)
+        kwargs.pop("data_hash", None)  # used only to sign the requests
+        content = self._dav_content(headers, data)
+        return self.adapter.stream(
+            method, self.cfg.endpoint + path, headers=headers, content=content, timeout=timeout, **kwargs
+        )
+
+    @staticmethod
+    def _dav_content(
+        headers: dict, data: Optional[Union[bytes, memoryview]]
+    ) -> Union[bytes, AsyncIterable[bytes], None]:
+        if not isinstance(data, memoryview):
+            return data
+        headers["Content-Length"] = str(data.nbytes)  # httpx sends buffers, other than bytes, only as iterables
+        return cast(AsyncIterable[bytes], _AsyncBufferContent(data))  # the slices are written to the socket as they are
+
+    async def close(self) -> None:
+        """Closes the underlying ``httpx.AsyncClient`` and all its connections."""
+        if getattr(self, "adapter", None) is not None:
+            await self.adapter.aclose()
+
+    @abstractmethod
+    def _create_adapter(self) -> AsyncClient:
+        pass  # pragma: no cover
+
+    async def update_server_info(self) -> None:
+        self._capabilities = await self.ocs(method="GET", path="/ocs/v1.php/cloud/capabilities")
+
+    async def capabilities(self) -> dict:
+        if not self._capabilities:
+            await self.update_server_info()
+        return self._capabilities["capabilities"]
+
+    async def nc_version(self) -> ServerVersion:
+        if not self._capabilities:
+            await self.update_server_info()
+        return self._parse_server_version()
 
 
 class NcSession(NcSessionBasic):
@@ -309,51 +514,58 @@ class NcSession(NcSessionBasic):
         return Client(auth=self.cfg.auth, follow_redirects=True, limits=self.limits, verify=self.cfg.options.nc_cert)
 
 
-class NcSessionApp(NcSessionBasic):
-    cfg: AppConfig
+class AsyncNcSession(AsyncNcSessionBasic):
+    cfg: Config
 
     def __init__(self, **kwargs):
-        self.cfg = AppConfig(**kwargs)
-        super().__init__(**kwargs)
+        self.cfg = Config(**kwargs)
+        super().__init__(user=self.cfg.auth[0])
 
-    def _get_stream(self, path_params: str, headers: dict, **kwargs) -> Iterator[Response]:
-        self.sign_request("GET", path_params, headers, None)
-        return super()._get_stream(path_params, headers, **kwargs)
+    def _create_adapter(self) -> AsyncClient:
+        return AsyncClient(
+            auth=self.cfg.auth, follow_redirects=True, limits=self.limits, verify=self.cfg.options.nc_cert
+        )
 
-    def _ocs(self, method: str, path_params: str, headers: dict, data: Optional[bytes], **kwargs):
-        self.sign_request(method, path_params, headers, data)
-        return super()._ocs(method, path_params, headers, data, **kwargs)
 
-    def _dav(self, method: str, path: str, headers: dict, data: Optional[bytes], **kwargs) -> Response:
-        self.sign_request(method, path, headers, data)
-        return super()._dav(method, path, headers, data, **kwargs)
+class NcSessionAppBasic(ABC):
+    cfg: AppConfig
+    adapter: Union[AsyncClient, Client]
+    user: str
 
-    def _dav_stream(self, method: str, path: str, headers: dict, data: Optional[bytes], **kwargs) -> Iterator[Response]:
-        self.sign_request(method, path, headers, data)
-        return super()._dav_stream(method, path, headers, data, **kwargs)
+    def __init__(self, **kwargs):
+        self.cfg = AppConfig(**kwargs)
+        super().__init__(**kwargs)
 
-    def _create_adapter(self) -> Client:
-        adapter = Client(follow_redirects=True, limits=self.limits, verify=self.cfg.options.nc_cert)
-        adapter.headers.update(
-            {
-                "AE-VERSION": self.cfg.ae_version,
-                "EX-APP-ID": self.cfg.app_name,
-                "EX-APP-VERSION": self.cfg.app_version,
-            }
-        )
-        return adapter
+    def _app_adapter_headers(self) -> dict:
+        return {
+            "AE-VERSION": self.cfg.ae_version,
+            "EX-APP-ID": self.cfg.app_name,
+            "EX-APP-VERSION": self.cfg.app_version,
+        }
 
-    def sign_request(self, method: str, url_params: str, headers: dict, data: Optional[bytes]) -> None:
-        data_hash = xxh64()
-        if data and method != "GET":
-            data_hash.update(data)
+    def data_hasher(self):
+        return xxh64()
+
+    def sign_request(
+        self,
+        method: str,
+        url_params: str,
+        headers: dict,
+        data: Optional[Union[bytes, memoryview]],
+        data_hash: Optional[str] = None,
+    ) -> None:
+        if data_hash is None:
+            hasher = xxh64()
+            if data and method != "GET":
+                hasher.update(data)
+            data_hash = hasher.hexdigest()
 
         sign_headers = {
             "AE-VERSION": self.adapter.headers.get("AE-VERSION"),
             "EX-APP-ID": self.adapter.headers.get("EX-APP-ID"),
             "EX-APP-VERSION": self.adapter.headers.get("EX-APP-VERSION"),
             "NC-USER-ID": self.user,
-            "AE-DATA-HASH": data_hash.hexdigest(),
+            "AE-DATA-HASH": data_hash,
             "AE-SIGN-TIME": str(int(datetime.now(timezone.utc).timestamp())),
         }
         if not sign_headers["NC-USER-ID"]:
@@ -375,7 +587,8 @@ class NcSessionApp(NcSessionBasic):
         if "NC-USER-ID" in sign_headers:
             headers["NC-USER-ID"] = sign_headers["NC-USER-ID"]
 
-    def sign_check(self, request: Request) -> None:
+    def _sign_check_headers(self, request: Request) -> str:
+        """Checks everything in the request except the body and returns the expected ``AE-DATA-HASH`` value."""
         current_time = int(datetime.now(timezone.utc).timestamp())
         headers = {
             "AE-VERSION": request.headers.get("AE-VERSION", ""),
@@ -408,13 +621,83 @@ class NcSessionApp(NcSessionBasic):
         request_ae_sign = request.headers.get("AE-SIGNATURE", "")
         if hmac_sign != request_ae_sign:
             raise ValueError(f"Invalid AE-SIGNATURE:{hmac_sign} != {request_ae_sign}")
+        if headers["EX-APP-ID"] != self.cfg.app_name:
+            raise ValueError(f"Invalid EX-APP-ID:{headers['EX-APP-ID']} != {self.cfg.app_name}")
+        return headers["AE-DATA-HASH"]
 
+    @staticmethod
+    def _sign_check_data(data: bytes, expected_hash: str) -> None:
         data_hash = xxh64()
-        data = asyncio.run(request.body())
         if data:
             data_hash.update(data)
         ae_data_hash = data_hash.hexdigest()
-        if ae_data_hash != headers["AE-DATA-HASH"]:
-            raise ValueError(f"Invalid AE-DATA-HASH:{ae_data_hash} !={headers['AE-DATA-HASH']}")
-        if headers["EX-APP-ID"] != self.cfg.app_name:
-            raise ValueError(f"Invalid EX-APP-ID:{headers['EX-APP-ID']} != {self.cfg.app_name}")
+        if ae_data_hash != expected_hash:
+            raise ValueError(f"Invalid AE-DATA-HASH:{ae_data_hash} !={expected_hash}")
+
+
+class NcSessionApp(NcSessionAppBasic, NcSessionBasic):
+    cfg: AppConfig
+    adapter: Client
+
+    def _get_stream(self, path_params: str, headers: dict, **kwargs) -> Iterator[Response]:
+        self.sign_request("GET", path_params, headers, None)
+        return super()._get_stream(path_params, headers, **kwargs)
+
+    def _ocs(self, method: str, path_params: str, headers: dict, data: Optional[bytes], **kwargs):
+        self.sign_request(method, path_params, headers, data)
+        return super()._ocs(method, path_params, headers, data, **kwargs)
+
+    def _dav(
+        self, method: str, path: str, headers: dict, data: Optional[Union[bytes, memoryview]], **kwargs
+    ) -> Response:
+        self.sign_request(method, path, headers, data, kwargs.pop("data_hash", None))
+        return super()._dav(method, path, headers, data, **kwargs)
+
+    def _dav_stream(
+        self, method: str, path: str, headers: dict, data: Optional[Union[bytes, memoryview]], **kwargs
+    ) -> Iterator[Response]:
+        self.sign_request(method, path, headers, data, kwargs.pop("data_hash", None))
+        return super()._dav_stream(method, path, headers, data, **kwargs)
+
+    def _create_adapter(self) -> Client:
+        adapter = Client(follow_redirects=True, limits=self.limits, verify=self.cfg.options.nc_cert)
+        adapter.headers.update(self._app_adapter_headers())
+        return adapter
+
+    def sign_check(self, request: Request) -> None:
+        expected_hash = self._sign_check_headers(request)
+        self._sign_check_data(asyncio.run(request.body()), expected_hash)
+
+
+class AsyncNcSessionApp(NcSessionAppBasic, AsyncNcSessionBasic):
+    cfg: AppConfig
+    adapter: AsyncClient
+
+    def _get_stream(self, path_params: str, headers: dict, **kwargs) -> AbstractAsyncContextManager[Response]:
+        self.sign_request("GET", path_params, headers, None)
+        return super()._get_stream(path_params, headers, **kwargs)
+
+    async def _ocs(self, method: str, path_params: str, headers: dict, data: Optional[bytes], **kwargs):
+        self.sign_request(method, path_params, headers, data)
+        return await super()._ocs(method, path_params, headers, data, **kwargs)
+
+    async def _dav(
+        self, method: str, path: str, headers: dict, data: Optional[Union[bytes, memoryview]], **kwargs
+    ) -> Response:
+        self.sign_request(method, path, headers, data, kwargs.pop("data_hash", None))
+        return await super()._dav(method, path, headers, data, **kwargs)
+
+    def _dav_stream(
+        self, method: str, path: str, headers: dict, data: Optional[Union[bytes, memoryview]], **kwargs
+    ) -> AbstractAsyncContextManager[Response]:
+        self.sign_request(method, path, headers, data, kwargs.pop("data_hash", None))
+        return super()._dav_stream(method, path, headers, data, **kwargs)
+
+    def _create_adapter(self) -> AsyncClient:
+        adapter = AsyncClient(follow_redirects=True, limits=self.limits, verify=self.cfg.options.nc_cert)
+        adapter.headers.update(self._app_adapter_headers())
+        return adapter
+
+    async def sign_check(self, request: Request) -> None:
+        expected_hash = self._sign_check_headers(request)
+        self._sign_check_data(await request.body(), expected_hash)
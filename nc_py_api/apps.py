@@ -4,7 +4,7 @@ import dataclasses
 import typing
 
 from ._misc import require_capabilities
-from ._session import NcSessionBasic
+from ._session import AsyncNcSessionBasic, NcSessionBasic
 
 
 @dataclasses.dataclass
@@ -128,3 +128,104 @@ class _AppsAPI:
         if not app_id:
             raise ValueError("`app_id` parameter can not be empty")
         return app_id in [i.app_id for i in self.ex_app_get_list() if not i.enabled]
+
+
+class _AsyncAppsAPI:
+    """The class provides the async application management API on the Nextcloud server."""
+
+    _ep_base: str = "/ocs/v1.php/cloud/apps"
+
+    def __init__(self, session: AsyncNcSessionBasic):
+        self._session = session
+
+    async def disable(self, app_id: str) -> None:
+        """Disables the application.
+
+        .. note:: Does not work in NextcloudApp mode, only for Nextcloud client mode.
+        """
+        if not app_id:
+            raise ValueError("`app_id` parameter can not be empty")
+        await self._session.ocs(method="DELETE", path=f"{self._ep_base}/{app_id}")
+
+    async def enable(self, app_id: str) -> None:
+        """Enables the application.
+
+        .. note:: Does not work in NextcloudApp mode, only for Nextcloud client mode.
+        """
+        if not app_id:
+            raise ValueError("`app_id` parameter can not be empty")
+        await self._session.ocs(method="POST", path=f"{self._ep_base}/{app_id}")
+
+    async def get_list(self, enabled: typing.Optional[bool] = None) -> list[str]:
+        """Get the list of installed applications.
+
+        :param enabled: filter to list all/only enabled/only disabled applications.
+        """
+        params = None
+        if enabled is not None:
+            params = {"filter": "enabled" if enabled else "disabled"}
+        result = await self._session.ocs(method="GET", path=self._ep_base, params=params)
+        return list(result["apps"].values()) if isinstance(result["apps"], dict) else result["apps"]
+
+    async def is_installed(self, app_id: str) -> bool:
+        """Returns ``True`` if specified application is installed."""
+        if not app_id:
+            raise ValueError("`app_id` parameter can not be empty")
+        return app_id in await self.get_list()
+
+    async def is_enabled(self, app_id: str) -> bool:
+        """Returns ``True`` if specified application is enabled."""
+        if not app_id:
+            raise ValueError("`app_id` parameter can not be empty")
+        return app_id in await self.get_list(enabled=True)
+
+    async def is_disabled(self, app_id: str) -> bool:
+        """Returns ``True`` if specified application is disabled."""
+        if not app_id:
+            raise ValueError("`app_id` parameter can not be empty")
+        return app_id in await self.get_list(enabled=False)
+
+    async def ex_app_disable(self, app_id: str) -> None:
+        """Disables the external application.
+
+        .. note:: Does not work in NextcloudApp mode, only for Nextcloud client mode.
+        """
+        if not app_id:
+            raise ValueError("`app_id` parameter can not be empty")
+        await self._session.ocs(
+            method="PUT", path=f"{self._session.ae_url}/ex-app/{app_id}/enabled", json={"enabled": 0}
+        )
+
+    async def ex_app_enable(self, app_id: str) -> None:
+        """Enables the external application.
+
+        .. note:: Does not work in NextcloudApp mode, only for Nextcloud client mode.
+        """
+        if not app_id:
+            raise ValueError("`app_id` parameter can not be empty")
+        await self._session.ocs(
+            method="PUT", path=f"{self._session.ae_url}/ex-app/{app_id}/enabled", json={"enabled": 1}
+        )
+
+    async def ex_app_get_list(self, enabled: bool = False) -> list[ExAppInfo]:
+        """Gets information of the enabled external applications installed on the server.
+
+        :param enabled: Flag indicating whether to return only enabled applications or all applications.
+            Default = **False**.
+        """
+        require_capabilities("app_ecosystem_v2", await self._session.capabilities())
+        url_param = "enabled" if enabled else "all"
+        r = await self._session.ocs(method="GET", path=f"{self._session.ae_url}/ex-app/{url_param}")
+        return [ExAppInfo(i) for i in r]
+
+    async def ex_app_is_enabled(self, app_id: str) -> bool:
+        """Returns ``True`` if specified external application is enabled."""
+        if not app_id:
+            raise ValueError("`app_id` parameter can not be empty")
+        return app_id in [i.app_id for i in await self.ex_app_get_list(True)]
+
+    async def ex_app_is_disabled(self, app_id: str) -> bool:
+        """Returns ``True`` if specified external application is disabled."""
+        if not app_id:
+            raise ValueError("`app_id` parameter can not be empty")
+        return app_id in [i.app_id for i in await self.ex_app_get_list() if not i.enabled]
@@ -1,11 +1,14 @@
 """FastAPI directly related stuff."""
 
-from typing import Annotated, Callable, Optional
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Annotated, Optional, Union
 
 from fastapi import Depends, FastAPI, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 
-from ..nextcloud import NextcloudApp
+from ..nextcloud import AsyncNextcloudApp, NextcloudApp
 
 
 def nc_app(request: Request) -> NextcloudApp:
@@ -19,29 +22,55 @@ def nc_app(request: Request) -> NextcloudApp:
     return nextcloud_app
 
 
+async def anc_app(request: Request) -> AsyncNextcloudApp:
+    """Async Authentication handler for requests from Nextcloud to the application."""
+    user = request.headers.get("NC-USER-ID", "")
+    request_id = request.headers.get("AE-REQUEST-ID", None)
+    headers = {"AE-REQUEST-ID": request_id} if request_id else {}
+    nextcloud_app = AsyncNextcloudApp(user=user, headers=headers)
+    if not await nextcloud_app.request_sign_check(request):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    return nextcloud_app
+
+
 def set_handlers(
     fast_api_app: FastAPI,
-    enabled_handler: Callable[[bool, NextcloudApp], str],
-    heartbeat_handler: Optional[Callable[[], str]] = None,
+    enabled_handler: Union[Callable[[bool, NextcloudApp], str], Callable[[bool, AsyncNextcloudApp], Awaitable[str]]],
+    heartbeat_handler: Optional[Union[Callable[[], str], Callable[[], Awaitable[str]]]] = None,
 ):
     """Defines handlers for the application.
 
     :param fast_api_app: FastAPI() call return value.
     :param enabled_handler: ``Required``, callback which will be called for `enabling`/`disabling` app event.
+        If it is a coroutine function, it receives :py:class:`~nc_py_api.nextcloud.AsyncNextcloudApp`.
     :param heartbeat_handler: Optional, callback that will be called for the `heartbeat` deploy event.
     """
+    if asyncio.iscoroutinefunction(enabled_handler):
+
+        @fast_api_app.put("/enabled")
+        async def enabled_callback(
+            enabled: bool,
+            nc: Annotated[AsyncNextcloudApp, Depends(anc_app)],
+        ):
+            r = await enabled_handler(enabled, nc)  # type: ignore
+            return JSONResponse(content={"error": r}, status_code=200)
+
+    else:
 
-    @fast_api_app.put("/enabled")
-    def enabled_callback(
-        enabled: bool,
-        nc: Annotated[NextcloudApp, Depends(nc_app)],
-    ):
-        r = enabled_handler(enabled, nc)
-        return JSONResponse(content={"error": r}, status_code=200)
+        @fast_api_app.put("/enabled")
+        def enabled_callback_sync(
+            enabled: bool,
+            nc: Annotated[NextcloudApp, Depends(nc_app)],
+        ):
+            r = enabled_handler(enabled, nc)  # type: ignore
+            return JSONResponse(content={"error": r}, status_code=200)
 
     @fast_api_app.get("/heartbeat")
-    def heartbeat_callback():
+    async def heartbeat_callback():
         return_status = "ok"
         if heartbeat_handler is not None:
-            return_status = heartbeat_handler()
+            if asyncio.iscoroutinefunction(heartbeat_handler):
+                return_status = await heartbeat_handler()
+            else:
+                return_status = await run_in_threadpool(heartbeat_handler)  # type: ignore
         return JSONResponse(content={"status": return_status}, status_code=200)
@@ -7,7 +7,7 @@ from pydantic import BaseModel
 
 from ..._exceptions import NextcloudExceptionNotFound
 from ..._misc import require_capabilities
-from ..._session import NcSessionApp
+from ..._session import AsyncNcSessionApp, NcSessionApp
 from ...files import FilePermissions, FsNode
 
 ENDPOINT_SUFFIX = "files/actions/menu"
@@ -88,6 +88,21 @@ class UiFileActionHandlerInfo(BaseModel):
     """Information about the file on which the action run."""
 
 
+def _register_params(name: str, display_name: str, callback_url: str, **kwargs) -> dict:
+    return {
+        "fileActionMenuParams": {
+            "name": name,
+            "display_name": display_name,
+            "mime": kwargs.get("mime", "file"),
+            "permissions": kwargs.get("permissions", 31),
+            "order": kwargs.get("order", 0),
+            "icon": kwargs.get("icon", ""),
+            "icon_class": kwargs.get("icon_class", "icon-app-ecosystem-v2"),
+            "action_handler": callback_url,
+        },
+    }
+
+
 class _UiFilesActionsAPI:
     """API for the drop-down menu in Nextcloud **Files app**."""
 
@@ -97,18 +112,7 @@ class _UiFilesActionsAPI:
     def register(self, name: str, display_name: str, callback_url: str, **kwargs) -> None:
         """Registers the files a dropdown menu element."""
         require_capabilities("app_ecosystem_v2", self._session.capabilities)
-        params = {
-            "fileActionMenuParams": {
-                "name": name,
-                "display_name": display_name,
-                "mime": kwargs.get("mime", "file"),
-                "permissions": kwargs.get("permissions", 31),
-                "order": kwargs.get("order", 0),
-                "icon": kwargs.get("icon", ""),
-                "icon_class": kwargs.get("icon_class", "icon-app-ecosystem-v2"),
-                "action_handler": callback_url,
-            },
-        }
+        params = _register_params(name, display_name, callback_url, **kwargs)
         self._session.ocs(method="POST", path=f"{self._session.ae_url}/{ENDPOINT_SUFFIX}", json=params)
 
     def unregister(self, name: str, not_fail=True) -> None:
@@ -120,3 +124,26 @@ class _UiFilesActionsAPI:
         except NextcloudExceptionNotFound as e:
             if not not_fail:
                 raise e from None
+
+
+class _AsyncUiFilesActionsAPI:
+    """Async API for the drop-down menu in Nextcloud **Files app**."""
+
+    def __init__(self, session: AsyncNcSessionApp):
+        self._session = session
+
+    async def register(self, name: str, display_name: str, callback_url: str, **kwargs) -> None:
+        """Registers the files a dropdown menu element."""
+        require_capabilities("app_ecosystem_v2", await self._session.capabilities())
+        params = _register_params(name, display_name, callback_url, **kwargs)
+        await self._session.ocs(method="POST", path=f"{self._session.ae_url}/{ENDPOINT_SUFFIX}", json=params)
+
+    async def unregister(self, name: str, not_fail=True) -> None:
+        """Removes files dropdown menu element."""
+        require_capabilities("app_ecosystem_v2", await self._session.capabilities())
+        params = {"fileActionMenuName": name}
+        try:
+            await self._session.ocs(method="DELETE", path=f"{self._session.ae_url}/{ENDPOINT_SUFFIX}", json=params)
+        except NextcloudExceptionNotFound as e:
+            if not not_fail:
+                raise e from None
@@ -2,8 +2,8 @@
 
 from dataclasses import dataclass
 
-from ..._session import NcSessionApp
-from .files import _UiFilesActionsAPI
+from ..._session import AsyncNcSessionApp, NcSessionApp
+from .files import _AsyncUiFilesActionsAPI, _UiFilesActionsAPI
 
 
 @dataclass
@@ -15,3 +15,14 @@ class UiApi:
 
     def __init__(self, session: NcSessionApp):
         self.files_dropdown_menu = _UiFilesActionsAPI(session)
+
+
+@dataclass
+class AsyncUiApi:
+    """Class that encapsulates all UI functionality(async)."""
+
+    files_dropdown_menu: _AsyncUiFilesActionsAPI
+    """File dropdown menu API."""
+
+    def __init__(self, session: AsyncNcSessionApp):
+        self.files_dropdown_menu = _AsyncUiFilesActionsAPI(session)
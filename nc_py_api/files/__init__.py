@@ -1,15 +1,33 @@
 """APIs related to Files and Shares."""
 
+import array
+import collections
+import contextlib
 import dataclasses
 import datetime
 import email.utils
 import enum
+import functools
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import time
 import typing
+import xml.sax.saxutils
 
 
 @dataclasses.dataclass
-class FsNodeInfo:
-    """Extra FS object attributes from Nextcloud."""
+class FsNodeInfo:  # pylint: disable=too-many-instance-attributes
+    """Extra FS object attributes from Nextcloud.
+
+    .. note:: Attributes, that were not requested with the **properties** argument of the listings,
+        are unavailable: accessing them raises ``AttributeError``, use ``hasattr`` to check.
+        Objects are compared by their available attributes.
+    """
+
+    __slots__ = ("size", "content_length", "permissions", "favorite", "fileid", "_last_modified", "_checksums")
 
     size: int
     """Length of file in bytes, zero for directories.."""
@@ -21,7 +39,8 @@ class FsNodeInfo:
     """Flag indicating if the object is marked as favorite."""
     fileid: int
     """Clear file ID without Nextcloud instance ID."""
-    _last_modified: datetime.datetime
+    last_modified: datetime.datetime  # pylint: disable=declare-non-slot # property, stored parsed on first access
+    checksums: dict[str, str]  # pylint: disable=declare-non-slot
 
     def __init__(self, **kwargs):
         self.size = kwargs.get("size", 0)
@@ -29,25 +48,58 @@ class FsNodeInfo:
         self.permissions = kwargs.get("permissions", "")
         self.favorite = kwargs.get("favorite", False)
         self.fileid = kwargs.get("fileid", 0)
-        try:
-            self.last_modified = kwargs.get("last_modified", datetime.datetime(1970, 1, 1))
-        except (ValueError, TypeError):
-            self.last_modified = datetime.datetime(1970, 1, 1)
+        self._last_modified: typing.Union[str, datetime.datetime] = kwargs.get(
+            "last_modified", datetime.datetime(1970, 1, 1)
+        )
+        self._checksums: typing.Union[str, dict[str, str]] = kwargs.get("checksums", "")
+        for i in kwargs.get("unavailable", ()):
+            delattr(self, f"_{i}" if i in ("last_modified", "checksums") else i)
 
-    @property
+    def __getattr__(self, name: str):  # called only for the attributes that are not set
+        if name.lstrip("_") in _FS_NODE_INFO_FIELDS:
+            raise AttributeError(f"`{name.lstrip('_')}` is not available, its property was not requested.")
+        raise AttributeError(f"'FsNodeInfo' object has no attribute '{name}'")
+
+    def __repr__(self):
+        fields = (f"{i}={getattr(self, i)!r}" for i in _FS_NODE_INFO_FIELDS if hasattr(self, i))
+        return f"FsNodeInfo({', '.join(fields)})"
+
+    def __eq__(self, other):
+        if not isinstance(other, FsNodeInfo):
+            return NotImplemented
+        return all(getattr(self, i, None) == getattr(other, i, None) for i in _FS_NODE_INFO_FIELDS)
+
+    @property  # type: ignore[no-redef]
     def last_modified(self) -> datetime.datetime:
         """Time when the object was last modified.
 
         .. note:: ETag is a more preferable way to check if the object was changed.
         """
+        if isinstance(self._last_modified, str):  # parsing is deferred until the first access
+            try:
+                self._last_modified = email.utils.parsedate_to_datetime(self._last_modified)
+            except (ValueError, TypeError):
+                self._last_modified = datetime.datetime(1970, 1, 1)
         return self._last_modified
 
     @last_modified.setter
     def last_modified(self, value: typing.Union[str, datetime.datetime]):
-        if isinstance(value, str):
-            self._last_modified = email.utils.parsedate_to_datetime(value)
-        else:
-            self._last_modified = value
+        self._last_modified = value
+
+    @property  # type: ignore[no-redef]
+    def checksums(self) -> dict[str, str]:
+        """Checksums of the file known to the server, like ``{"SHA1": "<hex digest>"}``.
+
+        .. note:: Nextcloud keeps the checksums provided by the clients, see **verify** argument of the uploads.
+        """
+        if isinstance(self._checksums, str):  # parsing is deferred until the first access
+            self._checksums = {
+                k.upper(): v.lower() for k, _, v in (i.partition(":") for i in self._checksums.split()) if v
+            }
+        return self._checksums
+
+
+_FS_NODE_INFO_FIELDS = ("size", "content_length", "permissions", "favorite", "fileid", "last_modified", "checksums")
 
 
 @dataclasses.dataclass
@@ -57,6 +109,8 @@ class FsNode:
     Acceptable itself as a ``path`` parameter for the most file APIs.
     """
 
+    __slots__ = ("full_path", "file_id", "etag", "info")
+
     full_path: str
     """Path to the object, including the username. Does not include `dav` prefix"""
 
@@ -83,7 +137,8 @@ class FsNode:
     def __str__(self):
         return (
             f"{'Dir' if self.is_dir else 'File'}: `{self.name}` with id={self.file_id}"
-            f" last modified at {str(self.info.last_modified)} and {self.info.permissions} permissions."
+            f" last modified at {str(getattr(self.info, 'last_modified', 'unknown time'))}"
+            f" and {getattr(self.info, 'permissions', 'unknown')} permissions."
         )
 
     def __eq__(self, other):
@@ -164,3 +219,428 @@ class FilePermissions(enum.IntFlag):
     """Access to remove object(s)"""
     PERMISSION_SHARE = 16
     """Access to re-share object(s)"""
+
+
+@functools.lru_cache(maxsize=64)
+def permissions_to_mask(permissions: str) -> int:
+    """Converts Nextcloud permissions string, like ``RGDNVW``, to the :py:class:`FilePermissions` bitmask."""
+    mask = 0
+    if permissions.find("G") != -1:
+        mask |= FilePermissions.PERMISSION_READ
+    if permissions.find("W") != -1 or permissions.find("NV") != -1:
+        mask |= FilePermissions.PERMISSION_UPDATE
+    if permissions.find("CK") != -1:
+        mask |= FilePermissions.PERMISSION_CREATE
+    if permissions.find("D") != -1:
+        mask |= FilePermissions.PERMISSION_DELETE
+    if permissions.find("R") != -1:
+        mask |= FilePermissions.PERMISSION_SHARE
+    return int(mask)
+
+
+class FsNodeTable:
+    """Columnar representation of the file system objects, that does not create an object for each of them.
+
+    Each column is an ``array.array`` (or list of interned strings for paths) where the same index refers to the same
+    object, so aggregations like ``sum(table.size)`` run without per-file Python objects.
+    """
+
+    __slots__ = ("full_path", "fileid", "size", "content_length", "last_modified", "permissions", "favorite", "is_dir")
+
+    full_path: list[str]
+    """Paths to the objects, including the username. Does not include `dav` prefix. Strings are interned."""
+    fileid: array.array
+    """Clear file IDs without Nextcloud instance ID"""
+    size: array.array
+    """Length of files in bytes, for directories it is size of all content in it"""
+    content_length: array.array
+    """Length of files in bytes, zero for directories"""
+    last_modified: array.array
+    """Time when the objects were last modified, as POSIX timestamp"""
+    permissions: array.array
+    """Permissions of the objects as :py:class:`FilePermissions` bitmask"""
+    favorite: array.array
+    """Flags indicating if the objects are marked as favorite"""
+    is_dir: array.array
+    """Flags indicating if the objects are directories"""
+
+    def __init__(self):
+        self.full_path = []
+        self.fileid = array.array("q")
+        self.size = array.array("q")
+        self.content_length = array.array("q")
+        self.last_modified = array.array("d")
+        self.permissions = array.array("B")
+        self.favorite = array.array("B")
+        self.is_dir = array.array("B")
+
+    def __len__(self):
+        return len(self.full_path)
+
+    def append(self, full_path: str, **kwargs) -> None:
+        """Adds a new row, accepts the same arguments as :py:class:`FsNode`."""
+        self.full_path.append(sys.intern(full_path))
+        self.fileid.append(kwargs.get("fileid", 0))
+        self.size.append(kwargs.get("size", 0))
+        self.content_length.append(kwargs.get("content_length", 0))
+        self.last_modified.append(_timestamp(kwargs.get("last_modified", 0)))
+        self.permissions.append(permissions_to_mask(kwargs.get("permissions", "")))
+        self.favorite.append(kwargs.get("favorite", False))
+        self.is_dir.append(full_path.endswith("/"))
+
+    def remove(self, index: int) -> None:
+        """Removes the row with the specified index."""
+        for i in self.__slots__:
+            del getattr(self, i)[index]
+
+    def as_numpy(self) -> dict:
+        """Returns the columns as NumPy arrays sharing memory with this table, paths are returned as is.
+
+        .. note:: Requires the ``numpy`` package to be installed.
+        """
+        import numpy  # pylint: disable=import-outside-toplevel
+
+        return {
+            i: (
+                getattr(self, i)
+                if i == "full_path"
+                else numpy.frombuffer(getattr(self, i), dtype=getattr(self, i).typecode)
+            )
+            for i in self.__slots__
+        }
+
+
+def _timestamp(value: typing.Union[str, datetime.datetime, int, float]) -> float:
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        parsed = email.utils.parsedate_tz(value)
+        return float(email.utils.mktime_tz(parsed)) if parsed else 0.0
+    return float(value)
+
+
+class SearchQuery:
+    """Conditions for :py:meth:`~nc_py_api.files.files.FilesAPI.find`, converted to XML only once.
+
+    Conditions are comparisons of the properties, like ``SearchQuery.prop("size") > 1024`` or
+    ``SearchQuery.prop("name").like("%.txt")``, combined with ``&``, ``|`` and ``~``. Values can be placeholders,
+    like ``SearchQuery.param("name")``, filled from the ``params`` of the search, so one query is reused
+    for different values.
+    """
+
+    PROPERTIES: typing.ClassVar[dict[str, str]] = {
+        "name": "d:displayname",  # like, eq
+        "mime": "d:getcontenttype",  # like, eq
+        "last_modified": "d:getlastmodified",  # gt, eq, lt
+        "size": "oc:size",  # gt, gte, eq, lt
+        "favorite": "oc:favorite",  # eq
+        "fileid": "oc:fileid",  # eq
+    }
+    """Keys of the properties that can be searched for, and the corresponding WebDAV properties."""
+
+    __slots__ = ("_op", "_args", "_parts")
+
+    def __init__(self, op: str, *args):
+        self._op = op
+        self._args = args
+        self._parts: typing.Optional[list] = None
+
+    @staticmethod
+    def prop(key: str) -> "_SearchProperty":
+        """Returns the property to compare with values, see :py:attr:`PROPERTIES` for the keys."""
+        if key not in SearchQuery.PROPERTIES:
+            raise ValueError(f"Unsupported search property: {key}")
+        return _SearchProperty(key)
+
+    @staticmethod
+    def param(name: str) -> "_SearchParam":
+        """Returns the placeholder for the value, that is taken from the ``params`` of the search."""
+        return _SearchParam(name)
+
+    def __and__(self, other: "SearchQuery") -> "SearchQuery":
+        return SearchQuery("and", *self._operands("and"), *other._operands("and"))
+
+    def __or__(self, other: "SearchQuery") -> "SearchQuery":
+        return SearchQuery("or", *self._operands("or"), *other._operands("or"))
+
+    def __invert__(self) -> "SearchQuery":
+        return SearchQuery("not", self)
+
+    def __repr__(self):
+        return f"SearchQuery({', '.join(repr(i) for i in (self._op, *self._args))})"
+
+    def xml(self, params: typing.Optional[dict[str, typing.Any]] = None) -> str:
+        """Returns the content of ``d:where`` element, with the placeholders replaced by the ``params``."""
+        if self._parts is None:
+            parts: list = []
+            self._compile(parts)
+            self._parts = parts
+        result = []
+        for i in self._parts:
+            if isinstance(i, _SearchParam):
+                if params is None or i.name not in params:
+                    raise ValueError(f"Missing value of the search parameter: {i.name}")
+                i = xml.sax.saxutils.escape(str(params[i.name]))
+            result.append(i)
+        return "".join(result)
+
+    def _operands(self, op: str) -> tuple:
+        return self._args if self._op == op else (self,)
+
+    def _compile(self, parts: list) -> None:
+        if self._op in ("and", "or", "not"):
+            parts.append(f"<d:{self._op}>")
+            for i in self._args:
+                i._compile(parts)  # pylint: disable=protected-access
+            parts.append(f"</d:{self._op}>")
+            return
+        key, value = self._args[0], self._args[1]
+        start = f"<d:{self._op}><d:prop><{self.PROPERTIES[key]} /></d:prop><d:literal>"
+        if isinstance(value, _SearchParam):
+            parts += [start, value, f"</d:literal></d:{self._op}>"]
+        else:
+            parts.append(f"{start}{xml.sax.saxutils.escape(str(value))}</d:literal></d:{self._op}>")
+
+
+class _SearchProperty:
+    __slots__ = ("key",)
+
+    def __init__(self, key: str):
+        self.key = key
+
+    def __eq__(self, value) -> SearchQuery:  # type: ignore[override]
+        return SearchQuery("eq", self.key, value)
+
+    def __gt__(self, value) -> SearchQuery:
+        return SearchQuery("gt", self.key, value)
+
+    def __ge__(self, value) -> SearchQuery:
+        return SearchQuery("gte", self.key, value)
+
+    def __lt__(self, value) -> SearchQuery:
+        return SearchQuery("lt", self.key, value)
+
+    def __le__(self, value) -> SearchQuery:
+        return SearchQuery("lte", self.key, value)
+
+    def like(self, value) -> SearchQuery:
+        """Matches the values with the pattern, where ``%`` is any number of any characters."""
+        return SearchQuery("like", self.key, value)
+
+
+class _SearchParam:
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self):
+        return f"SearchQuery.param({self.name!r})"
+
+
+@dataclasses.dataclass
+class SyncPlan:
+    """Changes made by :py:meth:`~nc_py_api.files.files.FilesAPI.sync`, or to be made when called with ``dry_run``.
+
+    All paths are relative to the synchronized directories and use ``/`` as a separator.
+    """
+
+    delete: list[str] = dataclasses.field(default_factory=list)
+    """Objects removed from the destination, only the top-most of removed directories are listed"""
+    mkdir: list[str] = dataclasses.field(default_factory=list)
+    """Directories created in the destination, parents go first"""
+    transfer: list[str] = dataclasses.field(default_factory=list)
+    """Files copied to the destination"""
+
+    def __bool__(self):
+        return bool(self.delete or self.mkdir or self.transfer)
+
+
+@dataclasses.dataclass
+class TransferStats:
+    """Summary of the directory tree transfer made by ``upload_tree`` or ``download_tree``."""
+
+    files: int = 0
+    """Number of transferred files"""
+    directories: int = 0
+    """Number of created directories"""
+    size: int = 0
+    """Total size of transferred files in bytes"""
+    elapsed: float = 0.0
+    """Duration of the transfer in seconds"""
+    skipped: int = 0
+    """Number of files that were not uploaded, as they are already on the server with the same content"""
+
+    @property
+    def throughput(self) -> float:
+        """Average transfer speed in bytes per second."""
+        return self.size / self.elapsed if self.elapsed else 0.0
+
+
+@dataclasses.dataclass
+class _CacheEntry:
+    __slots__ = ("value", "path", "etag", "stored")
+
+    value: typing.Any
+    path: str
+    etag: str
+    stored: float
+
+
+class FilesCache:
+    """Opt-in LRU cache of the file system objects metadata, see :py:attr:`~nc_py_api.files.files.FilesAPI.cache`.
+
+    Entries younger than **ttl** seconds are returned without contacting the server. Older ones are revalidated
+    with the ``Depth: 0`` PROPFIND, comparing the ETag of the object (or the listed directory) they were read from.
+    Changes made by this API (upload, mkdir, delete, move, copy, setfav) invalidate affected entries immediately.
+
+    .. note:: Cached ``FsNode`` objects are shared between the calls, they should not be modified.
+    """
+
+    max_size: int
+    """Maximum number of the cached results, the least recently used are evicted first"""
+    ttl: float
+    """Time in seconds during which the cached results are returned without revalidation"""
+
+    def __init__(self, max_size: int = 1024, ttl: float = 30.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: collections.OrderedDict[tuple, _CacheEntry] = collections.OrderedDict()
+        self._ids: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: tuple) -> typing.Optional[_CacheEntry]:
+        """Returns the cache entry for the key if any."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: tuple, value: typing.Any, path: str, etag: str) -> None:
+        """Stores ``value`` that was read from ``path`` having the specified ETag."""
+        with self._lock:
+            self._entries[key] = _CacheEntry(value, path.strip("/"), etag, time.monotonic())
+            self._entries.move_to_end(key)
+            if key[0] == "by_path":
+                self._ids[str(value.info.fileid)] = self._ids[value.file_id] = key[1]
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def expired(self, entry: _CacheEntry) -> bool:
+        """Returns ``True`` if the entry should be revalidated before use."""
+        return time.monotonic() - entry.stored > self.ttl
+
+    def refresh(self, entry: _CacheEntry) -> None:
+        """Marks the entry as just revalidated."""
+        entry.stored = time.monotonic()
+
+    def path_by_id(self, file_id: str, root: str) -> typing.Optional[str]:
+        """Returns the path of the cached object with the specified full or clear file ID, if it is inside ``root``."""
+        with self._lock:
+            path = self._ids.get(file_id)
+        return path if path is not None and _paths_related(path, root) else None
+
+    def remove(self, key: tuple) -> None:
+        """Removes the entry for the key if any."""
+        with self._lock:
+            self._remove(key)
+
+    def invalidate(self, *paths: str) -> None:
+        """Removes the entries affected by the changes at the specified paths: of objects, parents and children."""
+        paths = tuple(i.strip("/") for i in paths)
+        with self._lock:
+            for key in [k for k, v in self._entries.items() if any(_paths_related(v.path, i) for i in paths)]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._ids.clear()
+
+    def _remove(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None and key[0] == "by_path":
+            self._ids.pop(str(entry.value.info.fileid), None)
+            self._ids.pop(entry.value.file_id, None)
+
+
+class DownloadCache:
+    """On-disk cache of the files content, see :py:attr:`~nc_py_api.files.files.FilesAPI.download_cache`.
+
+    Files are stored under the names derived from their ``fileid`` (or path) and ``etag``, so the changed file is
+    never served from the cache. Files are written atomically and the least recently used are removed when the total
+    size exceeds **max_size**, which makes it safe to share one directory between the processes on the same host.
+    """
+
+    directory: str
+    """Directory where the cached files are stored"""
+    max_size: int
+    """Maximum total size of the cached files in bytes"""
+
+    def __init__(self, directory: typing.Union[str, os.PathLike], max_size: int = 1024 * 1024 * 1024):
+        self.directory = os.fspath(directory)
+        self.max_size = max_size
+        os.makedirs(self.directory, exist_ok=True)
+
+    def open(self, file_id: str, etag: str) -> typing.Optional[typing.BinaryIO]:
+        """Returns the opened cached file with the specified ``fileid`` and ``etag`` if any."""
+        path = self._path(file_id, etag)
+        try:
+            fp = open(path, "rb")  # noqa: SIM115 pylint: disable=consider-using-with
+        except FileNotFoundError:
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(path)  # modification time is used to evict the least recently used files
+        return fp
+
+    @contextlib.contextmanager
+    def writer(self) -> typing.Iterator[str]:
+        """Yields a path of the temporary file, that is removed on exit unless it was stored with :py:meth:`put`."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".part-")
+        os.close(fd)
+        try:
+            yield tmp_path
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp_path)
+
+    def put(self, file_id: str, etag: str, tmp_path: str) -> None:
+        """Atomically moves the file created by :py:meth:`writer` into the cache and evicts old files if needed."""
+        if file_id and etag:
+            os.replace(tmp_path, self._path(file_id, etag))
+            self._evict()
+
+    def clear(self) -> None:
+        """Removes all cached files."""
+        for i in os.scandir(self.directory):
+            if not i.name.startswith(".part-"):
+                with contextlib.suppress(OSError):
+                    os.remove(i.path)
+
+    def _path(self, file_id: str, etag: str) -> str:
+        key = file_id + ":" + etag.strip('"')
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest())
+
+    def _evict(self) -> None:
+        entries = []
+        for i in os.scandir(self.directory):
+            if not i.name.startswith(".part-"):
+                with contextlib.suppress(OSError):
+                    stat = i.stat()
+                    entries.append((stat.st_mtime, stat.st_size, i.path))
+        total_size = sum(i[1] for i in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            with contextlib.suppress(OSError):  # it can be already removed by another process
+                os.remove(path)
+            total_size -= size
+
+
+def _paths_related(path1: str, path2: str) -> bool:
+    return path1 == path2 or path1.startswith(path2 + "/") or path2.startswith(path1 + "/")
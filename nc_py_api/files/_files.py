@@ -0,0 +1,846 @@
+"""Helper functions for **FilesAPI** and **AsyncFilesAPI** classes."""
+
+import functools
+import mmap
+import os
+import re
+import sys
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from hashlib import new as new_hash
+from hashlib import sha1
+from json import JSONDecodeError, dumps, loads
+from os import PathLike
+from random import choice
+from string import ascii_lowercase, digits
+from threading import Lock
+from typing import Any, Optional, Union, cast
+from urllib.parse import unquote
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+from zlib import adler32
+
+from httpx import Response
+
+from .._exceptions import NextcloudException, check_error
+from . import FsNode, FsNodeTable, SearchQuery
+
+PROPFIND_PROPERTIES = [
+    "d:resourcetype",
+    "d:getlastmodified",
+    "d:getcontentlength",
+    "d:getetag",
+    "oc:size",
+    "oc:id",
+    "oc:fileid",
+    "oc:downloadURL",
+    "oc:dDC",
+    "oc:permissions",
+    "oc:checksums",
+    "oc:share-types",
+    "oc:favorite",
+    "nc:is-encrypted",
+    "nc:lock",
+    "nc:lock-owner-displayname",
+    "nc:lock-owner",
+    "nc:lock-owner-type",
+    "nc:lock-owner-editor",
+    "nc:lock-time",
+    "nc:lock-timeout",
+]
+
+ETAG_PROPERTIES = ["d:getetag", "oc:id"]
+
+PROPFIND_PROFILES = {
+    "minimal": ["d:getetag", "oc:id", "oc:fileid"],
+    "sync": ["d:getetag", "oc:id", "oc:fileid", "oc:size", "d:getlastmodified", "oc:checksums"],
+    "full": PROPFIND_PROPERTIES,
+}
+"""Named sets of the properties for ``properties`` argument, ``minimal`` ones are always requested."""
+
+FS_NODE_INFO_PROPERTIES = {
+    "size": "oc:size",
+    "content_length": "d:getcontentlength",
+    "permissions": "oc:permissions",
+    "favorite": "oc:favorite",
+    "fileid": "oc:fileid",
+    "last_modified": "d:getlastmodified",
+    "checksums": "oc:checksums",
+}
+"""``FsNodeInfo`` attributes and the properties they are filled from."""
+
+SEARCH_PROPERTIES_MAP = SearchQuery.PROPERTIES
+
+FIND_BY_ID_QUERY = SearchQuery.prop("fileid") == SearchQuery.param("fileid")
+
+
+def dav_get_obj_path(user: str, path: str = "", root_path="/files") -> str:
+    obj_dav_path = root_path
+    if user:
+        obj_dav_path += "/" + user
+    if path:
+        obj_dav_path += "/" + path.lstrip("/")
+    return obj_dav_path
+
+
+def resolve_properties(properties: Union[str, list[str], None]) -> list[str]:
+    """Returns the properties of the profile, or of the list of ``FsNodeInfo`` attributes and WebDAV properties."""
+    if properties is None:
+        return PROPFIND_PROPERTIES
+    if isinstance(properties, str):
+        if properties not in PROPFIND_PROFILES:
+            raise ValueError(f"Unknown properties profile: {properties}")
+        return PROPFIND_PROFILES[properties]
+    result = dict.fromkeys(PROPFIND_PROFILES["minimal"])
+    for i in properties:
+        if ":" not in i and i not in FS_NODE_INFO_PROPERTIES:
+            raise ValueError(f"Unknown property: {i}")
+        result[FS_NODE_INFO_PROPERTIES.get(i, i)] = None
+    return list(result)
+
+
+def unavailable_info(properties: list[str]) -> tuple[str, ...]:
+    """Returns ``FsNodeInfo`` attributes that are not filled, as their properties are not requested."""
+    if properties is PROPFIND_PROPERTIES:
+        return ()
+    return tuple(k for k, v in FS_NODE_INFO_PROPERTIES.items() if v not in properties)
+
+
+def element_tree_as_str(element) -> str:
+    return ElementTree.tostring(element, encoding="unicode", xml_declaration=True)
+
+
+def build_listdir_req(properties: list[str]) -> str:
+    root = ElementTree.Element(
+        "d:propfind",
+        attrib={"xmlns:d": "DAV:", "xmlns:oc": "http://owncloud.org/ns", "xmlns:nc": "http://nextcloud.org/ns"},
+    )
+    prop = ElementTree.SubElement(root, "d:prop")
+    for i in properties:
+        ElementTree.SubElement(prop, i)
+    return element_tree_as_str(root)
+
+
+def is_listdir_self(fs_node: FsNode, path: str) -> bool:
+    return fs_node.user_path.rstrip("/") == path.rstrip("/")
+
+
+def listdir_self_etag(fs_nodes: list[FsNode], path: str) -> str:
+    """Returns ETag of the ``PROPFIND`` target directory, it changes when anything inside the directory changes."""
+    return next((i.etag for i in fs_nodes if is_listdir_self(i, path)), "")
+
+
+def listdir_exclude_self(fs_nodes: list[FsNode], path: str, exclude_self: bool) -> list[FsNode]:
+    """Returns a copy of the cached ``PROPFIND`` result, optionally without the target directory itself."""
+    if not exclude_self:
+        return list(fs_nodes)
+    return [i for i in fs_nodes if not is_listdir_self(i, path)]
+
+
+def table_exclude_self(table: FsNodeTable, path: str) -> FsNodeTable:
+    """Removes the ``PROPFIND`` target directory itself from the columnar listing result."""
+    for i, full_path in enumerate(table.full_path):
+        if full_path.lstrip("/").split("/", maxsplit=2)[-1].rstrip("/") == path.rstrip("/"):
+            table.remove(i)
+            break
+    return table
+
+
+def build_tree_levels(paths: Iterable[str]) -> list[list[str]]:
+    """Groups directory paths by depth, so each group can be created concurrently after the previous ones."""
+    levels: dict[int, list[str]] = {}
+    for i in paths:
+        levels.setdefault(i.count("/"), []).append(i)
+    return [levels[i] for i in sorted(levels)]
+
+
+def build_path_prefixes(path: str) -> list[str]:
+    """Returns the paths of all directories in the ``path`` from the top one: ``a``, ``a/b``, ``a/b/c``."""
+    parts = [i for i in path.split("/") if i]
+    return ["/".join(parts[: i + 1]) for i in range(len(parts))]
+
+
+class KnownDirs:
+    """Directories known to exist for each user, which are not checked again by ``makedirs``.
+
+    It is shared by the worker threads, all access goes under the lock.
+    """
+
+    def __init__(self):
+        self._dirs: dict[str, set[str]] = {}
+        self._lock = Lock()
+
+    def depth(self, user: str, prefixes: list[str]) -> int:
+        """Returns the number of the leading ``prefixes`` that are known to exist, the last one is never trusted."""
+        with self._lock:
+            known = self._dirs.get(user, set())
+            for i in range(len(prefixes) - 1, 0, -1):
+                if prefixes[i - 1] in known:
+                    return i
+        return 0
+
+    def add(self, user: str, paths: Iterable[str]) -> None:
+        with self._lock:
+            self._dirs.setdefault(user, set()).update(paths)
+
+    def forget(self, user: str, paths: Iterable[str]) -> None:
+        """Removes the changed paths, with everything inside them, from the directories known to exist."""
+        with self._lock:
+            known = self._dirs.get(user)
+            for path in paths:
+                if known:
+                    path = path.strip("/")
+                    known.difference_update([i for i in known if i == path or i.startswith(path + "/")])
+
+    def clear(self, user: str) -> None:
+        with self._lock:
+            self._dirs.pop(user, None)
+
+
+def build_walk_level(fs_nodes: list[FsNode]) -> tuple[FsNode, list[FsNode], list[FsNode]]:
+    """Splits ``PROPFIND`` with depth=1 result to the directory itself, its subdirectories and files."""
+    return fs_nodes[0], [i for i in fs_nodes[1:] if i.is_dir], [i for i in fs_nodes[1:] if not i.is_dir]
+
+
+class WalkFrontier:
+    """Directories waiting to be listed by ``walk`` in the top-down order, and the listings already started.
+
+    The listings are started with the ``start`` callable, a future or a task: at most ``workers`` of them run ahead.
+    """
+
+    def __init__(self, path: str, workers: int):
+        self._paths = [path]
+        self._in_flight: dict[str, Any] = {}
+        self._workers = workers
+
+    def __bool__(self):
+        return bool(self._paths)
+
+    def next(self, start: Callable[[str], Any]) -> Any:
+        """Starts the listings of the next directories and returns the one of the directory to yield now."""
+        for i in reversed(self._paths):
+            if len(self._in_flight) >= self._workers:
+                break
+            if i not in self._in_flight:
+                self._in_flight[i] = start(i)
+        current = self._paths.pop()
+        return self._in_flight.pop(current, None) or start(current)
+
+    def extend(self, dirs: list[FsNode]) -> None:
+        """Adds the subdirectories left after the pruning, so they are listed in their order."""
+        self._paths.extend(i.user_path for i in reversed(dirs))
+
+    def cancel(self) -> None:
+        for pending in self._in_flight.values():
+            pending.cancel()
+
+
+def build_find_request(
+    req: Union[list, SearchQuery],
+    path: str,
+    user: str,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    order_by=None,
+    **kwargs,
+) -> str:
+    """Builds ``SEARCH`` request, ``kwargs`` are **params** for the ``req`` placeholders and **properties** to get."""
+    query = req if isinstance(req, SearchQuery) else search_query_from_list(req)
+    href = escape(f"/files/{user}/{path.removeprefix('/')}")
+    parts = [
+        _search_request_start(tuple(kwargs.get("properties", PROPFIND_PROPERTIES))),
+        f"<d:from><d:scope><d:href>{href}</d:href><d:depth>infinity</d:depth></d:scope></d:from>",
+        f"<d:where>{query.xml(kwargs.get('params'))}</d:where>",
+    ]
+    if order_by:
+        parts.append("<d:orderby>")
+        for i in [order_by] if isinstance(order_by, str) else order_by:
+            direction = "d:descending" if i.startswith("-") else "d:ascending"
+            parts.append(
+                f"<d:order><d:prop><{SEARCH_PROPERTIES_MAP[i.lstrip('-')]} /></d:prop><{direction} /></d:order>"
+            )
+        parts.append("</d:orderby>")
+    if limit is not None or offset:
+        nresults = f"<d:nresults>{limit}</d:nresults>" if limit is not None else ""
+        parts.append(f"<d:limit>{nresults}<nc:firstresult>{offset}</nc:firstresult></d:limit>")
+    parts.append("</d:basicsearch></d:searchrequest>")
+    return "".join(parts)
+
+
+@functools.lru_cache(maxsize=16)
+def _search_request_start(properties: tuple[str, ...]) -> str:
+    """Returns the part of the ``SEARCH`` requests that is the same for all requests of these properties."""
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<d:searchrequest xmlns:d="DAV:" xmlns:oc="http://owncloud.org/ns" xmlns:nc="http://nextcloud.org/ns">'
+        f'<d:basicsearch><d:select><d:prop>{"".join(f"<{i} />" for i in properties)}</d:prop></d:select>'
+    )
+
+
+def search_query_from_list(req: list) -> SearchQuery:
+    """Converts the conditions in the list form, like ``["and", "gt", "size", 1024, "like", "mime", "image/%"]``."""
+    conditions = []
+    i = 0
+    while i < len(req):
+        condition, i = _search_condition_from_list(req, i)
+        conditions.append(condition)
+    if not conditions:
+        raise ValueError("No search conditions.")
+    return conditions[0] if len(conditions) == 1 else SearchQuery("and", *conditions)
+
+
+def _search_condition_from_list(req: list, i: int) -> tuple[SearchQuery, int]:
+    if req[i] in ("or", "and"):
+        first, end = _search_condition_from_list(req, i + 1)
+        second, end = _search_condition_from_list(req, end)
+        return SearchQuery(req[i], first, second), end
+    return SearchQuery(req[i], req[i + 1], req[i + 2]), i + 3
+
+
+FIND_IDS_CHUNK_SIZE = 500
+"""Maximum number of file IDs in one ``SEARCH`` request, larger lists are split into several requests."""
+
+
+def clear_file_id(file_id: Union[int, str]) -> int:
+    """Returns the clear file ID from the full one with Nextcloud instance ID, like ``00000123ocinstanceid``."""
+    if isinstance(file_id, int):
+        return file_id
+    match = re.match(r"\d+", file_id)
+    if match is None:
+        raise ValueError(f"Invalid file ID: {file_id}")
+    return int(match.group())
+
+
+def build_find_ids_request(file_ids: list[int], user: str) -> str:
+    conditions = [SearchQuery.prop("fileid") == i for i in file_ids]
+    return build_find_request(conditions[0] if len(conditions) == 1 else SearchQuery("or", *conditions), "", user)
+
+
+def build_paths_parents(paths: Iterable[str]) -> list[str]:
+    """Returns the parent directories to list to find all the ``paths``, the root is listed for itself."""
+    return sorted({i.strip("/").rpartition("/")[0] for i in paths})
+
+
+def build_report_req(filter_rules: dict[str, Any], properties: list[str]) -> str:
+    """Builds ``oc:filter-files`` request, a list as a value of the rule adds the rule for each of its items."""
+    root = ElementTree.Element(
+        "oc:filter-files",
+        attrib={"xmlns:d": "DAV:", "xmlns:oc": "http://owncloud.org/ns", "xmlns:nc": "http://nextcloud.org/ns"},
+    )
+    xml_prop = ElementTree.SubElement(root, "d:prop")
+    for i in properties:
+        ElementTree.SubElement(xml_prop, i)
+    xml_filter_rules = ElementTree.SubElement(root, "oc:filter-rules")
+    for rule, values in filter_rules.items():
+        for value in values if isinstance(values, (list, tuple, set)) else [values]:
+            value = int(value) if isinstance(value, bool) else value
+            ElementTree.SubElement(xml_filter_rules, rule if ":" in rule else f"oc:{rule}").text = str(value)
+    return element_tree_as_str(root)
+
+
+def build_setfav_req(value: bool) -> str:
+    root = ElementTree.Element(
+        "d:propertyupdate",
+        attrib={"xmlns:d": "DAV:", "xmlns:oc": "http://owncloud.org/ns"},
+    )
+    xml_set = ElementTree.SubElement(root, "d:set")
+    xml_set_prop = ElementTree.SubElement(xml_set, "d:prop")
+    ElementTree.SubElement(xml_set_prop, "oc:favorite").text = str(int(bool(value)))
+    return element_tree_as_str(root)
+
+
+def build_move_copy_headers(dav_endpoint: str, full_dest_path: str, overwrite: bool) -> dict:
+    return {"Destination": dav_endpoint + full_dest_path, "Overwrite": "T" if overwrite else "F"}
+
+
+def get_chunk_name(start_bytes: int, end_bytes: int) -> str:
+    return str(start_bytes).rjust(15, "0") + "-" + str(end_bytes).rjust(15, "0")
+
+
+def build_download_ranges(response: Response, chunk_size: int) -> list[tuple[int, int]]:
+    """Returns byte ranges left after the first part, or an empty list if the server did not honor ``Range``."""
+    if response.status_code != 206:
+        return []
+    try:
+        total_size = int(response.headers.get("Content-Range", "").rsplit("/", maxsplit=1)[1])
+    except (IndexError, ValueError):
+        return []
+    return [(i, min(i + chunk_size, total_size) - 1) for i in range(chunk_size, total_size, chunk_size)]
+
+
+def build_range_headers(first_byte: int, last_byte: Optional[int], etag: str) -> dict:
+    headers = {"Range": f"bytes={first_byte}-{'' if last_byte is None else last_byte}"}
+    if etag:
+        headers["If-Range"] = etag
+    return headers
+
+
+def check_download2stream_args(path: Union[str, FsNode], **kwargs) -> None:
+    if kwargs.get("verify", False) and kwargs.get("resume", False):
+        raise ValueError("`verify` can not be used together with `resume`.")
+    if kwargs.get("resume", False) and not (isinstance(path, FsNode) and path.etag):
+        raise ValueError("`resume` requires `FsNode` with `etag`, to check that the file was not changed.")
+
+
+def download_resumable(fp, **kwargs) -> bool:
+    """Checks if the download should continue after the data already present in `fp`."""
+    return bool(kwargs.get("resume", False) and getattr(fp, "seekable", lambda: False)() and fp.tell())
+
+
+class RangedDownload:
+    """Plan of the download of a file in parts of ``chunk_size`` bytes, the API classes only send the requests.
+
+    The first request asks only for the first part when the download is parallel, if the server honors ``Range``
+    the rest of the parts are downloaded concurrently to their offsets in the seekable `fp`.
+    """
+
+    def __init__(self, fp, **kwargs):
+        self.chunk_size: int = kwargs.get("chunk_size", 4 * 1024 * 1024)
+        self.verify: bool = kwargs.get("verify", False)
+        self.parallel = (
+            not self.verify and int(kwargs.get("workers", 1)) > 1 and getattr(fp, "seekable", lambda: False)()
+        )
+        self._offset = fp.tell() if self.parallel else 0
+        self.end = 0
+        """Offset in `fp` after the last part, to seek to when all parts are downloaded."""
+
+    def first_headers(self) -> dict:
+        return build_range_headers(0, self.chunk_size - 1, "") if self.parallel else {}
+
+    def parts(self, response: Response, etag: str) -> list[tuple[dict, int]]:
+        """Returns the headers and the offsets in `fp` of the parts left after the `response` to the first request."""
+        ranges = build_download_ranges(response, self.chunk_size) if self.parallel else []
+        if ranges:
+            self.end = self._offset + ranges[-1][1] + 1
+        return [(build_range_headers(*i, etag), self._offset + i[0]) for i in ranges]
+
+
+UPLOAD_BUFFER_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+
+
+def map_upload_file(path: Union[str, PathLike]) -> memoryview:
+    """Maps the file into memory, so its chunks are sliced without reading them into new ``bytes`` objects."""
+    with open(path, "rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            return memoryview(b"")  # empty files can not be mapped
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))  # unmapped when all views are released
+
+
+CHECKSUM_TYPES = ("SHA1", "MD5", "ADLER32")
+"""Types of the checksums supported by Nextcloud, in order of preference."""
+
+
+class Checksum:
+    """Checksum of the data computed incrementally, ``str`` of it is the value for the ``OC-Checksum`` header."""
+
+    def __init__(self, checksum_type: str = "SHA1"):
+        self.type = checksum_type.upper()
+        if self.type not in CHECKSUM_TYPES:
+            raise ValueError(f"Unsupported checksum type: {checksum_type}")
+        self._hash = None if self.type == "ADLER32" else new_hash(self.type.lower())  # nosec
+        self._adler32 = 1
+
+    def update(self, data: Union[bytes, memoryview]) -> None:
+        if self._hash is None:
+            self._adler32 = adler32(data, self._adler32)
+        else:
+            self._hash.update(data)
+
+    def hexdigest(self) -> str:
+        return f"{self._adler32:08x}" if self._hash is None else self._hash.hexdigest()
+
+    def __str__(self):
+        return f"{self.type}:{self.hexdigest()}"
+
+
+def new_checksum(verify: Union[bool, str]) -> Optional[Checksum]:
+    """Returns the checksum for the ``verify`` argument of uploads: ``True`` is for **SHA1**."""
+    if not verify:
+        return None
+    return Checksum("SHA1" if verify is True else verify)
+
+
+def parse_checksums(value: str) -> dict[str, str]:
+    """Parses checksums in the format of ``OC-Checksum`` header, like ``SHA1:<hex> MD5:<hex>``."""
+    return {k.upper(): v.lower() for k, _, v in (i.partition(":") for i in value.split()) if v}
+
+
+def download_checksum(headers, info: str) -> Checksum:
+    """Returns the checksum of the preferred type among the ones the server has for the downloaded file.
+
+    Raises an exception if the server has no checksum of a supported type, so the data can not be verified.
+    """
+    available = parse_checksums(headers.get("OC-Checksum", ""))
+    checksum = next((Checksum(i) for i in CHECKSUM_TYPES if i in available), None)
+    if checksum is None:
+        raise NextcloudException(reason="No checksum to verify the data", info=info)
+    return checksum
+
+
+def check_checksum(checksum: Optional[Checksum], headers, info: str, data: Optional[bytes] = None) -> None:
+    """Raises an exception if the checksum of the downloaded data differs from the one the server has.
+
+    `data` is added to the `checksum` first, if it was not computed while downloading.
+    """
+    if checksum is None:
+        return
+    if data is not None:
+        checksum.update(data)
+    expected = parse_checksums(headers.get("OC-Checksum", "")).get(checksum.type, "")
+    if checksum.hexdigest() != expected:
+        raise NextcloudException(reason="Checksum mismatch", info=f"{info}, expected={expected}, got={checksum}")
+
+
+UploadChunk = tuple[Union[bytes, memoryview], Optional[str], Optional[str]]
+"""Data of the chunk, its hash for the request signature if the session signs requests,
+and its checksum for ``OC-Checksum`` header if the upload is verified."""
+
+
+def _upload_chunk(
+    piece: Union[bytes, str, memoryview], new_hasher: Callable[[], Any], checksum: Optional[Checksum]
+) -> UploadChunk:
+    if isinstance(piece, str):
+        piece = piece.encode("UTF-8")
+    hasher = new_hasher()
+    if hasher is not None:
+        hasher.update(piece)
+    chunk_checksum = None
+    if checksum is not None:
+        checksum.update(piece)
+        chunk_checksum = Checksum(checksum.type)
+        chunk_checksum.update(piece)
+    return (
+        piece,
+        None if hasher is None else hasher.hexdigest(),
+        None if chunk_checksum is None else str(chunk_checksum),
+    )
+
+
+class UploadChunkAssembler:
+    """Collects pieces of data of any size into chunks, hashing the data while copying it.
+
+    If `checksum` is set, it is updated with all data and each chunk gets a checksum of the same type.
+    """
+
+    def __init__(self, chunk_size: int, new_hasher: Callable[[], Any], checksum: Optional[Checksum] = None):
+        self.chunk_size = chunk_size
+        self._new_hasher = new_hasher
+        self._checksum = checksum
+        self._reset()
+
+    def add(self, piece: Union[bytes, str, memoryview]) -> list[UploadChunk]:
+        """Adds the piece of data, returns the chunks completed by it."""
+        view = memoryview(piece.encode("UTF-8") if isinstance(piece, str) else piece).cast("B")
+        chunks = []
+        while view.nbytes:
+            part = view[: self.chunk_size - self._size]
+            self._buffer[self._size : self._size + part.nbytes] = part
+            for i in (self._hasher, self._checksum, self._chunk_checksum):
+                if i is not None:
+                    i.update(part)
+            self._size += part.nbytes
+            view = view[part.nbytes :]
+            if self._size == self.chunk_size:
+                chunks.append(self._pop())
+        return chunks
+
+    def flush(self) -> list[UploadChunk]:
+        """Returns the last incomplete chunk."""
+        return [self._pop()] if self._size else []
+
+    def _reset(self) -> None:
+        self._buffer = bytearray(self.chunk_size)
+        self._size = 0
+        self._hasher = self._new_hasher()
+        self._chunk_checksum = None if self._checksum is None else Checksum(self._checksum.type)
+
+    def _pop(self) -> UploadChunk:
+        chunk = (
+            memoryview(self._buffer)[: self._size],
+            None if self._hasher is None else self._hasher.hexdigest(),
+            None if self._chunk_checksum is None else str(self._chunk_checksum),
+        )
+        self._reset()
+        return chunk
+
+
+def iter_upload_chunks(
+    fp, chunk_size: int, new_hasher: Callable[[], Any], checksum: Optional[Checksum] = None
+) -> Iterator[UploadChunk]:
+    """Yields chunks of `fp` with their hashes, for the ``memoryview`` the chunks are the slices of it.
+
+    `fp` is a ``memoryview``, an object with ``read`` method or an iterable of data pieces of any size.
+    If `checksum` is set, it is updated with the data of all chunks.
+    """
+    if isinstance(fp, memoryview):
+        for i in range(0, fp.nbytes, chunk_size):
+            yield _upload_chunk(fp[i : i + chunk_size], new_hasher, checksum)
+    elif hasattr(fp, "read"):
+        while True:
+            piece = fp.read(chunk_size)
+            if not piece:
+                break
+            yield _upload_chunk(piece, new_hasher, checksum)
+    else:
+        assembler = UploadChunkAssembler(chunk_size, new_hasher, checksum)
+        for piece in fp:
+            yield from assembler.add(piece)
+        yield from assembler.flush()
+
+
+async def aiter_upload_chunks(
+    fp, chunk_size: int, new_hasher: Callable[[], Any], checksum: Optional[Checksum] = None
+) -> AsyncIterator[UploadChunk]:
+    """Same as :py:func:`iter_upload_chunks`, but also accepts asynchronous iterables of data pieces."""
+    if not hasattr(fp, "__aiter__"):
+        for chunk in iter_upload_chunks(fp, chunk_size, new_hasher, checksum):
+            yield chunk
+        return
+    assembler = UploadChunkAssembler(chunk_size, new_hasher, checksum)
+    async for piece in fp:
+        for chunk in assembler.add(piece):
+            yield chunk
+    for chunk in assembler.flush():
+        yield chunk
+
+
+def chunk_digest(piece: Union[bytes, memoryview]) -> str:
+    return sha1(piece).hexdigest()  # nosec
+
+
+def chunk_uploaded(uploaded: dict[str, str], start_bytes: int, end_bytes: int, piece: Union[bytes, memoryview]) -> bool:
+    """Checks if the chunk was uploaded by a previous attempt and was not changed since.
+
+    The chunk is removed from ``uploaded``, the chunks left there at the end are not the part of the new file.
+    """
+    return uploaded.pop(get_chunk_name(start_bytes, end_bytes), "") == chunk_digest(piece)
+
+
+_UPLOAD_JOURNAL_LOCK = Lock()
+
+
+def upload_journal_load(journal: Union[str, PathLike], header: dict) -> tuple[str, dict[str, str]]:
+    """Returns the upload folder and the uploaded chunks recorded in the journal.
+
+    When the journal is missing or was created for another upload, empty values are returned.
+    """
+    try:
+        with open(journal, encoding="utf-8") as f:
+            records = [loads(i) for i in f if i.strip()]
+    except (OSError, JSONDecodeError):
+        return "", {}
+    if not records or {k: v for k, v in records[0].items() if k != "folder"} != header:
+        return "", {}
+    return records[0].get("folder", ""), {i["name"]: i["digest"] for i in records[1:]}
+
+
+def upload_journal_start(journal: Union[str, PathLike], header: dict, folder: str) -> None:
+    with open(journal, "w", encoding="utf-8") as f:
+        f.write(dumps(header | {"folder": folder}) + "\n")
+
+
+def upload_journal_add(journal: Union[str, PathLike], chunk_name: str, digest: str) -> None:
+    with _UPLOAD_JOURNAL_LOCK, open(journal, "a", encoding="utf-8") as f:
+        f.write(dumps({"name": chunk_name, "digest": digest}) + "\n")
+
+
+class ChunkedUpload:
+    """State of the chunked upload of one file, the API classes only send the requests.
+
+    With **journal** an interrupted upload is resumed: the upload folder of the previous attempt is reused,
+    with the chunks in it that were not changed since.
+    """
+
+    def __init__(self, user: str, path: str, **kwargs):
+        self.journal: Optional[Union[str, PathLike]] = kwargs.get("journal")
+        self.checksum = new_checksum(kwargs.get("verify", False))
+        self.size = 0
+        """Number of the bytes read from the source, the size of the file when all chunks are uploaded."""
+        self.uploaded: dict[str, str] = {}
+        """Digests of the chunks present in the upload folder, the ones left after reading the source are stale."""
+        self._header = {"user": user, "path": path, "chunk_size": kwargs.get("chunk_size", 4 * 1024 * 1024)}
+        self._folder, self._recorded = upload_journal_load(self.journal, self._header) if self.journal else ("", {})
+
+    @property
+    def chunk_size(self) -> int:
+        return self._header["chunk_size"]
+
+    @property
+    def dav_path(self) -> str:
+        """Path of the upload folder, empty if there is no previous attempt to resume."""
+        return dav_get_obj_path(self._header["user"], self._folder, "/uploads") if self._folder else ""
+
+    @property
+    def full_path(self) -> str:
+        return dav_get_obj_path(self._header["user"], self._header["path"])
+
+    def info(self, **kwargs) -> str:
+        details = "".join(f", {k}={v}" for k, v in kwargs.items())
+        return f"upload_stream: user={self._header['user']}, path={self._header['path']}{details}"
+
+    def resume(self, present: Optional[dict[str, int]]) -> bool:
+        """Takes the chunks `present` in the upload folder, returns ``False`` if the folder expired on the server."""
+        if present is None:
+            return False
+        self.uploaded = {k: self._recorded.get(k, "") for k in present}
+        return True
+
+    def new_folder(self) -> str:
+        """Returns the path of a new upload folder, :py:meth:`started` is called after it is created."""
+        self._folder = "".join(choice(digits + ascii_lowercase) for _ in range(64))
+        self.uploaded = {}
+        return self.dav_path
+
+    def started(self) -> None:
+        if self.journal:
+            upload_journal_start(self.journal, self._header, self._folder)
+
+    def next_chunk(self, chunk: UploadChunk) -> Optional[int]:
+        """Returns the offset of the next `chunk` to upload, ``None`` if the previous attempt uploaded it."""
+        start_bytes = self.size
+        self.size += len(chunk[0])
+        return None if chunk_uploaded(self.uploaded, start_bytes, self.size, chunk[0]) else start_bytes
+
+    def chunk_request(self, start_bytes: int, chunk: UploadChunk) -> tuple[str, dict]:
+        """Returns the path and the headers of the ``PUT`` request of the chunk."""
+        return (
+            self.dav_path + "/" + get_chunk_name(start_bytes, start_bytes + len(chunk[0])),
+            {"OC-Checksum": chunk[2]} if chunk[2] else {},
+        )
+
+    def chunk_done(self, start_bytes: int, piece: Union[bytes, memoryview]) -> None:
+        if self.journal:
+            upload_journal_add(self.journal, get_chunk_name(start_bytes, start_bytes + len(piece)), chunk_digest(piece))
+
+    def stale_chunks(self) -> list[str]:
+        """Returns the paths of the chunks left by the previous attempt, which are not the part of the new file."""
+        return [self.dav_path + "/" + i for i in sorted(self.uploaded)]
+
+    def move_headers(self, dav_endpoint: str) -> dict:
+        """Returns the headers of the ``MOVE`` request, that assembles the file from the chunks."""
+        headers = {"Destination": dav_endpoint + self.full_path}
+        if self.checksum is not None:
+            headers["OC-Checksum"] = str(self.checksum)
+        return headers
+
+    def finish(self, completed: bool) -> bool:
+        """Removes the journal of the completed upload, returns if the upload folder should be removed.
+
+        The folder of the failed upload with a journal is kept, so the next attempt resumes the upload.
+        """
+        if completed and self.journal:
+            os.remove(self.journal)
+        return completed or not self.journal
+
+
+def build_upload_folder_req() -> str:
+    return build_listdir_req(["d:getcontentlength"])
+
+
+def parse_upload_folder_response(response: Response) -> dict[str, int]:
+    """Returns the names of the chunks present in the upload folder with their sizes."""
+    check_webdav_multistatus(response, "upload_stream: resume")
+    result = {}
+    for record in ElementTree.fromstring(response.content).iterfind("{DAV:}response"):
+        name = unquote(record.findtext("{DAV:}href", "")).rstrip("/").rsplit("/", maxsplit=1)[-1]
+        for prop_stat in record.iterfind("{DAV:}propstat"):
+            length = prop_stat.findtext("{DAV:}prop/{DAV:}getcontentlength")
+            if prop_stat.findtext("{DAV:}status", "").find("200 OK") != -1 and length:
+                result[name] = int(length)
+    return result
+
+
+def etag_fileid_from_response(response: Response) -> dict:
+    return {"etag": response.headers.get("OC-Etag", ""), "file_id": response.headers["OC-FileId"]}
+
+
+def check_webdav_multistatus(webdav_res: Response, info: str) -> None:
+    check_error(webdav_res.status_code, info=info)
+    if webdav_res.status_code != 207:  # multistatus
+        raise NextcloudException(webdav_res.status_code, "Response is not a multistatus.", info=info)
+
+
+def iter_parse_webdav_response(dav_url_suffix: str, chunks: Iterable[bytes], info: str, **kwargs) -> Iterator[FsNode]:
+    """Incrementally parses the multistatus response body, yielding ``FsNode`` as soon as its record is received."""
+    parser = WebDavParser(dav_url_suffix, info, **kwargs)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+class WebDavParser:
+    """Incremental parser of the multistatus responses, that does not keep already parsed records in memory."""
+
+    def __init__(
+        self, dav_url_suffix: str, info: str, table: Optional[FsNodeTable] = None, unavailable: tuple[str, ...] = ()
+    ):
+        """When ``table`` is specified, records are appended to it, instead of being returned as ``FsNode``.
+
+        ``unavailable`` are the ``FsNodeInfo`` attributes, which properties were not requested.
+        """
+        self._dav_url_suffix = dav_url_suffix
+        self._info = info
+        self._table = table
+        self._unavailable = unavailable
+        self._parser: ElementTree.XMLPullParser = ElementTree.XMLPullParser(events=("start", "end"))
+        self._root: Optional[ElementTree.Element] = None
+
+    def feed(self, data: bytes) -> list[FsNode]:
+        self._parser.feed(data)
+        return self._read_events()
+
+    def close(self) -> list[FsNode]:
+        self._parser.close()
+        return self._read_events()
+
+    def _read_events(self) -> list[FsNode]:
+        result = []
+        # only "start" and "end" events are requested, they always have an element
+        for event, element in cast(Iterator[tuple[str, ElementTree.Element]], self._parser.read_events()):
+            if self._root is None:
+                self._root = element
+            root = self._root
+            if event != "end":
+                continue
+            if element.tag == "{DAV:}response":
+                full_path, fs_node_args = _parse_record(self._dav_url_suffix, element)
+                if self._table is not None:
+                    if fs_node_args.get("file_id"):
+                        self._table.append(full_path, **fs_node_args)
+                elif fs_node_args.get("file_id"):
+                    result.append(FsNode(full_path, unavailable=self._unavailable, **fs_node_args))
+                root.remove(element)
+            elif element is root and element.tag == "{DAV:}error":
+                exception = element.findtext("{http://sabredav.org/ns}exception", "")
+                message = element.findtext("{http://sabredav.org/ns}message", "")
+                raise NextcloudException(reason=f"{exception}: {message}".replace("\n", ""), info=self._info)
+        return result
+
+
+_RECORD_PROPERTIES: dict[str, tuple[str, Callable[[str], Any]]] = {
+    "{http://owncloud.org/ns}id": ("file_id", str),
+    "{http://owncloud.org/ns}fileid": ("fileid", int),
+    "{http://owncloud.org/ns}size": ("size", int),
+    "{DAV:}getcontentlength": ("content_length", int),
+    "{DAV:}getetag": ("etag", str),
+    "{DAV:}getlastmodified": ("last_modified", str),
+    "{http://owncloud.org/ns}permissions": ("permissions", sys.intern),  # only a few distinct values
+    "{http://owncloud.org/ns}favorite": ("favorite", lambda x: bool(int(x))),
+}
+
+
+def _parse_record(dav_url_suffix: str, record: ElementTree.Element) -> tuple[str, dict]:
+    obj_full_path = unquote(record.findtext("{DAV:}href", ""))
+    obj_full_path = obj_full_path.replace(dav_url_suffix, "").lstrip("/")
+    fs_node_args: dict[str, Any] = {}
+    for prop_stat in record.iterfind("{DAV:}propstat"):
+        if prop_stat.findtext("{DAV:}status", "").find("200 OK") == -1:
+            continue
+        for prop in prop_stat.iterfind("{DAV:}prop/*"):
+            if prop.tag in _RECORD_PROPERTIES and prop.text is not None:
+                name, convert = _RECORD_PROPERTIES[prop.tag]
+                fs_node_args[name] = convert(prop.text)
+            elif prop.tag == "{http://owncloud.org/ns}checksums":
+                checksums = " ".join(i.text for i in prop.iter("{http://owncloud.org/ns}checksum") if i.text)
+                if checksums:
+                    fs_node_args["checksums"] = checksums
+    return obj_full_path, fs_node_args
@@ -0,0 +1,185 @@
+"""Helper functions for :py:meth:`~nc_py_api.files.files.FilesAPI.sync` shared by the sync and async APIs."""
+
+import os
+import shutil
+import sqlite3
+from contextlib import closing, suppress
+from functools import partial
+from typing import NamedTuple, Optional
+
+from . import FsNode, SyncPlan
+from ._files import CHECKSUM_TYPES, Checksum
+
+SYNC_STATE_NAME = ".nc_py_api_sync.db"
+
+
+class SyncEntry(NamedTuple):
+    """State of the object after the last sync."""
+
+    etag: str
+    size: int
+    mtime: float
+    file_id: str
+    is_dir: bool
+
+
+def sync_entry_from_node(fs_node: FsNode) -> SyncEntry:
+    return SyncEntry(fs_node.etag.strip('"'), fs_node.info.size, 0.0, fs_node.file_id, fs_node.is_dir)
+
+
+def sync_relative_path(fs_node: FsNode, remote_dir: str) -> str:
+    path = fs_node.user_path.strip("/")
+    return path[len(remote_dir) + 1 :] if remote_dir else path
+
+
+def sync_remote_path(remote_dir: str, path: str) -> str:
+    return f"{remote_dir}/{path}" if remote_dir else path
+
+
+def sync_state_load(state_path: str, origin: str) -> dict[str, SyncEntry]:
+    """Loads the state saved by the previous sync. The state of the sync with another ``origin`` is ignored."""
+    if not os.path.isfile(state_path):
+        return {}
+    with closing(sqlite3.connect(state_path)) as conn:
+        try:
+            if conn.execute("SELECT value FROM info WHERE key = 'origin'").fetchone() != (origin,):
+                return {}
+            rows = conn.execute("SELECT path, etag, size, mtime, file_id, is_dir FROM entries").fetchall()
+        except sqlite3.DatabaseError:
+            return {}
+    return {i[0]: SyncEntry(i[1], i[2], i[3], i[4], bool(i[5])) for i in rows}
+
+
+def sync_state_save(state_path: str, origin: str, state: dict[str, SyncEntry]) -> None:
+    conn = sqlite3.connect(state_path)
+    try:
+        with conn:  # commits all changes in one transaction
+            conn.execute("CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries "
+                "(path TEXT PRIMARY KEY, etag TEXT, size INTEGER, mtime REAL, file_id TEXT, is_dir INTEGER)"
+            )
+            conn.execute("INSERT OR REPLACE INTO info VALUES ('origin', ?)", (origin,))
+            conn.execute("DELETE FROM entries")
+            conn.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?)", ((k, *v) for k, v in state.items()))
+    finally:
+        conn.close()
+
+
+def sync_state_subtrees(state: dict[str, SyncEntry], pruned: set[str]) -> dict[str, SyncEntry]:
+    """Returns the saved state of everything inside the directories that were not changed since the last sync."""
+    result = {}
+    if pruned:
+        for path, entry in state.items():
+            parent = path
+            while "/" in parent:
+                parent = parent.rsplit("/", maxsplit=1)[0]
+                if parent in pruned:
+                    result[path] = entry
+                    break
+    return result
+
+
+def sync_state_remove(state: dict[str, SyncEntry], path: str) -> None:
+    for i in [i for i in state if i == path or i.startswith(path + "/")]:
+        del state[i]
+
+
+def sync_scan_local(local_dir: str, state_path: Optional[str] = None) -> dict[str, SyncEntry]:
+    result = {}
+    state_path = os.path.abspath(state_path) if state_path else None
+    for root, dirs, files in os.walk(local_dir):
+        for name in dirs + files:
+            full_path = os.path.join(root, name)
+            if state_path and os.path.abspath(full_path).startswith(state_path):
+                continue  # state database and its journal
+            with suppress(FileNotFoundError):
+                stat = os.stat(full_path)
+                is_dir = name in dirs
+                path = os.path.relpath(full_path, local_dir).replace(os.sep, "/")
+                result[path] = SyncEntry("", 0 if is_dir else stat.st_size, stat.st_mtime, "", is_dir)
+    return result
+
+
+def upload_tree_unchanged(local_path: str, size: int, fs_node: Optional[FsNode]) -> bool:
+    """Checks if the remote file has the same size and the same checksum, as the local file has."""
+    if fs_node is None or fs_node.is_dir or fs_node.info.size != size:
+        return False
+    checksums = fs_node.info.checksums
+    checksum_type = next((i for i in CHECKSUM_TYPES if i in checksums), None)
+    if checksum_type is None:  # the file was uploaded without the checksum, there is nothing to compare with
+        return False
+    checksum = Checksum(checksum_type)
+    with open(local_path, "rb") as f:
+        for data in iter(partial(f.read, 1024 * 1024), b""):
+            checksum.update(data)
+    return checksum.hexdigest() == checksums[checksum_type]
+
+
+def build_sync_plan(
+    download: bool, remote: dict[str, SyncEntry], local: dict[str, SyncEntry], state: dict[str, SyncEntry]
+) -> SyncPlan:
+    """Compares the objects with their state after the last sync and returns the changes for the destination."""
+    source, target = (remote, local) if download else (local, remote)
+    plan = SyncPlan()
+    for path in sorted(source):
+        src, dst = source[path], target.get(path)
+        if dst is not None and dst.is_dir != src.is_dir:
+            plan.delete.append(path)
+            dst = None
+        if src.is_dir:
+            if dst is None:
+                plan.mkdir.append(path)
+        elif dst is None or not _sync_unchanged(remote[path], local[path], state.get(path)):
+            plan.transfer.append(path)
+    plan.delete = _top_most(sorted(plan.delete + [i for i in target if i not in source and i in state]))
+    return plan
+
+
+def sync_state_finalize(
+    state: dict[str, SyncEntry],
+    download: bool,
+    remote: dict[str, SyncEntry],
+    local: dict[str, SyncEntry],
+    plan: SyncPlan,
+) -> None:
+    """Updates directories in the state after all changes were successfully applied."""
+    source = remote if download else local
+    for i in [i for i in state if i not in source]:
+        del state[i]
+    changed = set()
+    if not download:  # ETags of the remote directories are changed by the upload, they should be listed next time
+        for path in plan.delete + plan.mkdir + plan.transfer:
+            changed.add(path)
+            while "/" in path:
+                path = path.rsplit("/", maxsplit=1)[0]
+                changed.add(path)
+    for path, entry in source.items():
+        if entry.is_dir:
+            remote_entry = remote.get(path)
+            if remote_entry is None or path in changed:
+                state[path] = SyncEntry("", 0, 0.0, "", True)
+            else:
+                state[path] = remote_entry
+
+
+def sync_remove_local(path: str) -> None:
+    with suppress(FileNotFoundError):
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+
+
+def _sync_unchanged(remote: SyncEntry, local: SyncEntry, state: Optional[SyncEntry]) -> bool:
+    if state is None or state.is_dir:
+        return False
+    return remote.etag == state.etag and local.size == state.size and local.mtime == state.mtime
+
+
+def _top_most(paths: list[str]) -> list[str]:
+    result: list[str] = []
+    for path in paths:
+        if not result or not path.startswith(result[-1] + "/"):
+            result.append(path)
+    return result
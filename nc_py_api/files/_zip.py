@@ -0,0 +1,185 @@
+"""Incremental reader of the zip archives, that does not require the whole archive to be received first."""
+
+import struct
+import zlib
+from typing import Optional
+from zipfile import BadZipFile
+
+_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+_LOCAL_SIGNATURE = b"PK\x03\x04"
+_DESCRIPTOR_SIGNATURE = b"PK\x07\x08"
+_END_SIGNATURES = (b"PK\x01\x02", b"PK\x05\x05", b"PK\x05\x06", b"PK\x06\x06", b"PK\x06\x07")
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+
+
+class _ZipEntry:  # pylint: disable=too-many-instance-attributes
+    def __init__(self, name: str, flags: int, method: int, crc: int, compressed_size: Optional[int], zip64: bool):
+        self.name = name
+        self.flags = flags
+        self.method = method
+        self.crc = crc
+        self.remaining = compressed_size
+        self.zip64 = zip64
+        self.decompressor = zlib.decompressobj(-zlib.MAX_WBITS) if method == 8 else None
+        self.data_done = False
+        self.descriptor_read = not flags & _FLAG_DATA_DESCRIPTOR
+        self.crc_running = 0
+        self.size = 0
+        self.emitted = False
+
+
+class ZipStreamParser:
+    """Incremental parser of zip archives, that returns the content of the files as soon as it is received.
+
+    Supports archives created by the streaming writers: with data descriptors, ``stored`` or ``deflated``, and Zip64.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._entry: Optional[_ZipEntry] = None
+        self._done = False
+
+    def feed(self, data: bytes) -> list[tuple[str, bytes]]:
+        """Parses the next part of the archive, returns the list of ``(name, data)`` pieces of the files in it.
+
+        Pieces of each file go one after another. Files without content, including directories,
+        are returned as one piece with empty data.
+        """
+        result: list[tuple[str, bytes]] = []
+        if not self._done:
+            self._buffer += data
+            while not self._done and (self._read_header() if self._entry is None else self._read_entry(result)):
+                pass
+        return result
+
+    def close(self) -> None:
+        """Checks that the archive was received completely."""
+        if not self._done:
+            raise BadZipFile("Zip archive is truncated.")
+
+    def _read_header(self) -> bool:
+        if len(self._buffer) < 4:
+            return False
+        signature = bytes(self._buffer[:4])
+        if signature in _END_SIGNATURES:  # central directory duplicates the information from the local headers
+            self._done = True
+            self._buffer.clear()
+            return False
+        if signature != _LOCAL_SIGNATURE:
+            raise BadZipFile("Bad magic number for file header.")
+        if len(self._buffer) < _LOCAL_HEADER.size:
+            return False
+        _, _, flags, method, _, _, crc, compressed_size, size, name_len, extra_len = _LOCAL_HEADER.unpack_from(
+            self._buffer
+        )
+        header_size = _LOCAL_HEADER.size + name_len + extra_len
+        if len(self._buffer) < header_size:
+            return False
+        if method not in (0, 8):
+            raise BadZipFile(f"Unsupported compression method {method}.")
+        name = bytes(self._buffer[_LOCAL_HEADER.size : _LOCAL_HEADER.size + name_len])
+        extra = bytes(self._buffer[_LOCAL_HEADER.size + name_len : header_size])
+        del self._buffer[:header_size]
+        zip64, compressed_size = _parse_zip64_extra(extra, size, compressed_size)
+        if flags & _FLAG_DATA_DESCRIPTOR and not compressed_size:
+            compressed_size = None  # size is stored after the data
+        self._entry = _ZipEntry(
+            name.decode("utf-8" if flags & _FLAG_UTF8 else "cp437"), flags, method, crc, compressed_size, zip64
+        )
+        return True
+
+    def _read_entry(self, result: list[tuple[str, bytes]]) -> bool:
+        entry: _ZipEntry = self._entry  # type: ignore
+        if not entry.data_done:
+            if entry.remaining is not None:
+                self._read_sized_data(entry, result)
+            elif entry.decompressor is not None:
+                self._read_deflated_data(entry, result)
+            else:
+                self._read_stored_data(entry, result)
+            if not entry.data_done:
+                return False
+        if not entry.descriptor_read and not self._read_descriptor(entry):
+            return False
+        if entry.crc_running != entry.crc:
+            raise BadZipFile(f"Bad CRC-32 for file {entry.name!r}")
+        if not entry.emitted:
+            result.append((entry.name, b""))
+        self._entry = None
+        return True
+
+    def _read_sized_data(self, entry: _ZipEntry, result: list[tuple[str, bytes]]) -> None:
+        data = bytes(self._buffer[: entry.remaining])
+        del self._buffer[: len(data)]
+        entry.remaining -= len(data)  # type: ignore
+        if entry.decompressor is not None:
+            data = entry.decompressor.decompress(data)
+            if not entry.remaining:
+                data += entry.decompressor.flush()
+        _emit(entry, data, result)
+        entry.data_done = not entry.remaining
+
+    def _read_deflated_data(self, entry: _ZipEntry, result: list[tuple[str, bytes]]) -> None:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        _emit(entry, entry.decompressor.decompress(data), result)  # type: ignore
+        if entry.decompressor.eof:  # type: ignore
+            self._buffer += entry.decompressor.unused_data  # type: ignore
+            entry.data_done = True
+
+    def _read_stored_data(self, entry: _ZipEntry, result: list[tuple[str, bytes]]) -> None:
+        # the end of data is found by the data descriptor, that has the matching CRC-32 and size
+        descriptor_size = 4 + 4 + (16 if entry.zip64 else 8)
+        start = 0
+        while True:
+            i = self._buffer.find(_DESCRIPTOR_SIGNATURE, start)
+            if i == -1:
+                i = max(len(self._buffer) - len(_DESCRIPTOR_SIGNATURE) + 1, 0)
+                break
+            if len(self._buffer) < i + descriptor_size:
+                break
+            crc, compressed_size = struct.unpack_from("<IQ" if entry.zip64 else "<II", self._buffer, i + 4)
+            if compressed_size == entry.size + i and crc == zlib.crc32(self._buffer[:i], entry.crc_running):
+                _emit(entry, bytes(self._buffer[:i]), result)
+                del self._buffer[: i + descriptor_size]
+                entry.crc = crc
+                entry.data_done = entry.descriptor_read = True
+                return
+            start = i + 1
+        _emit(entry, bytes(self._buffer[:i]), result)
+        del self._buffer[:i]
+
+    def _read_descriptor(self, entry: _ZipEntry) -> bool:
+        if len(self._buffer) < 4:
+            return False
+        offset = 4 if self._buffer[:4] == _DESCRIPTOR_SIGNATURE else 0
+        if len(self._buffer) < offset + 4 + (16 if entry.zip64 else 8):
+            return False
+        entry.crc = struct.unpack_from("<I", self._buffer, offset)[0]
+        del self._buffer[: offset + 4 + (16 if entry.zip64 else 8)]
+        entry.descriptor_read = True
+        return True
+
+
+def _emit(entry: _ZipEntry, data: bytes, result: list[tuple[str, bytes]]) -> None:
+    if data:
+        entry.crc_running = zlib.crc32(data, entry.crc_running)
+        entry.size += len(data)
+        entry.emitted = True
+        result.append((entry.name, data))
+
+
+def _parse_zip64_extra(extra: bytes, size: int, compressed_size: int) -> tuple[bool, int]:
+    offset = 0
+    while offset + 4 <= len(extra):
+        tag, tag_size = struct.unpack_from("<HH", extra, offset)
+        if tag == 0x0001:
+            values = extra[offset + 4 : offset + 4 + tag_size]
+            if size == 0xFFFFFFFF:
+                values = values[8:]
+            if compressed_size == 0xFFFFFFFF and len(values) >= 8:
+                compressed_size = struct.unpack_from("<Q", values)[0]
+            return True, compressed_size
+        offset += 4 + tag_size
+    return False, compressed_size
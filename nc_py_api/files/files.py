@@ -1,56 +1,102 @@
 """Nextcloud API for working with the file system."""
+# pylint: disable=too-many-lines
 
+import asyncio
 import builtins
 import os
+import shutil
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from contextlib import asynccontextmanager, contextmanager, nullcontext
 from io import BytesIO
-from json import dumps, loads
+from mmap import mmap
 from pathlib import Path
-from random import choice
-from string import ascii_lowercase, digits
-from typing import Optional, Union
-from urllib.parse import unquote
-from xml.etree import ElementTree
+from threading import Lock
+from time import perf_counter
+from typing import Any, Optional, Union
 
-import xmltodict
 from httpx import Response
 
 from .._exceptions import NextcloudException, check_error
-from .._session import NcSessionBasic
-from . import FsNode
-from .sharing import _FilesSharingAPI
-
-PROPFIND_PROPERTIES = [
-    "d:resourcetype",
-    "d:getlastmodified",
-    "d:getcontentlength",
-    "d:getetag",
-    "oc:size",
-    "oc:id",
-    "oc:fileid",
-    "oc:downloadURL",
-    "oc:dDC",
-    "oc:permissions",
-    "oc:checksums",
-    "oc:share-types",
-    "oc:favorite",
-    "nc:is-encrypted",
-    "nc:lock",
-    "nc:lock-owner-displayname",
-    "nc:lock-owner",
-    "nc:lock-owner-type",
-    "nc:lock-owner-editor",
-    "nc:lock-time",
-    "nc:lock-timeout",
-]
-
-SEARCH_PROPERTIES_MAP = {
-    "name": "d:displayname",  # like, eq
-    "mime": "d:getcontenttype",  # like, eq
-    "last_modified": "d:getlastmodified",  # gt, eq, lt
-    "size": "oc:size",  # gt, gte, eq, lt
-    "favorite": "oc:favorite",  # eq
-    "fileid": "oc:fileid",  # eq
-}
+from .._session import AsyncNcSessionBasic, NcSessionBasic
+from . import (
+    DownloadCache,
+    FilesCache,
+    FsNode,
+    FsNodeTable,
+    SearchQuery,
+    SyncPlan,
+    TransferStats,
+)
+from ._files import (
+    ETAG_PROPERTIES,
+    FIND_BY_ID_QUERY,
+    FIND_IDS_CHUNK_SIZE,
+    PROPFIND_PROPERTIES,
+    UPLOAD_BUFFER_TYPES,
+    ChunkedUpload,
+    KnownDirs,
+    RangedDownload,
+    UploadChunk,
+    WalkFrontier,
+    WebDavParser,
+    aiter_upload_chunks,
+    build_find_ids_request,
+    build_find_request,
+    build_listdir_req,
+    build_move_copy_headers,
+    build_path_prefixes,
+    build_paths_parents,
+    build_range_headers,
+    build_report_req,
+    build_setfav_req,
+    build_tree_levels,
+    build_upload_folder_req,
+    build_walk_level,
+    check_checksum,
+    check_download2stream_args,
+    check_webdav_multistatus,
+    clear_file_id,
+    dav_get_obj_path,
+    download_checksum,
+    download_resumable,
+    etag_fileid_from_response,
+    is_listdir_self,
+    iter_parse_webdav_response,
+    iter_upload_chunks,
+    listdir_exclude_self,
+    listdir_self_etag,
+    map_upload_file,
+    new_checksum,
+    parse_upload_folder_response,
+    resolve_properties,
+    table_exclude_self,
+    unavailable_info,
+)
+from ._sync import (
+    SYNC_STATE_NAME,
+    SyncEntry,
+    build_sync_plan,
+    sync_entry_from_node,
+    sync_relative_path,
+    sync_remote_path,
+    sync_remove_local,
+    sync_scan_local,
+    sync_state_finalize,
+    sync_state_load,
+    sync_state_remove,
+    sync_state_save,
+    sync_state_subtrees,
+    upload_tree_unchanged,
+)
+from ._zip import ZipStreamParser
+from .sharing import _AsyncFilesSharingAPI, _FilesSharingAPI
 
 
 class FilesAPI:
@@ -58,24 +104,99 @@ class FilesAPI:
 
     sharing: _FilesSharingAPI
     """API for managing Files Shares"""
+    cache: Optional[FilesCache]
+    """Metadata cache for :py:meth:`listdir`, :py:meth:`by_id`, :py:meth:`by_path` and :py:meth:`find`.
+    Disabled by default, assign :py:class:`~nc_py_api.files.FilesCache` instance to enable it."""
+    download_cache: Optional[DownloadCache]
+    """On-disk cache of the files content for :py:meth:`download` and :py:meth:`download2stream`.
+    For ``FsNode`` arguments the cached content is served without requests, for paths the ETag of the ``GET``
+    response is checked and the body is not read when the content is cached.
+    Disabled by default, assign :py:class:`~nc_py_api.files.DownloadCache` instance to enable it."""
 
     def __init__(self, session: NcSessionBasic):
         self._session = session
         self.sharing = _FilesSharingAPI(session)
+        self.cache = None
+        self.download_cache = None
+        self._known_dirs = KnownDirs()
 
-    def listdir(self, path: Union[str, FsNode] = "", depth: int = 1, exclude_self=True) -> list[FsNode]:
+    def listdir(
+        self,
+        path: Union[str, FsNode] = "",
+        depth: int = 1,
+        exclude_self=True,
+        properties: Union[str, list[str], None] = None,
+    ) -> list[FsNode]:
         """Returns a list of all entries in the specified directory.
 
         :param path: path to the directory to get the list.
         :param depth: how many directory levels should be included in output. Default = **1** (only specified directory)
         :param exclude_self: boolean value indicating whether the `path` itself should be excluded from the list or not.
             Default = **True**.
+        :param properties: name of the properties profile: ``minimal``, ``sync`` or ``full``, or a list of
+            :py:class:`~nc_py_api.files.FsNodeInfo` attributes to get. Default = **None** (``full``).
+            Not requested attributes are unavailable, and the responses are smaller.
         """
         if exclude_self and not depth:
             raise ValueError("Wrong input parameters, query will return nothing.")
-        properties = PROPFIND_PROPERTIES
+        properties = resolve_properties(properties)
         path = path.user_path if isinstance(path, FsNode) else path
-        return self._listdir(self._session.user, path, properties=properties, depth=depth, exclude_self=exclude_self)
+        if self.cache is None:
+            return self._listdir(
+                self._session.user, path, properties=properties, depth=depth, exclude_self=exclude_self
+            )
+        full_path = dav_get_obj_path(self._session.user, path)
+        key = ("listdir", full_path.strip("/"), depth, tuple(properties))
+        fs_nodes = self.__cache_get(key)
+        if fs_nodes is None:
+            fs_nodes = self._listdir(self._session.user, path, properties=properties, depth=depth, exclude_self=False)
+            self.cache.put(key, fs_nodes, full_path, listdir_self_etag(fs_nodes, path))
+        return listdir_exclude_self(fs_nodes, path, exclude_self)
+
+    def iter_listdir(
+        self,
+        path: Union[str, FsNode] = "",
+        depth: int = 1,
+        exclude_self=True,
+        properties: Union[str, list[str], None] = None,
+    ) -> Iterator[FsNode]:
+        """Same as :py:meth:`listdir`, but returns a generator, that yields entries as soon as they are received.
+
+        Only the entry being processed is kept in memory, which makes it suitable for the huge listings with
+        ``depth=-1``. The connection stays in use until the generator is exhausted or closed.
+        """
+        if exclude_self and not depth:
+            raise ValueError("Wrong input parameters, query will return nothing.")
+        path = path.user_path if isinstance(path, FsNode) else path
+        return self._iter_listdir(self._session.user, path, resolve_properties(properties), depth, exclude_self)
+
+    def walk(self, path: Union[str, FsNode] = "", **kwargs) -> Iterator[tuple[FsNode, list[FsNode], list[FsNode]]]:
+        """Generates the directory tree top-down, like ``os.walk``, listing one directory level per request.
+
+        Yields a tuple of the directory ``FsNode``, a list of its subdirectories and a list of its files.
+        The list of subdirectories can be modified in place to prune the walk.
+
+        :param path: path of the directory to walk.
+        :param kwargs: **workers** an int value specifying how many directories are listed concurrently.
+            Default = **1**; **properties** the same as for :py:meth:`listdir`.
+
+        .. note:: Only the directories waiting to be listed and at most **workers** + 1 listings are kept in memory.
+        """
+        workers = max(int(kwargs.get("workers", 1)), 1)
+        properties = resolve_properties(kwargs.get("properties"))
+        frontier = WalkFrontier(path.user_path if isinstance(path, FsNode) else path, workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                while frontier:
+                    dir_node, dirs, files = frontier.next(
+                        lambda i: executor.submit(self.__walk_level, i, properties)
+                    ).result()
+                    if not dir_node.is_dir:
+                        continue
+                    yield dir_node, dirs, files
+                    frontier.extend(dirs)
+            finally:
+                frontier.cancel()
 
     def by_id(self, file_id: Union[int, str, FsNode]) -> Optional[FsNode]:
         """Returns :py:class:`~nc_py_api.files.FsNode` by file_id if any.
@@ -83,51 +204,198 @@ class FilesAPI:
         :param file_id: can be full file ID with Nextcloud instance ID or only clear file ID.
         """
         file_id = file_id.file_id if isinstance(file_id, FsNode) else file_id
-        result = self.find(req=["eq", "fileid", file_id])
-        return result[0] if result else None
+        root = dav_get_obj_path(self._session.user).lstrip("/")
+        path = self.cache.path_by_id(str(file_id), root) if self.cache is not None else None
+        fs_node = self.__cache_get(("by_path", path)) if path is not None else None
+        if fs_node is None:
+            result = self._find(FIND_BY_ID_QUERY, "", params={"fileid": file_id})
+            fs_node = result[0] if result else None
+            self.__cache_put(fs_node)
+        return fs_node
+
+    def by_ids(self, file_ids: Iterable[Union[int, str, FsNode]]) -> dict[Union[int, str], Optional[FsNode]]:
+        """Returns :py:class:`~nc_py_api.files.FsNode` for each of the file IDs, ``None`` for the missing ones.
+
+        All objects are found with one ``SEARCH`` request, large lists are split into the requests of 500 IDs.
+
+        :param file_ids: full file IDs with Nextcloud instance ID or only clear file IDs, they are the result keys.
+        """
+        ids: list[Union[int, str]] = [i.file_id if isinstance(i, FsNode) else i for i in file_ids]
+        clear_ids = sorted({clear_file_id(i) for i in ids})
+        found: dict[int, FsNode] = {}
+        for i in range(0, len(clear_ids), FIND_IDS_CHUNK_SIZE):
+            for fs_node in self._iter_dav_nodes(
+                "SEARCH",
+                "",
+                build_find_ids_request(clear_ids[i : i + FIND_IDS_CHUNK_SIZE], self._session.user),
+                {"Content-Type": "text/xml"},
+                f"by_ids: {self._session.user}, {len(clear_ids)} IDs",
+            ):
+                found[fs_node.info.fileid] = fs_node
+                self.__cache_put(fs_node)
+        return {i: found.get(clear_file_id(i)) for i in ids}
+
+    def by_paths(self, paths: Iterable[Union[str, FsNode]]) -> dict[str, Optional[FsNode]]:
+        """Returns :py:class:`~nc_py_api.files.FsNode` for each of the paths, ``None`` for the missing ones.
+
+        Paths are grouped by their parent directories, and each directory is listed once with ``Depth: 1``.
+
+        :param paths: paths of the objects, they are the result keys.
+        """
+        user_paths = [i.user_path if isinstance(i, FsNode) else i for i in paths]
+        found: dict[str, FsNode] = {}
+        for parent in build_paths_parents(user_paths):
+            try:
+                for fs_node in self._iter_listdir(self._session.user, parent, PROPFIND_PROPERTIES, 1, False):
+                    found[fs_node.user_path.strip("/")] = fs_node
+            except NextcloudException as e:
+                if e.status_code != 404:
+                    raise
+        result = {i: found.get(i.strip("/")) for i in user_paths}
+        for i in result.values():
+            self.__cache_put(i)
+        return result
 
     def by_path(self, path: Union[str, FsNode]) -> Optional[FsNode]:
         """Returns :py:class:`~nc_py_api.files.FsNode` by exact path if any."""
         path = path.user_path if isinstance(path, FsNode) else path
-        result = self.listdir(path, depth=0, exclude_self=False)
-        return result[0] if result else None
+        fs_node = self.__cache_get(("by_path", dav_get_obj_path(self._session.user, path).strip("/")))
+        if fs_node is None:
+            result = self._listdir(self._session.user, path, PROPFIND_PROPERTIES, 0, False)
+            fs_node = result[0] if result else None
+            self.__cache_put(fs_node)
+        return fs_node
 
-    def find(self, req: list, path: Union[str, FsNode] = "") -> list[FsNode]:
+    def find(  # pylint: disable=too-many-arguments
+        self,
+        req: Union[list, SearchQuery],
+        path: Union[str, FsNode] = "",
+        limit: Optional[int] = None,
+        offset: int = 0,
+        order_by: Union[str, list[str], None] = None,
+        *,
+        params: Optional[dict[str, Any]] = None,
+        properties: Union[str, list[str], None] = None,
+    ) -> list[FsNode]:
         """Searches a directory for a file or subdirectory with a name.
 
-        :param req: list of conditions to search for. Detailed description here...
+        :param req: :py:class:`~nc_py_api.files.SearchQuery` or list of conditions to search for.
+            Detailed description here...
         :param path: path where to search from. Default = **""**.
+        :param limit: maximum number of the returned objects, the server stops the search after finding them.
+        :param offset: number of the found objects to skip, to get the next page of the results. Default = **0**.
+        :param order_by: key or a list of keys to sort the results on the server, the same as for the conditions.
+            Key starting with ``-``, like ``-last_modified``, sorts in descending order.
+        :param params: values of the :py:meth:`~nc_py_api.files.SearchQuery.param` placeholders in ``req``.
+        :param properties: the same as for :py:meth:`listdir`.
         """
         # `req` possible keys: "name", "mime", "last_modified", "size", "favorite", "fileid"
         path = path.user_path if isinstance(path, FsNode) else path
-        root = ElementTree.Element(
-            "d:searchrequest",
-            attrib={"xmlns:d": "DAV:", "xmlns:oc": "http://owncloud.org/ns", "xmlns:nc": "http://nextcloud.org/ns"},
+        if self.cache is None:
+            return self._find(
+                req, path, limit=limit, offset=offset, order_by=order_by, params=params, properties=properties
+            )
+        full_path = dav_get_obj_path(self._session.user, path)
+        key = (
+            "find",
+            repr(req),
+            full_path.strip("/"),
+            limit,
+            offset,
+            repr(order_by),
+            repr(params),
+            repr(properties),
         )
-        xml_search = ElementTree.SubElement(root, "d:basicsearch")
-        xml_select_prop = ElementTree.SubElement(ElementTree.SubElement(xml_search, "d:select"), "d:prop")
-        for i in PROPFIND_PROPERTIES:
-            ElementTree.SubElement(xml_select_prop, i)
-        xml_from_scope = ElementTree.SubElement(ElementTree.SubElement(xml_search, "d:from"), "d:scope")
-        href = f"/files/{self._session.user}/{path.removeprefix('/')}"
-        ElementTree.SubElement(xml_from_scope, "d:href").text = href
-        ElementTree.SubElement(xml_from_scope, "d:depth").text = "infinity"
-        xml_where = ElementTree.SubElement(xml_search, "d:where")
-        self._build_search_req(xml_where, req)
+        fs_nodes = self.__cache_get(key)
+        if fs_nodes is None:
+            etag = self.__etag(full_path)
+            fs_nodes = self._find(
+                req, path, limit=limit, offset=offset, order_by=order_by, params=params, properties=properties
+            )
+            self.cache.put(key, fs_nodes, full_path, etag)
+        return list(fs_nodes)
 
-        headers = {"Content-Type": "text/xml"}
-        webdav_response = self._session.dav("SEARCH", "", data=self._element_tree_as_str(root), headers=headers)
+    def iter_find(
+        self,
+        req: Union[list, SearchQuery],
+        path: Union[str, FsNode] = "",
+        page_size: int = 100,
+        order_by: Union[str, list[str], None] = None,
+        params: Optional[dict[str, Any]] = None,
+        properties: Union[str, list[str], None] = None,
+    ) -> Iterator[FsNode]:
+        """Same as :py:meth:`find`, but returns a generator, that requests the results page by page when needed.
+
+        :param page_size: number of the objects requested at once. Default = **100**.
+        :param order_by: the same as for :py:meth:`find`, the results are sorted by ``fileid`` if not specified,
+            as pages require a stable order.
+        """
+        if page_size < 1:
+            raise ValueError("`page_size` should be greater than zero.")
+        path = path.user_path if isinstance(path, FsNode) else path
+        offset = 0
+        while True:
+            fs_nodes = self._find(
+                req,
+                path,
+                limit=page_size,
+                offset=offset,
+                order_by=order_by or "fileid",
+                params=params,
+                properties=properties,
+            )
+            yield from fs_nodes
+            if len(fs_nodes) < page_size:
+                return
+            offset += page_size
+
+    def listdir_table(self, path: Union[str, FsNode] = "", depth: int = 1, exclude_self=True) -> FsNodeTable:
+        """Same as :py:meth:`listdir`, but returns the result in columnar :py:class:`~nc_py_api.files.FsNodeTable`."""
+        if exclude_self and not depth:
+            raise ValueError("Wrong input parameters, query will return nothing.")
+        path = path.user_path if isinstance(path, FsNode) else path
+        headers = {"Depth": "infinity" if depth == -1 else str(depth)}
+        table = FsNodeTable()
+        for _ in self._iter_dav_nodes(
+            "PROPFIND",
+            dav_get_obj_path(self._session.user, path),
+            build_listdir_req(PROPFIND_PROPERTIES),
+            headers,
+            f"list: {self._session.user}, {path}",
+            table=table,
+        ):
+            pass  # records are stored in the table
+        return table_exclude_self(table, path) if exclude_self else table
+
+    def find_table(self, req: Union[list, SearchQuery], path: Union[str, FsNode] = "") -> FsNodeTable:
+        """Same as :py:meth:`find`, but returns the result in columnar :py:class:`~nc_py_api.files.FsNodeTable`."""
+        path = path.user_path if isinstance(path, FsNode) else path
         request_info = f"find: {self._session.user}, {req}, {path}"
-        return self._lf_parse_webdav_records(webdav_response, request_info)
+        headers = {"Content-Type": "text/xml"}
+        table = FsNodeTable()
+        for _ in self._iter_dav_nodes(
+            "SEARCH", "", build_find_request(req, path, self._session.user), headers, request_info, table=table
+        ):
+            pass  # records are stored in the table
+        return table
 
-    def download(self, path: Union[str, FsNode]) -> bytes:
+    def download(self, path: Union[str, FsNode], verify: bool = False) -> bytes:
         """Downloads and returns the content of a file.
 
         :param path: path to download file.
+        :param verify: if ``True``, the content is checked against the checksum the server has for the file.
+            If the server has no checksum for the file, ``NextcloudException`` is raised.
         """
+        if self.download_cache is not None:
+            buffer = BytesIO()
+            self.__download2stream_cached(path, buffer, verify=verify)
+            return buffer.getvalue()
         path = path.user_path if isinstance(path, FsNode) else path
-        response = self._session.dav("GET", self._dav_get_obj_path(self._session.user, path))
+        response = self._session.dav("GET", dav_get_obj_path(self._session.user, path))
         check_error(response.status_code, f"download: user={self._session.user}, path={path}")
+        if verify:
+            info = f"download: user={self._session.user}, path={path}"
+            check_checksum(download_checksum(response.headers, info), response.headers, info, response.content)
         return response.content
 
     def download2stream(self, path: Union[str, FsNode], fp, **kwargs) -> None:
@@ -137,13 +405,33 @@ class FilesAPI:
         :param fp: filename (string), pathlib.Path object or a file object.
             The object must implement the ``file.write`` method and be able to write binary data.
         :param kwargs: **chunk_size** an int value specifying chunk size to write. Default = **4Mb**
+
+            **workers** an int value specifying how many parts of the file are downloaded concurrently, each of
+            **chunk_size** bytes. Requires a seekable `fp`. Default = **1**
+
+            **resume** if ``True``, the data already present in `fp` is kept and only the rest of the file is
+            downloaded. Requires `path` to be an ``FsNode``, its ``etag`` is used to verify that the file was not
+            changed since, otherwise the file is downloaded again from the start. Default = **False**
+
+            **verify** if ``True``, the data is checked against the checksum the server has for the file, while
+            it is downloaded. The file is downloaded in one stream, **resume** is not supported. If the server has
+            no checksum for the file, ``NextcloudException`` is raised before any data is written. Default = **False**
+
+        .. note:: When the server ignores ``Range`` requests, the file is downloaded in one stream.
         """
+        check_download2stream_args(path, **kwargs)
+        if self.download_cache is not None and not kwargs.get("resume", False):
+            self.__download2stream_cached(path, fp, **kwargs)
+            return
+        etag = path.etag if isinstance(path, FsNode) else ""
         path = path.user_path if isinstance(path, FsNode) else path
         if isinstance(fp, (str, Path)):
-            with builtins.open(fp, "wb") as f:
-                self.__download2stream(path, f, **kwargs)
+            resume = kwargs.get("resume", False) and os.path.isfile(fp)
+            with builtins.open(fp, "r+b" if resume else "wb") as f:
+                f.seek(0, os.SEEK_END)
+                self.__download2stream(path, f, etag, **kwargs)
         elif hasattr(fp, "write"):
-            self.__download2stream(path, fp, **kwargs)
+            self.__download2stream(path, fp, etag, **kwargs)
         else:
             raise TypeError("`fp` must be a path to file or an object with `write` method.")
 
@@ -159,48 +447,112 @@ class FilesAPI:
         .. note:: This works only for directories, you should not use this to download a file.
         """
         path = path.user_path if isinstance(path, FsNode) else path
-        with self._session.get_stream(
-            "/index.php/apps/files/ajax/download.php", params={"dir": path}
-        ) as response:  # type: ignore
-            self._session.response_headers = response.headers
-            check_error(response.status_code, f"download_directory_as_zip: user={self._session.user}, path={path}")
-            result_path = local_path if local_path else os.path.basename(path)
-            with open(
-                result_path,
-                "wb",
-            ) as fp:
-                for data_chunk in response.iter_raw(chunk_size=kwargs.get("chunk_size", 4 * 1024 * 1024)):
-                    fp.write(data_chunk)
+        result_path = local_path if local_path else os.path.basename(path)
+        self.download_directory_as_zip2stream(path, result_path, **kwargs)
         return Path(result_path)
 
-    def upload(self, path: Union[str, FsNode], content: Union[bytes, str]) -> FsNode:
+    def download_directory_as_zip2stream(self, path: Union[str, FsNode], fp, **kwargs) -> None:
+        """Downloads a remote directory as zip archive to the given `fp` object, as the archive is received.
+
+        :param path: path to directory to download.
+        :param fp: filename (string), pathlib.Path object or a file object.
+            The object must implement the ``file.write`` method and be able to write binary data.
+            File is opened only after the server starts to send the archive.
+        :param kwargs: **chunk_size** an int value specifying chunk size to write. Default = **4Mb**
+        """
+        if not isinstance(fp, (str, Path)) and not hasattr(fp, "write"):
+            raise TypeError("`fp` must be a path to file or an object with `write` method.")
+        path = path.user_path if isinstance(path, FsNode) else path
+        with self.__zip_stream(path) as response:  # noqa: SIM117
+            with builtins.open(fp, "wb") if isinstance(fp, (str, Path)) else nullcontext(fp) as f:
+                for data_chunk in response.iter_raw(chunk_size=kwargs.get("chunk_size", 4 * 1024 * 1024)):
+                    f.write(data_chunk)
+
+    def iter_directory_as_zip(self, path: Union[str, FsNode], **kwargs) -> Iterator[bytes]:
+        """Downloads a remote directory as zip archive, yielding the archive by chunks as they are received.
+
+        :param path: path to directory to download.
+        :param kwargs: **chunk_size** an int value specifying the size of chunks. Default = **4Mb**
+
+        .. note:: The connection is kept until the iteration is finished or the generator is closed.
+        """
+        path = path.user_path if isinstance(path, FsNode) else path
+        with self.__zip_stream(path) as response:
+            yield from response.iter_raw(chunk_size=kwargs.get("chunk_size", 4 * 1024 * 1024))
+
+    def iter_directory_as_zip_entries(self, path: Union[str, FsNode], **kwargs) -> Iterator[tuple[str, bytes]]:
+        """Downloads a remote directory as zip archive, yielding the content of the files in it as it is received.
+
+        Yields ``(name, data)`` pieces, the pieces of each file go one after another, files without content and
+        directories are yielded once with empty data. Nothing is stored on the disk or kept in memory.
+
+        :param path: path to directory to download.
+        :param kwargs: **chunk_size** an int value specifying chunk size to read. Default = **4Mb**
+        """
+        parser = ZipStreamParser()
+        for data_chunk in self.iter_directory_as_zip(path, **kwargs):
+            yield from parser.feed(data_chunk)
+        parser.close()
+
+    def upload(
+        self,
+        path: Union[str, FsNode],
+        content: Union[bytes, str, bytearray, memoryview, mmap],
+        verify: Union[bool, str] = False,
+    ) -> FsNode:
         """Creates a file with the specified content at the specified path.
 
         :param path: file's upload path.
         :param content: content to create the file. If it is a string, it will be encoded into bytes using UTF-8.
+            Buffers like ``bytearray``, ``memoryview`` or ``mmap`` are sent without copying.
+        :param verify: if set, the checksum of the content is sent in ``OC-Checksum`` header, so the server
+            rejects corrupted data and keeps the checksum for the later downloads. ``True`` is for **SHA1**,
+            **MD5** and **ADLER32** types can be specified by name.
         """
         path = path.user_path if isinstance(path, FsNode) else path
-        full_path = self._dav_get_obj_path(self._session.user, path)
-        response = self._session.dav("PUT", full_path, data=content)
+        if not isinstance(content, (bytes, str)):
+            content = memoryview(content).cast("B")
+        full_path = dav_get_obj_path(self._session.user, path)
+        headers = {}
+        checksum = new_checksum(verify)
+        if checksum is not None:
+            checksum.update(content.encode("UTF-8") if isinstance(content, str) else content)
+            headers["OC-Checksum"] = str(checksum)
+        response = self._session.dav("PUT", full_path, data=content, headers=headers)
         check_error(response.status_code, f"upload: user={self._session.user}, path={path}, size={len(content)}")
-        return FsNode(full_path.strip("/"), **self.__get_etag_fileid_from_response(response))
+        self.__cache_invalidate(path)
+        return FsNode(full_path.strip("/"), **etag_fileid_from_response(response))
 
     def upload_stream(self, path: Union[str, FsNode], fp, **kwargs) -> FsNode:
         """Creates a file with content provided by `fp` object at the specified path.
 
         :param path: file's upload path.
-        :param fp: filename (string), pathlib.Path object or a file object.
-            The object must implement the ``file.read`` method providing data with str or bytes type.
+        :param fp: filename (string), pathlib.Path object, buffer, file object or an iterable of data pieces.
+            Files are memory-mapped, and chunks of them and of the buffers, like ``mmap`` or ``memoryview``,
+            are sent without copying. File objects must implement the ``file.read`` method providing data
+            with str or bytes type. Pieces of any size, e.g. from a generator, are collected into chunks.
         :param kwargs: **chunk_size** an int value specifying chunk size to read. Default = **4Mb**
+
+            **workers** an int value specifying how many chunks are uploaded concurrently. Default = **1**
+
+            **journal** path to a local file to record the upload progress in. If the upload fails, the chunks
+            already on the server are kept, and calling this method again with the same arguments resumes it.
+            Only the chunks that were not changed since are reused, the rest of the upload folder is removed.
+
+            **verify** same as for the :py:meth:`upload`, checksums of the chunks and of the whole file are
+            computed while reading them. Default = **False**
+
+        .. note:: With **workers** > 1, up to ``workers * chunk_size`` bytes read from file objects and iterables
+            are held in memory.
         """
         path = path.user_path if isinstance(path, FsNode) else path
         if isinstance(fp, (str, Path)):
-            with builtins.open(fp, "rb") as f:
-                return self.__upload_stream(path, f, **kwargs)
-        elif hasattr(fp, "read"):
-            return self.__upload_stream(path, fp, **kwargs)
-        else:
-            raise TypeError("`fp` must be a path to file or an object with `read` method.")
+            fp = map_upload_file(fp)
+        elif isinstance(fp, UPLOAD_BUFFER_TYPES):
+            fp = memoryview(fp).cast("B")
+        elif not hasattr(fp, "read") and not isinstance(fp, Iterable):
+            raise TypeError("`fp` must be a path to file, buffer, iterable or an object with `read` method.")
+        return self.__upload_stream(path, fp, **kwargs)
 
     def mkdir(self, path: Union[str, FsNode]) -> FsNode:
         """Creates a new directory.
@@ -208,11 +560,12 @@ class FilesAPI:
         :param path: path of the directory to be created.
         """
         path = path.user_path if isinstance(path, FsNode) else path
-        full_path = self._dav_get_obj_path(self._session.user, path)
+        full_path = dav_get_obj_path(self._session.user, path)
         response = self._session.dav("MKCOL", full_path)
         check_error(response.status_code, f"mkdir: user={self._session.user}, path={path}")
+        self.__cache_invalidate(path)
         full_path += "/" if not full_path.endswith("/") else ""
-        return FsNode(full_path.lstrip("/"), **self.__get_etag_fileid_from_response(response))
+        return FsNode(full_path.lstrip("/"), **etag_fileid_from_response(response))
 
     def makedirs(self, path: Union[str, FsNode], exist_ok=False) -> Optional[FsNode]:
         """Creates a new directory and subdirectories.
@@ -220,21 +573,44 @@ class FilesAPI:
         :param path: path of the directories to be created.
         :param exist_ok: ignore error if any of pathname components already exists.
         :returns: `FsNode` if directory was created or ``None`` if it was already created.
+
+        .. note:: With **exist_ok** the deepest existing directory is found first with ``Depth: 0`` requests,
+            and only the missing directories are created. The existing directories are remembered,
+            so the next calls for the paths inside them do not check them again, the last directory
+            of the path is always created or checked.
         """
-        _path = ""
         path = path.user_path if isinstance(path, FsNode) else path
-        result = None
-        for i in Path(path).parts:
-            _path = os.path.join(_path, i)
-            if not exist_ok:
-                result = self.mkdir(_path)
-            else:
-                try:
-                    result = self.mkdir(_path)
-                except NextcloudException as e:
-                    if e.status_code != 405:
-                        raise e from None
-        return result
+        prefixes = build_path_prefixes(path)
+        if not exist_ok:
+            result = None
+            for i in prefixes:
+                result = self.mkdir(i)
+            return result
+        try:
+            return self.__makedirs_missing(prefixes)
+        except NextcloudException as e:
+            if e.status_code != 409:
+                raise
+            self._known_dirs.clear(self._session.user)  # some remembered directories were deleted meanwhile
+            return self.__makedirs_missing(prefixes)
+
+    def makedirs_many(self, paths: Iterable[Union[str, FsNode]], **kwargs) -> None:
+        """Creates the directories with all their parent directories, the existing ones are skipped.
+
+        :param paths: paths of the directories to be created.
+        :param kwargs: **workers** an int value specifying how many directories of the same level
+            are created concurrently. Default = **4**
+        """
+        workers = max(int(kwargs.get("workers", 4)), 1)
+        prefixes = [build_path_prefixes(i.user_path if isinstance(i, FsNode) else i) for i in paths]
+        leaves = sorted({i[-1] for i in prefixes if i}, reverse=True)  # subdirectories are probed before parents
+        try:
+            self.__makedirs_many_missing(leaves, workers)
+        except NextcloudException as e:
+            if e.status_code != 409:
+                raise
+            self._known_dirs.clear(self._session.user)
+            self.__makedirs_many_missing(leaves, workers)
 
     def delete(self, path: Union[str, FsNode], not_fail=False) -> None:
         """Deletes a file/directory (moves to trash if trash is enabled).
@@ -243,69 +619,89 @@ class FilesAPI:
         :param not_fail: if set to ``True`` and the object is not found, it does not raise an exception.
         """
         path = path.user_path if isinstance(path, FsNode) else path
-        response = self._session.dav("DELETE", self._dav_get_obj_path(self._session.user, path))
+        response = self._session.dav("DELETE", dav_get_obj_path(self._session.user, path))
+        self.__cache_invalidate(path)
         if response.status_code == 404 and not_fail:
             return
         check_error(response.status_code, f"delete: user={self._session.user}, path={path}")
 
-    def move(self, path_src: Union[str, FsNode], path_dest: Union[str, FsNode], overwrite=False) -> FsNode:
+    def move(
+        self, path_src: Union[str, FsNode], path_dest: Union[str, FsNode], overwrite=False, return_node=True
+    ) -> Optional[FsNode]:
         """Moves an existing file or a directory.
 
         :param path_src: path of an existing file/directory.
         :param path_dest: name of the new one.
         :param overwrite: if ``True`` and the destination object already exists, it gets overwritten.
             Default = **False**.
+        :param return_node: if ``False``, the destination object is not requested from the server, and ``None``
+            is returned. Default = **True**.
         """
         path_src = path_src.user_path if isinstance(path_src, FsNode) else path_src
-        full_dest_path = self._dav_get_obj_path(
-            self._session.user, path_dest.user_path if isinstance(path_dest, FsNode) else path_dest
-        )
-        dest = self._session.cfg.dav_endpoint + full_dest_path
-        headers = {"Destination": dest, "Overwrite": "T" if overwrite else "F"}
+        path_dest = path_dest.user_path if isinstance(path_dest, FsNode) else path_dest
+        full_dest_path = dav_get_obj_path(self._session.user, path_dest)
+        headers = build_move_copy_headers(self._session.cfg.dav_endpoint, full_dest_path, overwrite)
         response = self._session.dav(
             "MOVE",
-            self._dav_get_obj_path(self._session.user, path_src),
+            dav_get_obj_path(self._session.user, path_src),
             headers=headers,
         )
-        check_error(response.status_code, f"move: user={self._session.user}, src={path_src}, dest={dest}, {overwrite}")
-        return self.find(req=["eq", "fileid", response.headers["OC-FileId"]])[0]
+        check_error(
+            response.status_code,
+            f"move: user={self._session.user}, src={path_src}, dest={headers['Destination']}, {overwrite}",
+        )
+        self.__cache_invalidate(path_src, path_dest)
+        return self.__destination_node(path_dest) if return_node else None
 
-    def copy(self, path_src: Union[str, FsNode], path_dest: Union[str, FsNode], overwrite=False) -> FsNode:
+    def copy(
+        self, path_src: Union[str, FsNode], path_dest: Union[str, FsNode], overwrite=False, return_node=True
+    ) -> Optional[FsNode]:
         """Copies an existing file/directory.
 
         :param path_src: path of an existing file/directory.
         :param path_dest: name of the new one.
         :param overwrite: if ``True`` and the destination object already exists, it gets overwritten.
             Default = **False**.
+        :param return_node: if ``False``, the destination object is not requested from the server, and ``None``
+            is returned. Default = **True**.
         """
         path_src = path_src.user_path if isinstance(path_src, FsNode) else path_src
-        full_dest_path = self._dav_get_obj_path(
-            self._session.user, path_dest.user_path if isinstance(path_dest, FsNode) else path_dest
-        )
-        dest = self._session.cfg.dav_endpoint + full_dest_path
-        headers = {"Destination": dest, "Overwrite": "T" if overwrite else "F"}
+        path_dest = path_dest.user_path if isinstance(path_dest, FsNode) else path_dest
+        full_dest_path = dav_get_obj_path(self._session.user, path_dest)
+        headers = build_move_copy_headers(self._session.cfg.dav_endpoint, full_dest_path, overwrite)
         response = self._session.dav(
             "COPY",
-            self._dav_get_obj_path(self._session.user, path_src),
+            dav_get_obj_path(self._session.user, path_src),
             headers=headers,
         )
-        check_error(response.status_code, f"copy: user={self._session.user}, src={path_src}, dest={dest}, {overwrite}")
-        return self.find(req=["eq", "fileid", response.headers["OC-FileId"]])[0]
+        check_error(
+            response.status_code,
+            f"copy: user={self._session.user}, src={path_src}, dest={headers['Destination']}, {overwrite}",
+        )
+        self.__cache_invalidate(path_dest)
+        return self.__destination_node(path_dest) if return_node else None
 
     def listfav(self) -> list[FsNode]:
         """Returns a list of the current user's favorite files."""
-        root = ElementTree.Element(
-            "oc:filter-files",
-            attrib={"xmlns:d": "DAV:", "xmlns:oc": "http://owncloud.org/ns", "xmlns:nc": "http://nextcloud.org/ns"},
-        )
-        xml_filter_rules = ElementTree.SubElement(root, "oc:filter-rules")
-        ElementTree.SubElement(xml_filter_rules, "oc:favorite").text = "1"
-        webdav_response = self._session.dav(
-            "REPORT", self._dav_get_obj_path(self._session.user), data=self._element_tree_as_str(root)
+        return self.report({"favorite": 1})
+
+    def report(self, filter_rules: dict[str, Any], path: Union[str, FsNode] = "") -> list[FsNode]:
+        """Returns a list of the objects matching all the filter rules, with one ``REPORT`` request.
+
+        :param filter_rules: rules of the ``oc:filter-files`` request, like ``{"favorite": 1}`` or
+            ``{"systemtag": [1, 2]}`` for the objects with all of the system tags with these IDs.
+        :param path: path of the directory to search in. Default = **""**.
+        """
+        path = path.user_path if isinstance(path, FsNode) else path
+        return list(
+            self._iter_dav_nodes(
+                "REPORT",
+                dav_get_obj_path(self._session.user, path),
+                build_report_req(filter_rules, PROPFIND_PROPERTIES),
+                {},
+                f"report: {self._session.user}, {filter_rules}, {path}",
+            )
         )
-        request_info = f"listfav: {self._session.user}"
-        check_error(webdav_response.status_code, request_info)
-        return self._lf_parse_webdav_records(webdav_response, request_info, favorite=True)
 
     def setfav(self, path: Union[str, FsNode], value: Union[int, bool]) -> None:
         """Sets or unsets favourite flag for specific file.
@@ -314,177 +710,1694 @@ class FilesAPI:
         :param value: value to set for the ``favourite`` state.
         """
         path = path.user_path if isinstance(path, FsNode) else path
-        root = ElementTree.Element(
-            "d:propertyupdate",
-            attrib={"xmlns:d": "DAV:", "xmlns:oc": "http://owncloud.org/ns"},
-        )
-        xml_set = ElementTree.SubElement(root, "d:set")
-        xml_set_prop = ElementTree.SubElement(xml_set, "d:prop")
-        ElementTree.SubElement(xml_set_prop, "oc:favorite").text = str(int(bool(value)))
         webdav_response = self._session.dav(
-            "PROPPATCH", self._dav_get_obj_path(self._session.user, path), data=self._element_tree_as_str(root)
+            "PROPPATCH", dav_get_obj_path(self._session.user, path), data=build_setfav_req(bool(value))
         )
         check_error(webdav_response.status_code, f"setfav: path={path}, value={value}")
+        self.__cache_invalidate(path)
 
-    def _listdir(self, user: str, path: str, properties: list[str], depth: int, exclude_self: bool) -> list[FsNode]:
-        root = ElementTree.Element(
-            "d:propfind",
-            attrib={"xmlns:d": "DAV:", "xmlns:oc": "http://owncloud.org/ns", "xmlns:nc": "http://nextcloud.org/ns"},
+    def upload_tree(self, path: Union[str, FsNode], local_dir: Union[str, Path], **kwargs) -> TransferStats:
+        """Uploads the local directory with all its content, creating each remote directory once.
+
+        :param path: path to the directory on the server, it is created if missing.
+        :param local_dir: path to the local directory.
+        :param kwargs: **workers** an int value specifying how many files, or directories of the same level,
+            are created concurrently. Default = **4**
+
+            **chunk_size** files up to this size are uploaded with one request, larger ones are uploaded
+            with :py:meth:`upload_stream` in chunks of this size. Default = **4Mb**
+
+            **skip_unchanged** if ``True``, the remote tree is listed first, and the files, that are already on
+            the server with the same size and checksum, are skipped. Local files are hashed concurrently, and
+            the uploaded files are sent with the checksum, so the next upload can skip them. Default = **False**
+
+        .. note:: With **skip_unchanged** the files, that were uploaded without a checksum, are uploaded once more.
+        """
+        start_time = perf_counter()
+        path = (path.user_path if isinstance(path, FsNode) else path).strip("/")
+        local_dir = os.fspath(local_dir)
+        workers = max(int(kwargs.get("workers", 4)), 1)
+        chunk_size = kwargs.get("chunk_size", 4 * 1024 * 1024)
+        skip_unchanged = kwargs.get("skip_unchanged", False)
+        local = sync_scan_local(local_dir)
+        remote = self.__upload_tree_remote(path, workers) if skip_unchanged else {}
+        if path and "" not in remote:
+            self.makedirs(path, exist_ok=True)
+        dirs = [i for i, v in local.items() if v.is_dir and not (i in remote and remote[i].is_dir)]
+        for level in build_tree_levels(dirs):
+            self.__transfer_pool(self.__mkdir_exist_ok, [(sync_remote_path(path, i),) for i in level], workers)
+        files = [(i, os.path.join(local_dir, i), v.size) for i, v in local.items() if not v.is_dir]
+        changed = self.__upload_tree_changed(files, remote, workers) if skip_unchanged else files
+        size = self.__transfer_pool(
+            self.__upload_tree_file,
+            [(sync_remote_path(path, i[0]), i[1], i[2], chunk_size, skip_unchanged) for i in changed],
+            workers,
         )
-        prop = ElementTree.SubElement(root, "d:prop")
-        for i in properties:
-            ElementTree.SubElement(prop, i)
-        headers = {"Depth": "infinity" if depth == -1 else str(depth)}
-        webdav_response = self._session.dav(
-            "PROPFIND", self._dav_get_obj_path(user, path), data=self._element_tree_as_str(root), headers=headers
+        return TransferStats(
+            len(changed), len(dirs), size, perf_counter() - start_time, skipped=len(files) - len(changed)
         )
-        request_info = f"list: {user}, {path}, {properties}"
-        result = self._lf_parse_webdav_records(webdav_response, request_info)
-        if exclude_self:
-            for index, v in enumerate(result):
-                if v.user_path.rstrip("/") == path.rstrip("/"):
-                    del result[index]
-                    break
-        return result
 
-    def _parse_records(self, fs_records: list[dict], favorite: bool):
-        result: list[FsNode] = []
-        for record in fs_records:
-            obj_full_path = unquote(record.get("d:href", ""))
-            obj_full_path = obj_full_path.replace(self._session.cfg.dav_url_suffix, "").lstrip("/")
-            propstat = record["d:propstat"]
-            fs_node = self._parse_record(obj_full_path, propstat if isinstance(propstat, list) else [propstat])
-            if favorite and not fs_node.file_id:
-                _fs_node = self.by_path(fs_node.user_path)
-                if _fs_node:
-                    _fs_node.info.favorite = True
-                    result.append(_fs_node)
-            elif fs_node.file_id:
-                result.append(fs_node)
-        return result
+    def download_tree(self, path: Union[str, FsNode], local_dir: Union[str, Path], **kwargs) -> TransferStats:
+        """Downloads the remote directory with all its content to the local directory.
 
-    @staticmethod
-    def _parse_record(full_path: str, prop_stats: list[dict]) -> FsNode:
-        fs_node_args = {}
-        for prop_stat in prop_stats:
-            if str(prop_stat.get("d:status", "")).find("200 OK") == -1:
+        :param path: path to the directory on the server.
+        :param local_dir: path to the local directory, it is created if missing.
+        :param kwargs: **workers** an int value specifying how many files are downloaded, and directories listed,
+            concurrently. Default = **4**
+
+            **chunk_size** files up to this size are downloaded with one request, larger ones are streamed
+            with :py:meth:`download2stream` in chunks of this size. Default = **4Mb**
+        """
+        start_time = perf_counter()
+        path = (path.user_path if isinstance(path, FsNode) else path).strip("/")
+        local_dir = os.fspath(local_dir)
+        workers = max(int(kwargs.get("workers", 4)), 1)
+        chunk_size = kwargs.get("chunk_size", 4 * 1024 * 1024)
+        dirs: list[str] = []
+        files: list[tuple[FsNode, str, int]] = []
+        for _, sub_dirs, sub_files in self.walk(path, workers=workers, properties="sync"):
+            dirs.extend(sync_relative_path(i, path) for i in sub_dirs)
+            files.extend((i, os.path.join(local_dir, sync_relative_path(i, path)), chunk_size) for i in sub_files)
+        os.makedirs(local_dir, exist_ok=True)
+        for i in dirs:
+            os.makedirs(os.path.join(local_dir, i), exist_ok=True)
+        size = self.__transfer_pool(self.__download_tree_file, files, workers)
+        return TransferStats(len(files), len(dirs), size, perf_counter() - start_time)
+
+    def sync(
+        self, local_dir: Union[str, Path], remote_dir: Union[str, FsNode] = "", direction: str = "download", **kwargs
+    ) -> SyncPlan:
+        """Makes the local directory a copy of the remote one or vice versa, transferring only the changed files.
+
+        The state of the objects after the sync is saved to the local database, so the next sync does not list
+        the remote directories whose ETag did not change, and does not transfer the files not changed on both sides.
+
+        :param local_dir: path to the local directory.
+        :param remote_dir: path to the directory on the server.
+        :param direction: ``download`` to update the local directory from the server, ``upload`` for the opposite.
+            Default = **download**
+        :param kwargs: **state** path to the local SQLite database with the state of the last sync.
+            Default = **local_dir/.nc_py_api_sync.db**
+
+            **workers** an int value specifying how many files are transferred, and directories are listed,
+            concurrently. Default = **4**
+
+            **dry_run** if ``True``, the changes are only returned and not made. Default = **False**
+        :returns: :py:class:`~nc_py_api.files.SyncPlan` with the changes made to the destination.
+
+        .. note:: Only the objects created by the previous syncs are deleted from the destination,
+            objects created there by other means are kept.
+        """
+        if direction not in ("download", "upload"):
+            raise ValueError("`direction` must be `download` or `upload`.")
+        download = direction == "download"
+        local_dir = os.fspath(local_dir)
+        remote_dir = (remote_dir.user_path if isinstance(remote_dir, FsNode) else remote_dir).strip("/")
+        state_path = os.fspath(kwargs.get("state", os.path.join(local_dir, SYNC_STATE_NAME)))
+        workers = max(int(kwargs.get("workers", 4)), 1)
+        origin = self._session.cfg.dav_endpoint + dav_get_obj_path(self._session.user, remote_dir)
+        if download:
+            os.makedirs(local_dir, exist_ok=True)
+        state = sync_state_load(state_path, origin)
+        remote = self.__sync_remote(remote_dir, state, workers, not download)
+        local = sync_scan_local(local_dir, state_path)
+        plan = build_sync_plan(download, remote, local, state)
+        if kwargs.get("dry_run", False):
+            return plan
+        try:
+            self.__sync_apply(download, local_dir, remote_dir, plan, remote, state, workers)
+            sync_state_finalize(state, download, remote, local, plan)
+        finally:
+            sync_state_save(state_path, origin, state)
+        return plan
+
+    def _find(self, req: Union[list, SearchQuery], path: str, **kwargs) -> list[FsNode]:
+        request_info = f"find: {self._session.user}, {req}, {path}"
+        headers = {"Content-Type": "text/xml"}
+        properties = resolve_properties(kwargs.pop("properties", None))
+        data = build_find_request(req, path, self._session.user, properties=properties, **kwargs)
+        return list(
+            self._iter_dav_nodes("SEARCH", "", data, headers, request_info, unavailable=unavailable_info(properties))
+        )
+
+    def __destination_node(self, path: str) -> FsNode:
+        fs_node = self._listdir(self._session.user, path, PROPFIND_PROPERTIES, 0, False)[0]
+        self.__cache_put(fs_node)
+        return fs_node
+
+    def __cache_get(self, key: tuple):
+        if self.cache is None:
+            return None
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        if self.cache.expired(entry):
+            if self.__etag(entry.path) != entry.etag:
+                self.cache.remove(key)
+                return None
+            self.cache.refresh(entry)
+        return entry.value
+
+    def __cache_put(self, fs_node: Optional[FsNode]) -> None:
+        if self.cache is not None and fs_node is not None:
+            self.cache.put(("by_path", fs_node.full_path.strip("/")), fs_node, fs_node.full_path, fs_node.etag)
+
+    def __cache_invalidate(self, *paths: str) -> None:
+        self._known_dirs.forget(self._session.user, paths)
+        if self.cache is not None:
+            self.cache.invalidate(*(dav_get_obj_path(self._session.user, i) for i in paths))
+
+    def __etag(self, full_path: str) -> str:
+        full_path = "/" + full_path.strip("/")
+        try:
+            result = list(
+                self._iter_dav_nodes(
+                    "PROPFIND", full_path, build_listdir_req(ETAG_PROPERTIES), {"Depth": "0"}, f"etag: {full_path}"
+                )
+            )
+        except NextcloudException as e:
+            if e.status_code != 404:
+                raise
+            return ""
+        return result[0].etag if result else ""
+
+    def _iter_dav_nodes(
+        self, method: str, path: str, data: str, headers: dict, info: str, **kwargs
+    ) -> Iterator[FsNode]:
+        with self._session.dav_stream(method, path, data=data, headers=headers) as response:  # type: ignore
+            self._session.response_headers = response.headers
+            check_webdav_multistatus(response, info)
+            yield from iter_parse_webdav_response(
+                self._session.cfg.dav_url_suffix, response.iter_bytes(), info, **kwargs
+            )
+
+    def _listdir(self, user: str, path: str, properties: list[str], depth: int, exclude_self: bool) -> list[FsNode]:
+        return list(self._iter_listdir(user, path, properties, depth, exclude_self))
+
+    def _iter_listdir(
+        self, user: str, path: str, properties: list[str], depth: int, exclude_self: bool
+    ) -> Iterator[FsNode]:
+        headers = {"Depth": "infinity" if depth == -1 else str(depth)}
+        request_info = f"list: {user}, {path}, {properties}"
+        for fs_node in self._iter_dav_nodes(
+            "PROPFIND",
+            dav_get_obj_path(user, path),
+            build_listdir_req(properties),
+            headers,
+            request_info,
+            unavailable=unavailable_info(properties),
+        ):
+            if exclude_self and is_listdir_self(fs_node, path):
+                exclude_self = False
                 continue
-            prop: dict = prop_stat["d:prop"]
-            prop_keys = prop.keys()
-            if "oc:id" in prop_keys:
-                fs_node_args["file_id"] = prop["oc:id"]
-            if "oc:fileid" in prop_keys:
-                fs_node_args["fileid"] = int(prop["oc:fileid"])
-            if "oc:size" in prop_keys:
-                fs_node_args["size"] = int(prop["oc:size"])
-            if "d:getcontentlength" in prop_keys:
-                fs_node_args["content_length"] = int(prop["d:getcontentlength"])
-            if "d:getetag" in prop_keys:
-                fs_node_args["etag"] = prop["d:getetag"]
-            if "d:getlastmodified" in prop_keys:
-                fs_node_args["last_modified"] = prop["d:getlastmodified"]
-            if "oc:permissions" in prop_keys:
-                fs_node_args["permissions"] = prop["oc:permissions"]
-            if "oc:favorite" in prop_keys:
-                fs_node_args["favorite"] = bool(int(prop["oc:favorite"]))
-            # xz = prop.get("oc:dDC", "")
-        return FsNode(full_path, **fs_node_args)
-
-    def _lf_parse_webdav_records(self, webdav_res: Response, info: str, favorite=False) -> list[FsNode]:
-        check_error(webdav_res.status_code, info=info)
-        if webdav_res.status_code != 207:  # multistatus
-            raise NextcloudException(webdav_res.status_code, "Response is not a multistatus.", info=info)
-        response_data = loads(dumps(xmltodict.parse(webdav_res.text)))
-        if "d:error" in response_data:
-            err = response_data["d:error"]
-            raise NextcloudException(reason=f'{err["s:exception"]}: {err["s:message"]}'.replace("\n", ""), info=info)
-        response = response_data["d:multistatus"].get("d:response", [])
-        return self._parse_records([response] if isinstance(response, dict) else response, favorite)
+            yield fs_node
 
-    @staticmethod
-    def _dav_get_obj_path(user: str, path: str = "", root_path="/files") -> str:
-        obj_dav_path = root_path
-        if user:
-            obj_dav_path += "/" + user
-        if path:
-            obj_dav_path += "/" + path.lstrip("/")
-        return obj_dav_path
+    def __walk_level(self, path: str, properties: list[str]) -> tuple[FsNode, list[FsNode], list[FsNode]]:
+        return build_walk_level(self._listdir(self._session.user, path, properties, 1, False))
 
-    @staticmethod
-    def _element_tree_as_str(element) -> str:
-        with BytesIO() as buffer:
-            ElementTree.ElementTree(element).write(buffer, xml_declaration=True)
-            buffer.seek(0)
-            return buffer.read().decode("utf-8")
+    @contextmanager
+    def __zip_stream(self, path: str) -> Iterator[Response]:
+        with self._session.get_stream(
+            "/index.php/apps/files/ajax/download.php", params={"dir": path}
+        ) as response:  # type: ignore
+            self._session.response_headers = response.headers
+            check_error(response.status_code, f"download_directory_as_zip: user={self._session.user}, path={path}")
+            yield response
 
-    @staticmethod
-    def _build_search_req(xml_element_where, req: list) -> None:
-        def _process_or_and(xml_element, or_and: str):
-            _where_part_root = ElementTree.SubElement(xml_element, f"d:{or_and}")
-            _add_value(_where_part_root)
-            _add_value(_where_part_root)
-
-        def _add_value(xml_element, val=None) -> None:
-            first_val = req.pop(0) if val is None else val
-            if first_val in ("or", "and"):
-                _process_or_and(xml_element, first_val)
-                return
-            _root = ElementTree.SubElement(xml_element, f"d:{first_val}")
-            _ = ElementTree.SubElement(_root, "d:prop")
-            ElementTree.SubElement(_, SEARCH_PROPERTIES_MAP[req.pop(0)])
-            _ = ElementTree.SubElement(_root, "d:literal")
-            value = req.pop(0)
-            _.text = value if isinstance(value, str) else str(value)
-
-        while len(req):
-            where_part = req.pop(0)
-            if where_part in ("or", "and"):
-                _process_or_and(xml_element_where, where_part)
-            else:
-                _add_value(xml_element_where, where_part)
+    def __download2stream(self, path: str, fp, etag: str, **kwargs) -> str:
+        if download_resumable(fp, **kwargs):
+            if self.__download_remainder(path, fp, etag, **kwargs):
+                return ""
+            fp.seek(0)
+            fp.truncate()
+        plan = RangedDownload(fp, **kwargs)
+        info = f"download_stream: user={self._session.user}, path={path}"
+        with self._session.dav_stream(
+            "GET", dav_get_obj_path(self._session.user, path), headers=plan.first_headers()
+        ) as response:  # type: ignore
+            self._session.response_headers = response.headers
+            check_error(response.status_code, info)
+            etag = response.headers.get("ETag", "")
+            cache_key = kwargs.get("cache_key", "")
+            cached = self.download_cache.open(cache_key, etag) if self.download_cache and cache_key else None
+            if cached is not None:  # the body is not read, the content is taken from the cache
+                with cached:
+                    shutil.copyfileobj(cached, fp, plan.chunk_size)
+                return ""
+            checksum = download_checksum(response.headers, info) if plan.verify else None
+            for data_chunk in response.iter_raw(chunk_size=plan.chunk_size):
+                fp.write(data_chunk)
+                if checksum is not None:
+                    checksum.update(data_chunk)
+            check_checksum(checksum, response.headers, info)
+            parts = plan.parts(response, etag)
+        if parts:  # the server honored `Range`, download the rest of the file in parallel
+            self.__download_ranges(path, fp, parts, **kwargs)
+            fp.seek(plan.end)
+        return etag
 
-    def __download2stream(self, path: str, fp, **kwargs) -> None:
+    def __download_remainder(self, path: str, fp, etag: str, **kwargs) -> bool:
+        headers = build_range_headers(fp.tell(), None, etag)
         with self._session.dav_stream(
-            "GET", self._dav_get_obj_path(self._session.user, path)
+            "GET", dav_get_obj_path(self._session.user, path), headers=headers
         ) as response:  # type: ignore
             self._session.response_headers = response.headers
+            if response.status_code != 416:
+                check_error(response.status_code, f"download_stream: user={self._session.user}, path={path}")
+                if response.status_code != 206:  # file was changed, the response contains it from the start
+                    fp.seek(0)
+                    fp.truncate()
+                for data_chunk in response.iter_raw(chunk_size=kwargs.get("chunk_size", 4 * 1024 * 1024)):
+                    fp.write(data_chunk)
+                return True
+        # nothing left to download, or local data is bigger than the file: the server does not tell the file size
+        fs_node = self._listdir(self._session.user, path, resolve_properties(["size"]), 0, False)[0]
+        return fs_node.info.size == fp.tell() and fs_node.etag == etag
+
+    def __download_ranges(self, path: str, fp, parts: list[tuple[dict, int]], **kwargs) -> None:
+        chunk_size = kwargs.get("chunk_size", 4 * 1024 * 1024)
+        lock = Lock()
+        with ThreadPoolExecutor(max_workers=int(kwargs["workers"])) as executor:
+            futures = [executor.submit(self.__download_range, path, fp, lock, *i, chunk_size) for i in parts]
+            try:
+                for i in as_completed(futures):
+                    i.result()
+            finally:
+                for i in futures:
+                    i.cancel()
+
+    def __download_range(self, path: str, fp, lock: Lock, headers: dict, offset: int, chunk_size: int) -> None:
+        dav_path = dav_get_obj_path(self._session.user, path)
+        with self._session.dav_stream("GET", dav_path, headers=headers) as response:  # type: ignore
             check_error(response.status_code, f"download_stream: user={self._session.user}, path={path}")
-            for data_chunk in response.iter_raw(chunk_size=kwargs.get("chunk_size", 4 * 1024 * 1024)):
-                fp.write(data_chunk)
+            if response.status_code != 206:
+                raise NextcloudException(412, "File was changed during download.", info=f"path={path}")
+            for data_chunk in response.iter_raw(chunk_size=chunk_size):
+                with lock:
+                    fp.seek(offset)
+                    fp.write(data_chunk)
+                offset += len(data_chunk)
 
-    def __upload_stream(self, path: str, fp, **kwargs) -> FsNode:
-        _rnd_folder = "".join(choice(digits + ascii_lowercase) for _ in range(64))
-        _dav_path = self._dav_get_obj_path(self._session.user, _rnd_folder, root_path="/uploads")
-        response = self._session.dav("MKCOL", _dav_path)
+    @staticmethod
+    def __transfer_pool(func, args_list: list[tuple], workers: int) -> int:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(func, *i) for i in args_list]
+            try:
+                return sum(i.result() for i in as_completed(futures))
+            finally:
+                for i in futures:
+                    i.cancel()
+
+    def __existing_depth(self, prefixes: list[str]) -> int:
+        lo, hi = self._known_dirs.depth(self._session.user, prefixes), len(prefixes)
+        while lo < hi - 1:  # binary search of the deepest existing directory, the last one is simply created
+            mid = (lo + hi + 1) // 2
+            if self.__etag(dav_get_obj_path(self._session.user, prefixes[mid - 1])):
+                lo = mid
+            else:
+                hi = mid - 1
+        self._known_dirs.add(self._session.user, prefixes[:lo])
+        return lo
+
+    def __makedirs_missing(self, prefixes: list[str]) -> Optional[FsNode]:
+        result = None
+        for i in prefixes[self.__existing_depth(prefixes) :]:
+            result = self.__mkdir_known(i)
+        return result
+
+    def __makedirs_many_missing(self, leaves: list[str], workers: int) -> None:
+        missing: set[str] = set()
+        for leaf in leaves:
+            prefixes = build_path_prefixes(leaf)
+            missing.update(prefixes[self.__existing_depth(prefixes) :])
+        for level in build_tree_levels(missing):
+            self.__transfer_pool(self.__mkdir_exist_ok, [(i,) for i in level], workers)
+
+    def __mkdir_known(self, path: str) -> Optional[FsNode]:
+        try:
+            result = self.mkdir(path)
+        except NextcloudException as e:
+            if e.status_code != 405:  # it was created meanwhile
+                raise
+            result = None
+        self._known_dirs.add(self._session.user, [path])
+        return result
+
+    def __mkdir_exist_ok(self, path: str) -> int:
+        self.__mkdir_known(path)
+        return 0
+
+    def __upload_tree_file(self, path: str, local_path: str, size: int, chunk_size: int, verify: bool) -> int:
+        if size > chunk_size:
+            self.upload_stream(path, local_path, chunk_size=chunk_size, verify=verify)
+        else:
+            with builtins.open(local_path, "rb") as f:
+                self.upload(path, f.read(), verify=verify)
+        return size
+
+    def __upload_tree_remote(self, path: str, workers: int) -> dict[str, FsNode]:
+        result: dict[str, FsNode] = {}
+        try:
+            for dir_node, dirs, files in self.walk(path, workers=workers, properties="sync"):
+                result.update((sync_relative_path(i, path), i) for i in [dir_node, *dirs, *files])
+        except NextcloudException as e:
+            if e.status_code != 404:
+                raise
+        return result
+
+    @staticmethod
+    def __upload_tree_changed(
+        files: list[tuple[str, str, int]], remote: dict[str, FsNode], workers: int
+    ) -> list[tuple[str, str, int]]:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(upload_tree_unchanged, i[1], i[2], remote.get(i[0])) for i in files]
+            return [i for i, future in zip(files, futures) if not future.result()]
+
+    def __download_tree_file(self, fs_node: FsNode, local_path: str, chunk_size: int) -> int:
+        if fs_node.info.size > chunk_size:
+            self.download2stream(fs_node, local_path, chunk_size=chunk_size)
+            return os.path.getsize(local_path)
+        content = self.download(fs_node)
+        with builtins.open(local_path, "wb") as f:
+            f.write(content)
+        return len(content)
+
+    def __sync_remote(
+        self, remote_dir: str, state: dict[str, SyncEntry], workers: int, missing_ok: bool
+    ) -> dict[str, SyncEntry]:
+        remote: dict[str, SyncEntry] = {}
+        pruned = set()
+        try:
+            for _, dirs, files in self.walk(remote_dir, workers=workers, properties="sync"):
+                for i in files + dirs:
+                    path = sync_relative_path(i, remote_dir)
+                    remote[path] = sync_entry_from_node(i)
+                    saved = state.get(path)
+                    if i.is_dir and saved is not None and saved.is_dir and saved.etag == remote[path].etag:
+                        pruned.add(path)  # nothing was changed inside since the last sync
+                dirs[:] = [i for i in dirs if sync_relative_path(i, remote_dir) not in pruned]
+        except NextcloudException as e:
+            if e.status_code != 404 or not missing_ok:
+                raise
+            return {}
+        remote.update(sync_state_subtrees(state, pruned))
+        return remote
+
+    def __sync_apply(
+        self,
+        download: bool,
+        local_dir: str,
+        remote_dir: str,
+        plan: SyncPlan,
+        remote: dict[str, SyncEntry],
+        state: dict[str, SyncEntry],
+        workers: int,
+    ) -> None:
+        if not download and remote_dir and not remote:
+            self.makedirs(remote_dir, exist_ok=True)
+        for i in plan.delete:
+            if download:
+                sync_remove_local(os.path.join(local_dir, i))
+            else:
+                self.delete(sync_remote_path(remote_dir, i), not_fail=True)
+            sync_state_remove(state, i)
+        for i in plan.mkdir:
+            if download:
+                os.makedirs(os.path.join(local_dir, i), exist_ok=True)
+            else:
+                self.mkdir(sync_remote_path(remote_dir, i))
+        transfer = self.__sync_download_file if download else self.__sync_upload_file
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(transfer, local_dir, remote_dir, i, remote.get(i)): i for i in plan.transfer}
+            try:
+                for future in as_completed(futures):
+                    state[futures[future]] = future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def __sync_download_file(self, local_dir: str, remote_dir: str, path: str, entry: Optional[SyncEntry]) -> SyncEntry:
+        local_path = os.path.join(local_dir, path)
+        self.download2stream(sync_remote_path(remote_dir, path), local_path)
+        stat = os.stat(local_path)
+        return entry._replace(size=stat.st_size, mtime=stat.st_mtime)  # type: ignore
+
+    def __sync_upload_file(self, local_dir: str, remote_dir: str, path: str, _entry: Optional[SyncEntry]) -> SyncEntry:
+        local_path = os.path.join(local_dir, path)
+        stat = os.stat(local_path)  # the file changed during the upload is uploaded again on the next sync
+        fs_node = self.upload_stream(sync_remote_path(remote_dir, path), local_path)
+        return SyncEntry(fs_node.etag.strip('"'), stat.st_size, stat.st_mtime, fs_node.file_id, False)
+
+    def __download2stream_cached(self, path: Union[str, FsNode], fp, **kwargs) -> None:
+        if not isinstance(fp, (str, Path)) and not hasattr(fp, "write"):
+            raise TypeError("`fp` must be a path to file or an object with `write` method.")
+        download_cache: DownloadCache = self.download_cache  # type: ignore
+        chunk_size = kwargs.get("chunk_size", 4 * 1024 * 1024)
+        with builtins.open(fp, "wb") if isinstance(fp, (str, Path)) else nullcontext(fp) as f:
+            if isinstance(path, FsNode) and path.file_id and path.etag:
+                cached = download_cache.open(path.file_id, path.etag)
+                if cached is not None:
+                    with cached:
+                        shutil.copyfileobj(cached, f, chunk_size)
+                    return
+                cache_key, path = path.file_id, path.user_path
+            else:  # the file ID is not known without a request, the content is cached by path and checked by ETag
+                path = path.user_path if isinstance(path, FsNode) else path
+                cache_key = dav_get_obj_path(self._session.user, path)
+                kwargs["cache_key"] = cache_key
+            with download_cache.writer() as tmp_path:
+                with builtins.open(tmp_path, "w+b") as tmp:
+                    etag = self.__download2stream(path, tmp, "", **kwargs)
+                    tmp.seek(0)
+                    shutil.copyfileobj(tmp, f, chunk_size)
+                download_cache.put(cache_key, etag, tmp_path)
+
+    def __upload_chunk(self, upload: ChunkedUpload, start_bytes: int, chunk: UploadChunk) -> None:
+        chunk_path, headers = upload.chunk_request(start_bytes, chunk)
+        response = self._session.dav("PUT", chunk_path, data=chunk[0], headers=headers, data_hash=chunk[1])
+        check_error(response.status_code, upload.info(cur_size=start_bytes + len(chunk[0])))
+        upload.chunk_done(start_bytes, chunk[0])
+
+    def __upload_folder_chunks(self, dav_path: str) -> Optional[dict[str, int]]:
+        response = self._session.dav("PROPFIND", dav_path, data=build_upload_folder_req(), headers={"Depth": "1"})
+        return None if response.status_code == 404 else parse_upload_folder_response(response)
+
+    def __upload_prepare(self, upload: ChunkedUpload) -> None:
+        if upload.dav_path and upload.resume(self.__upload_folder_chunks(upload.dav_path)):
+            return
+        # no upload to resume or its folder expired on the server
+        response = self._session.dav("MKCOL", upload.new_folder())
         check_error(response.status_code)
+        upload.started()
+
+    def __upload_chunks(self, upload: ChunkedUpload, fp, workers: int) -> None:
+        pending: set[Future] = set()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for chunk in iter_upload_chunks(fp, upload.chunk_size, self._session.data_hasher, upload.checksum):
+                start_bytes = upload.next_chunk(chunk)
+                if start_bytes is None:
+                    pass  # the chunk was uploaded by a previous attempt
+                elif workers == 1:
+                    self.__upload_chunk(upload, start_bytes, chunk)
+                else:
+                    if len(pending) >= workers:  # no more than `workers` chunks are kept in memory
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for i in done:
+                            i.result()
+                    pending.add(executor.submit(self.__upload_chunk, upload, start_bytes, chunk))
+            for i in as_completed(pending):
+                i.result()
+
+    def __upload_remove_stale(self, upload: ChunkedUpload) -> None:
+        for i in upload.stale_chunks():
+            response = self._session.dav("DELETE", i)
+            check_error(response.status_code, upload.info(chunk=i))
+
+    def __upload_stream(self, path: str, fp, **kwargs) -> FsNode:
+        upload = ChunkedUpload(self._session.user, path, **kwargs)
+        self.__upload_prepare(upload)
+        completed = False
         try:
-            chunk_size = kwargs.get("chunk_size", 4 * 1024 * 1024)
-            start_bytes = end_bytes = 0
-            while True:
-                piece = fp.read(chunk_size)
-                if not piece:
-                    break
-                end_bytes = start_bytes + len(piece)
-                _filename = str(start_bytes).rjust(15, "0") + "-" + str(end_bytes).rjust(15, "0")
-                response = self._session.dav("PUT", _dav_path + "/" + _filename, data=piece)
-                check_error(
-                    response.status_code, f"upload_stream: user={self._session.user}, path={path}, cur_size={end_bytes}"
-                )
-                start_bytes = end_bytes
-            full_path = self._dav_get_obj_path(self._session.user, path)
-            headers = {"Destination": self._session.cfg.dav_endpoint + full_path}
+            self.__upload_chunks(upload, fp, max(int(kwargs.get("workers", 1)), 1))
+            self.__upload_remove_stale(upload)  # chunks not in the new file are left by the previous attempt
             response = self._session.dav(
-                "MOVE",
-                _dav_path + "/.file",
-                headers=headers,
+                "MOVE", upload.dav_path + "/.file", headers=upload.move_headers(self._session.cfg.dav_endpoint)
+            )
+            check_error(response.status_code, upload.info(total_size=upload.size))
+            self.__cache_invalidate(path)
+            completed = True
+            return FsNode(upload.full_path.strip("/"), **etag_fileid_from_response(response))
+        finally:
+            if upload.finish(completed):
+                self._session.dav("DELETE", upload.dav_path)
+
+
+class AsyncFilesAPI:
+    """Class that encapsulates async file system and file sharing functionality."""
+
+    sharing: _AsyncFilesSharingAPI
+    """API for managing Files Shares"""
+    cache: Optional[FilesCache]
+    """Metadata cache for :py:meth:`listdir`, :py:meth:`by_id`, :py:meth:`by_path` and :py:meth:`find`.
+    Disabled by default, assign :py:class:`~nc_py_api.files.FilesCache` instance to enable it."""
+    download_cache: Optional[DownloadCache]
+    """On-disk cache of the files content for :py:meth:`download` and :py:meth:`download2stream`.
+    For ``FsNode`` arguments the cached content is served without requests, for paths the ETag of the ``GET``
+    response is checked and the body is not read when the content is cached.
+    Disabled by default, assign :py:class:`~nc_py_api.files.DownloadCache` instance to enable it."""
+
+    def __init__(self, session: AsyncNcSessionBasic):
+        self._session = session
+        self.sharing = _AsyncFilesSharingAPI(session)
+        self.cache = None
+        self.download_cache = None
+        self._known_dirs = KnownDirs()
+
+    async def listdir(
+        self,
+        path: Union[str, FsNode] = "",
+        depth: int = 1,
+        exclude_self=True,
+        properties: Union[str, list[str], None] = None,
+    ) -> list[FsNode]:
+        """Returns a list of all entries in the specified directory.
+
+        :param path: path to the directory to get the list.
+        :param depth: how many directory levels should be included in output. Default = **1** (only specified directory)
+        :param exclude_self: boolean value indicating whether the `path` itself should be excluded from the list or not.
+            Default = **True**.
+        :param properties: name of the properties profile: ``minimal``, ``sync`` or ``full``, or a list of
+            :py:class:`~nc_py_api.files.FsNodeInfo` attributes to get. Default = **None** (``full``).
+            Not requested attributes are unavailable, and the responses are smaller.
+        """
+        if exclude_self and not depth:
+            raise ValueError("Wrong input parameters, query will return nothing.")
+        properties = resolve_properties(properties)
+        path = path.user_path if isinstance(path, FsNode) else path
+        if self.cache is None:
+            return await self._listdir(
+                self._session.user, path, properties=properties, depth=depth, exclude_self=exclude_self
             )
-            check_error(
-                response.status_code, f"upload_stream: user={self._session.user}, path={path}, total_size={end_bytes}"
+        full_path = dav_get_obj_path(self._session.user, path)
+        key = ("listdir", full_path.strip("/"), depth, tuple(properties))
+        fs_nodes = await self.__cache_get(key)
+        if fs_nodes is None:
+            fs_nodes = await self._listdir(
+                self._session.user, path, properties=properties, depth=depth, exclude_self=False
             )
-            return FsNode(full_path.strip("/"), **self.__get_etag_fileid_from_response(response))
+            self.cache.put(key, fs_nodes, full_path, listdir_self_etag(fs_nodes, path))
+        return listdir_exclude_self(fs_nodes, path, exclude_self)
+
+    def iter_listdir(
+        self,
+        path: Union[str, FsNode] = "",
+        depth: int = 1,
+        exclude_self=True,
+        properties: Union[str, list[str], None] = None,
+    ) -> AsyncIterator[FsNode]:
+        """Same as :py:meth:`listdir`, but returns an async generator, that yields entries as soon as they are received.
+
+        Only the entry being processed is kept in memory, which makes it suitable for the huge listings with
+        ``depth=-1``. The connection stays in use until the generator is exhausted or closed.
+        """
+        if exclude_self and not depth:
+            raise ValueError("Wrong input parameters, query will return nothing.")
+        path = path.user_path if isinstance(path, FsNode) else path
+        return self._iter_listdir(self._session.user, path, resolve_properties(properties), depth, exclude_self)
+
+    async def walk(
+        self, path: Union[str, FsNode] = "", **kwargs
+    ) -> AsyncIterator[tuple[FsNode, list[FsNode], list[FsNode]]]:
+        """Generates the directory tree top-down, like ``os.walk``, listing one directory level per request.
+
+        Yields a tuple of the directory ``FsNode``, a list of its subdirectories and a list of its files.
+        The list of subdirectories can be modified in place to prune the walk.
+
+        :param path: path of the directory to walk.
+        :param kwargs: **workers** an int value specifying how many directories are listed concurrently.
+            Default = **1**; **properties** the same as for :py:meth:`listdir`.
+
+        .. note:: Only the directories waiting to be listed and at most **workers** + 1 listings are kept in memory.
+        """
+        properties = resolve_properties(kwargs.get("properties"))
+        frontier = WalkFrontier(
+            path.user_path if isinstance(path, FsNode) else path, max(int(kwargs.get("workers", 1)), 1)
+        )
+        try:
+            while frontier:
+                dir_node, dirs, files = await frontier.next(
+                    lambda i: asyncio.create_task(self.__walk_level(i, properties))
+                )
+                if not dir_node.is_dir:
+                    continue
+                yield dir_node, dirs, files
+                frontier.extend(dirs)
         finally:
-            self._session.dav("DELETE", _dav_path)
+            frontier.cancel()
 
-    @staticmethod
-    def __get_etag_fileid_from_response(response: Response) -> dict:
-        return {"etag": response.headers.get("OC-Etag", ""), "file_id": response.headers["OC-FileId"]}
+    async def by_id(self, file_id: Union[int, str, FsNode]) -> Optional[FsNode]:
+        """Returns :py:class:`~nc_py_api.files.FsNode` by file_id if any.
+
+        :param file_id: can be full file ID with Nextcloud instance ID or only clear file ID.
+        """
+        file_id = file_id.file_id if isinstance(file_id, FsNode) else file_id
+        root = dav_get_obj_path(self._session.user).lstrip("/")
+        path = self.cache.path_by_id(str(file_id), root) if self.cache is not None else None
+        fs_node = await self.__cache_get(("by_path", path)) if path is not None else None
+        if fs_node is None:
+            result = await self._find(FIND_BY_ID_QUERY, "", params={"fileid": file_id})
+            fs_node = result[0] if result else None
+            self.__cache_put(fs_node)
+        return fs_node
+
+    async def by_ids(self, file_ids: Iterable[Union[int, str, FsNode]]) -> dict[Union[int, str], Optional[FsNode]]:
+        """Returns :py:class:`~nc_py_api.files.FsNode` for each of the file IDs, ``None`` for the missing ones.
+
+        All objects are found with one ``SEARCH`` request, large lists are split into the requests of 500 IDs.
+
+        :param file_ids: full file IDs with Nextcloud instance ID or only clear file IDs, they are the result keys.
+        """
+        ids: list[Union[int, str]] = [i.file_id if isinstance(i, FsNode) else i for i in file_ids]
+        clear_ids = sorted({clear_file_id(i) for i in ids})
+        found: dict[int, FsNode] = {}
+        for i in range(0, len(clear_ids), FIND_IDS_CHUNK_SIZE):
+            async for fs_node in self._iter_dav_nodes(
+                "SEARCH",
+                "",
+                build_find_ids_request(clear_ids[i : i + FIND_IDS_CHUNK_SIZE], self._session.user),
+                {"Content-Type": "text/xml"},
+                f"by_ids: {self._session.user}, {len(clear_ids)} IDs",
+            ):
+                found[fs_node.info.fileid] = fs_node
+                self.__cache_put(fs_node)
+        return {i: found.get(clear_file_id(i)) for i in ids}
+
+    async def by_paths(self, paths: Iterable[Union[str, FsNode]]) -> dict[str, Optional[FsNode]]:
+        """Returns :py:class:`~nc_py_api.files.FsNode` for each of the paths, ``None`` for the missing ones.
+
+        Paths are grouped by their parent directories, and each directory is listed once with ``Depth: 1``.
+
+        :param paths: paths of the objects, they are the result keys.
+        """
+        user_paths = [i.user_path if isinstance(i, FsNode) else i for i in paths]
+        found: dict[str, FsNode] = {}
+        for parent in build_paths_parents(user_paths):
+            try:
+                async for fs_node in self._iter_listdir(self._session.user, parent, PROPFIND_PROPERTIES, 1, False):
+                    found[fs_node.user_path.strip("/")] = fs_node
+            except NextcloudException as e:
+                if e.status_code != 404:
+                    raise
+        result = {i: found.get(i.strip("/")) for i in user_paths}
+        for i in result.values():
+            self.__cache_put(i)
+        return result
+
+    async def by_path(self, path: Union[str, FsNode]) -> Optional[FsNode]:
+        """Returns :py:class:`~nc_py_api.files.FsNode` by exact path if any."""
+        path = path.user_path if isinstance(path, FsNode) else path
+        fs_node = await self.__cache_get(("by_path", dav_get_obj_path(self._session.user, path).strip("/")))
+        if fs_node is None:
+            result = await self._listdir(self._session.user, path, PROPFIND_PROPERTIES, 0, False)
+            fs_node = result[0] if result else None
+            self.__cache_put(fs_node)
+        return fs_node
+
+    async def find(  # pylint: disable=too-many-arguments
+        self,
+        req: Union[list, SearchQuery],
+        path: Union[str, FsNode] = "",
+        limit: Optional[int] = None,
+        offset: int = 0,
+        order_by: Union[str, list[str], None] = None,
+        *,
+        params: Optional[dict[str, Any]] = None,
+        properties: Union[str, list[str], None] = None,
+    ) -> list[FsNode]:
+        """Searches a directory for a file or subdirectory with a name.
+
+        :param req: :py:class:`~nc_py_api.files.SearchQuery` or list of conditions to search for.
+            Detailed description here...
+        :param path: path where to search from. Default = **""**.
+        :param limit: maximum number of the returned objects, the server stops the search after finding them.
+        :param offset: number of the found objects to skip, to get the next page of the results. Default = **0**.
+        :param order_by: key or a list of keys to sort the results on the server, the same as for the conditions.
+            Key starting with ``-``, like ``-last_modified``, sorts in descending order.
+        :param params: values of the :py:meth:`~nc_py_api.files.SearchQuery.param` placeholders in ``req``.
+        :param properties: the same as for :py:meth:`listdir`.
+        """
+        # `req` possible keys: "name", "mime", "last_modified", "size", "favorite", "fileid"
+        path = path.user_path if isinstance(path, FsNode) else path
+        if self.cache is None:
+            return await self._find(
+                req, path, limit=limit, offset=offset, order_by=order_by, params=params, properties=properties
+            )
+        full_path = dav_get_obj_path(self._session.user, path)
+        key = (
+            "find",
+            repr(req),
+            full_path.strip("/"),
+            limit,
+            offset,
+            repr(order_by),
+            repr(params),
+            repr(properties),
+        )
+        fs_nodes = await self.__cache_get(key)
+        if fs_nodes is None:
+            etag = await self.__etag(full_path)
+            fs_nodes = await self._find(
+                req, path, limit=limit, offset=offset, order_by=order_by, params=params, properties=properties
+            )
+            self.cache.put(key, fs_nodes, full_path, etag)
+        return list(fs_nodes)
+
+    async def iter_find(
+        self,
+        req: Union[list, SearchQuery],
+        path: Union[str, FsNode] = "",
+        page_size: int = 100,
+        order_by: Union[str, list[str], None] = None,
+        params: Optional[dict[str, Any]] = None,
+        properties: Union[str, list[str], None] = None,
+    ) -> AsyncIterator[FsNode]:
+        """Same as :py:meth:`find`, but returns a generator, that requests the results page by page when needed.
+
+        :param page_size: number of the objects requested at once. Default = **100**.
+        :param order_by: the same as for :py:meth:`find`, the results are sorted by ``fileid`` if not specified,
+            as pages require a stable order.
+        """
+        if page_size < 1:
+            raise ValueError("`page_size` should be greater than zero.")
+        path = path.user_path if isinstance(path, FsNode) else path
+        offset = 0
+        while True:
+            fs_nodes = await self._find(
+                req,
+                path,
+                limit=page_size,
+                offset=offset,
+                order_by=order_by or "fileid",
+                params=params,
+                properties=properties,
+            )
+            for fs_node in fs_nodes:
+                yield fs_node
+            if len(fs_nodes) < page_size:
+                return
+            offset += page_size
+
+    async def listdir_table(self, path: Union[str, FsNode] = "", depth: int = 1, exclude_self=True) -> FsNodeTable:
+        """Same as :py:meth:`listdir`, but returns the result in columnar :py:class:`~nc_py_api.files.FsNodeTable`."""
+        if exclude_self and not depth:
+            raise ValueError("Wrong input parameters, query will return nothing.")
+        path = path.user_path if isinstance(path, FsNode) else path
+        headers = {"Depth": "infinity" if depth == -1 else str(depth)}
+        table = FsNodeTable()
+        async for _ in self._iter_dav_nodes(
+            "PROPFIND",
+            dav_get_obj_path(self._session.user, path),
+            build_listdir_req(PROPFIND_PROPERTIES),
+            headers,
+            f"list: {self._session.user}, {path}",
+            table=table,
+        ):
+            pass  # records are stored in the table
+        return table_exclude_self(table, path) if exclude_self else table
+
+    async def find_table(self, req: Union[list, SearchQuery], path: Union[str, FsNode] = "") -> FsNodeTable:
+        """Same as :py:meth:`find`, but returns the result in columnar :py:class:`~nc_py_api.files.FsNodeTable`."""
+        path = path.user_path if isinstance(path, FsNode) else path
+        request_info = f"find: {self._session.user}, {req}, {path}"
+        headers = {"Content-Type": "text/xml"}
+        table = FsNodeTable()
+        async for _ in self._iter_dav_nodes(
+            "SEARCH", "", build_find_request(req, path, self._session.user), headers, request_info, table=table
+        ):
+            pass  # records are stored in the table
+        return table
+
+    async def download(self, path: Union[str, FsNode], verify: bool = False) -> bytes:
+        """Downloads and returns the content of a file.
+
+        :param path: path to download file.
+        :param verify: if ``True``, the content is checked against the checksum the server has for the file.
+            If the server has no checksum for the file, ``NextcloudException`` is raised.
+        """
+        if self.download_cache is not None:
+            buffer = BytesIO()
+            await self.__download2stream_cached(path, buffer, verify=verify)
+            return buffer.getvalue()
+        path = path.user_path if isinstance(path, FsNode) else path
+        response = await self._session.dav("GET", dav_get_obj_path(self._session.user, path))
+        check_error(response.status_code, f"download: user={self._session.user}, path={path}")
+        if verify:
+            info = f"download: user={self._session.user}, path={path}"
+            check_checksum(download_checksum(response.headers, info), response.headers, info, response.content)
+        return response.content
+
+    async def download2stream(self, path: Union[str, FsNode], fp, **kwargs) -> None:
+        """Downloads file to the given `fp` object.
+
+        :param path: path to download file.
+        :param fp: filename (string), pathlib.Path object or a file object.
+            The object must implement the ``file.write`` method and be able to write binary data.
+        :param kwargs: **chunk_size** an int value specifying chunk size to write. Default = **4Mb**
+
+            **workers** an int value specifying how many parts of the file are downloaded concurrently, each of
+            **chunk_size** bytes. Requires a seekable `fp`. Default = **1**
+
+            **resume** if ``True``, the data already present in `fp` is kept and only the rest of the file is
+            downloaded. Requires `path` to be an ``FsNode``, its ``etag`` is used to verify that the file was not
+            changed since, otherwise the file is downloaded again from the start. Default = **False**
+
+            **verify** if ``True``, the data is checked against the checksum the server has for the file, while
+            it is downloaded. The file is downloaded in one stream, **resume** is not supported. If the server has
+            no checksum for the file, ``NextcloudException`` is raised before any data is written. Default = **False**
+
+        .. note:: When the server ignores ``Range`` requests, the file is downloaded in one stream.
+        """
+        check_download2stream_args(path, **kwargs)
+        if self.download_cache is not None and not kwargs.get("resume", False):
+            await self.__download2stream_cached(path, fp, **kwargs)
+            return
+        etag = path.etag if isinstance(path, FsNode) else ""
+        path = path.user_path if isinstance(path, FsNode) else path
+        if isinstance(fp, (str, Path)):
+            resume = kwargs.get("resume", False) and os.path.isfile(fp)
+            with builtins.open(fp, "r+b" if resume else "wb") as f:
+                f.seek(0, os.SEEK_END)
+                await self.__download2stream(path, f, etag, **kwargs)
+        elif hasattr(fp, "write"):
+            await self.__download2stream(path, fp, etag, **kwargs)
+        else:
+            raise TypeError("`fp` must be a path to file or an object with `write` method.")
+
+    async def download_directory_as_zip(
+        self, path: Union[str, FsNode], local_path: Union[str, Path, None] = None, **kwargs
+    ) -> Path:
+        """Downloads a remote directory as zip archive.
+
+        :param path: path to directory to download.
+        :param local_path: relative or absolute file path to save zip file.
+        :returns: Path to the saved zip archive.
+
+        .. note:: This works only for directories, you should not use this to download a file.
+        """
+        path = path.user_path if isinstance(path, FsNode) else path
+        result_path = local_path if local_path else os.path.basename(path)
+        await self.download_directory_as_zip2stream(path, result_path, **kwargs)
+        return Path(result_path)
+
+    async def download_directory_as_zip2stream(self, path: Union[str, FsNode], fp, **kwargs) -> None:
+        """Downloads a remote directory as zip archive to the given `fp` object, as the archive is received.
+
+        :param path: path to directory to download.
+        :param fp: filename (string), pathlib.Path object or a file object.
+            The object must implement the ``file.write`` method and be able to write binary data.
+            File is opened only after the server starts to send the archive.
+        :param kwargs: **chunk_size** an int value specifying chunk size to write. Default = **4Mb**
+        """
+        if not isinstance(fp, (str, Path)) and not hasattr(fp, "write"):
+            raise TypeError("`fp` must be a path to file or an object with `write` method.")
+        path = path.user_path if isinstance(path, FsNode) else path
+        async with self.__zip_stream(path) as response:
+            with builtins.open(fp, "wb") if isinstance(fp, (str, Path)) else nullcontext(fp) as f:
+                async for data_chunk in response.aiter_raw(chunk_size=kwargs.get("chunk_size", 4 * 1024 * 1024)):
+                    f.write(data_chunk)
+
+    async def iter_directory_as_zip(self, path: Union[str, FsNode], **kwargs) -> AsyncIterator[bytes]:
+        """Downloads a remote directory as zip archive, yielding the archive by chunks as they are received.
+
+        :param path: path to directory to download.
+        :param kwargs: **chunk_size** an int value specifying the size of chunks. Default = **4Mb**
+
+        .. note:: The connection is kept until the iteration is finished or the generator is closed.
+        """
+        path = path.user_path if isinstance(path, FsNode) else path
+        async with self.__zip_stream(path) as response:
+            async for data_chunk in response.aiter_raw(chunk_size=kwargs.get("chunk_size", 4 * 1024 * 1024)):
+                yield data_chunk
+
+    async def iter_directory_as_zip_entries(
+        self, path: Union[str, FsNode], **kwargs
+    ) -> AsyncIterator[tuple[str, bytes]]:
+        """Downloads a remote directory as zip archive, yielding the content of the files in it as it is received.
+
+        Yields ``(name, data)`` pieces, the pieces of each file go one after another, files without content and
+        directories are yielded once with empty data. Nothing is stored on the disk or kept in memory.
+
+        :param path: path to directory to download.
+        :param kwargs: **chunk_size** an int value specifying chunk size to read. Default = **4Mb**
+        """
+        parser = ZipStreamParser()
+        async for data_chunk in self.iter_directory_as_zip(path, **kwargs):
+            for entry_chunk in parser.feed(data_chunk):
+                yield entry_chunk
+        parser.close()
+
+    async def upload(
+        self,
+        path: Union[str, FsNode],
+        content: Union[bytes, str, bytearray, memoryview, mmap],
+        verify: Union[bool, str] = False,
+    ) -> FsNode:
+        """Creates a file with the specified content at the specified path.
+
+        :param path: file's upload path.
+        :param content: content to create the file. If it is a string, it will be encoded into bytes using UTF-8.
+            Buffers like ``bytearray``, ``memoryview`` or ``mmap`` are sent without copying.
+        :param verify: if set, the checksum of the content is sent in ``OC-Checksum`` header, so the server
+            rejects corrupted data and keeps the checksum for the later downloads. ``True`` is for **SHA1**,
+            **MD5** and **ADLER32** types can be specified by name.
+        """
+        path = path.user_path if isinstance(path, FsNode) else path
+        if not isinstance(content, (bytes, str)):
+            content = memoryview(content).cast("B")
+        full_path = dav_get_obj_path(self._session.user, path)
+        headers = {}
+        checksum = new_checksum(verify)
+        if checksum is not None:
+            checksum.update(content.encode("UTF-8") if isinstance(content, str) else content)
+            headers["OC-Checksum"] = str(checksum)
+        response = await self._session.dav("PUT", full_path, data=content, headers=headers)
+        check_error(response.status_code, f"upload: user={self._session.user}, path={path}, size={len(content)}")
+        self.__cache_invalidate(path)
+        return FsNode(full_path.strip("/"), **etag_fileid_from_response(response))
+
+    async def upload_stream(self, path: Union[str, FsNode], fp, **kwargs) -> FsNode:
+        """Creates a file with content provided by `fp` object at the specified path.
+
+        :param path: file's upload path.
+        :param fp: filename (string), pathlib.Path object, buffer, file object or iterable of data pieces.
+            Files are memory-mapped, and chunks of them and of the buffers, like ``mmap`` or ``memoryview``,
+            are sent without copying. File objects must implement the ``file.read`` method providing data
+            with str or bytes type. Pieces of any size, e.g. from a sync or async generator, are collected
+            into chunks.
+        :param kwargs: **chunk_size** an int value specifying chunk size to read. Default = **4Mb**
+
+            **workers** an int value specifying how many chunks are uploaded concurrently. Default = **1**
+
+            **journal** path to a local file to record the upload progress in. If the upload fails, the chunks
+            already on the server are kept, and calling this method again with the same arguments resumes it.
+            Only the chunks that were not changed since are reused, the rest of the upload folder is removed.
+
+            **verify** same as for the :py:meth:`upload`, checksums of the chunks and of the whole file are
+            computed while reading them. Default = **False**
+
+        .. note:: With **workers** > 1, up to ``workers * chunk_size`` bytes read from file objects and iterables
+            are held in memory.
+        """
+        path = path.user_path if isinstance(path, FsNode) else path
+        if isinstance(fp, (str, Path)):
+            fp = map_upload_file(fp)
+        elif isinstance(fp, UPLOAD_BUFFER_TYPES):
+            fp = memoryview(fp).cast("B")
+        elif not hasattr(fp, "read") and not isinstance(fp, (Iterable, AsyncIterable)):
+            raise TypeError("`fp` must be a path to file, buffer, iterable or an object with `read` method.")
+        return await self.__upload_stream(path, fp, **kwargs)
+
+    async def mkdir(self, path: Union[str, FsNode]) -> FsNode:
+        """Creates a new directory.
+
+        :param path: path of the directory to be created.
+        """
+        path = path.user_path if isinstance(path, FsNode) else path
+        full_path = dav_get_obj_path(self._session.user, path)
+        response = await self._session.dav("MKCOL", full_path)
+        check_error(response.status_code, f"mkdir: user={self._session.user}, path={path}")
+        self.__cache_invalidate(path)
+        full_path += "/" if not full_path.endswith("/") else ""
+        return FsNode(full_path.lstrip("/"), **etag_fileid_from_response(response))
+
+    async def makedirs(self, path: Union[str, FsNode], exist_ok=False) -> Optional[FsNode]:
+        """Creates a new directory and subdirectories.
+
+        :param path: path of the directories to be created.
+        :param exist_ok: ignore error if any of pathname components already exists.
+        :returns: `FsNode` if directory was created or ``None`` if it was already created.
+
+        .. note:: With **exist_ok** the deepest existing directory is found first with ``Depth: 0`` requests,
+            and only the missing directories are created. The existing directories are remembered,
+            so the next calls for the paths inside them do not check them again, the last directory
+            of the path is always created or checked.
+        """
+        path = path.user_path if isinstance(path, FsNode) else path
+        prefixes = build_path_prefixes(path)
+        if not exist_ok:
+            result = None
+            for i in prefixes:
+                result = await self.mkdir(i)
+            return result
+        try:
+            return await self.__makedirs_missing(prefixes)
+        except NextcloudException as e:
+            if e.status_code != 409:
+                raise
+            self._known_dirs.clear(self._session.user)  # some remembered directories were deleted meanwhile
+            return await self.__makedirs_missing(prefixes)
+
+    async def makedirs_many(self, paths: Iterable[Union[str, FsNode]], **kwargs) -> None:
+        """Creates the directories with all their parent directories, the existing ones are skipped.
+
+        :param paths: paths of the directories to be created.
+        :param kwargs: **workers** an int value specifying how many directories of the same level
+            are created concurrently. Default = **4**
+        """
+        workers = max(int(kwargs.get("workers", 4)), 1)
+        prefixes = [build_path_prefixes(i.user_path if isinstance(i, FsNode) else i) for i in paths]
+        leaves = sorted({i[-1] for i in prefixes if i}, reverse=True)  # subdirectories are probed before parents
+        try:
+            await self.__makedirs_many_missing(leaves, workers)
+        except NextcloudException as e:
+            if e.status_code != 409:
+                raise
+            self._known_dirs.clear(self._session.user)
+            await self.__makedirs_many_missing(leaves, workers)
+
+    async def delete(self, path: Union[str, FsNode], not_fail=False) -> None:
+        """Deletes a file/directory (moves to trash if trash is enabled).
+
+        :param path: path to delete.
+        :param not_fail: if set to ``True`` and the object is not found, it does not raise an exception.
+        """
+        path = path.user_path if isinstance(path, FsNode) else path
+        response = await self._session.dav("DELETE", dav_get_obj_path(self._session.user, path))
+        self.__cache_invalidate(path)
+        if response.status_code == 404 and not_fail:
+            return
+        check_error(response.status_code, f"delete: user={self._session.user}, path={path}")
+
+    async def move(
+        self, path_src: Union[str, FsNode], path_dest: Union[str, FsNode], overwrite=False, return_node=True
+    ) -> Optional[FsNode]:
+        """Moves an existing file or a directory.
+
+        :param path_src: path of an existing file/directory.
+        :param path_dest: name of the new one.
+        :param overwrite: if ``True`` and the destination object already exists, it gets overwritten.
+            Default = **False**.
+        :param return_node: if ``False``, the destination object is not requested from the server, and ``None``
+            is returned. Default = **True**.
+        """
+        path_src = path_src.user_path if isinstance(path_src, FsNode) else path_src
+        path_dest = path_dest.user_path if isinstance(path_dest, FsNode) else path_dest
+        full_dest_path = dav_get_obj_path(self._session.user, path_dest)
+        headers = build_move_copy_headers(self._session.cfg.dav_endpoint, full_dest_path, overwrite)
+        response = await self._session.dav(
+            "MOVE",
+            dav_get_obj_path(self._session.user, path_src),
+            headers=headers,
+        )
+        check_error(
+            response.status_code,
+            f"move: user={self._session.user}, src={path_src}, dest={headers['Destination']}, {overwrite}",
+        )
+        self.__cache_invalidate(path_src, path_dest)
+        return await self.__destination_node(path_dest) if return_node else None
+
+    async def copy(
+        self, path_src: Union[str, FsNode], path_dest: Union[str, FsNode], overwrite=False, return_node=True
+    ) -> Optional[FsNode]:
+        """Copies an existing file/directory.
+
+        :param path_src: path of an existing file/directory.
+        :param path_dest: name of the new one.
+        :param overwrite: if ``True`` and the destination object already exists, it gets overwritten.
+            Default = **False**.
+        :param return_node: if ``False``, the destination object is not requested from the server, and ``None``
+            is returned. Default = **True**.
+        """
+        path_src = path_src.user_path if isinstance(path_src, FsNode) else path_src
+        path_dest = path_dest.user_path if isinstance(path_dest, FsNode) else path_dest
+        full_dest_path = dav_get_obj_path(self._session.user, path_dest)
+        headers = build_move_copy_headers(self._session.cfg.dav_endpoint, full_dest_path, overwrite)
+        response = await self._session.dav(
+            "COPY",
+            dav_get_obj_path(self._session.user, path_src),
+            headers=headers,
+        )
+        check_error(
+            response.status_code,
+            f"copy: user={self._session.user}, src={path_src}, dest={headers['Destination']}, {overwrite}",
+        )
+        self.__cache_invalidate(path_dest)
+        return await self.__destination_node(path_dest) if return_node else None
+
+    async def listfav(self) -> list[FsNode]:
+        """Returns a list of the current user's favorite files."""
+        return await self.report({"favorite": 1})
+
+    async def report(self, filter_rules: dict[str, Any], path: Union[str, FsNode] = "") -> list[FsNode]:
+        """Returns a list of the objects matching all the filter rules, with one ``REPORT`` request.
+
+        :param filter_rules: rules of the ``oc:filter-files`` request, like ``{"favorite": 1}`` or
+            ``{"systemtag": [1, 2]}`` for the objects with all of the system tags with these IDs.
+        :param path: path of the directory to search in. Default = **""**.
+        """
+        path = path.user_path if isinstance(path, FsNode) else path
+        return [
+            i
+            async for i in self._iter_dav_nodes(
+                "REPORT",
+                dav_get_obj_path(self._session.user, path),
+                build_report_req(filter_rules, PROPFIND_PROPERTIES),
+                {},
+                f"report: {self._session.user}, {filter_rules}, {path}",
+            )
+        ]
+
+    async def setfav(self, path: Union[str, FsNode], value: Union[int, bool]) -> None:
+        """Sets or unsets favourite flag for specific file.
+
+        :param path: path to the object to set the state.
+        :param value: value to set for the ``favourite`` state.
+        """
+        path = path.user_path if isinstance(path, FsNode) else path
+        webdav_response = await self._session.dav(
+            "PROPPATCH", dav_get_obj_path(self._session.user, path), data=build_setfav_req(bool(value))
+        )
+        check_error(webdav_response.status_code, f"setfav: path={path}, value={value}")
+        self.__cache_invalidate(path)
+
+    async def upload_tree(self, path: Union[str, FsNode], local_dir: Union[str, Path], **kwargs) -> TransferStats:
+        """Uploads the local directory with all its content, creating each remote directory once.
+
+        :param path: path to the directory on the server, it is created if missing.
+        :param local_dir: path to the local directory.
+        :param kwargs: **workers** an int value specifying how many files, or directories of the same level,
+            are created concurrently. Default = **4**
+
+            **chunk_size** files up to this size are uploaded with one request, larger ones are uploaded
+            with :py:meth:`upload_stream` in chunks of this size. Default = **4Mb**
+
+            **skip_unchanged** if ``True``, the remote tree is listed first, and the files, that are already on
+            the server with the same size and checksum, are skipped. Local files are hashed concurrently, and
+            the uploaded files are sent with the checksum, so the next upload can skip them. Default = **False**
+
+        .. note:: With **skip_unchanged** the files, that were uploaded without a checksum, are uploaded once more.
+        """
+        start_time = perf_counter()
+        path = (path.user_path if isinstance(path, FsNode) else path).strip("/")
+        local_dir = os.fspath(local_dir)
+        workers = max(int(kwargs.get("workers", 4)), 1)
+        chunk_size = kwargs.get("chunk_size", 4 * 1024 * 1024)
+        skip_unchanged = kwargs.get("skip_unchanged", False)
+        local = sync_scan_local(local_dir)
+        remote = await self.__upload_tree_remote(path, workers) if skip_unchanged else {}
+        if path and "" not in remote:
+            await self.makedirs(path, exist_ok=True)
+        dirs = [i for i, v in local.items() if v.is_dir and not (i in remote and remote[i].is_dir)]
+        for level in build_tree_levels(dirs):
+            await self.__transfer_pool(self.__mkdir_exist_ok, [(sync_remote_path(path, i),) for i in level], workers)
+        files = [(i, os.path.join(local_dir, i), v.size) for i, v in local.items() if not v.is_dir]
+        changed = await self.__upload_tree_changed(files, remote, workers) if skip_unchanged else files
+        size = await self.__transfer_pool(
+            self.__upload_tree_file,
+            [(sync_remote_path(path, i[0]), i[1], i[2], chunk_size, skip_unchanged) for i in changed],
+            workers,
+        )
+        return TransferStats(
+            len(changed), len(dirs), size, perf_counter() - start_time, skipped=len(files) - len(changed)
+        )
+
+    async def download_tree(self, path: Union[str, FsNode], local_dir: Union[str, Path], **kwargs) -> TransferStats:
+        """Downloads the remote directory with all its content to the local directory.
+
+        :param path: path to the directory on the server.
+        :param local_dir: path to the local directory, it is created if missing.
+        :param kwargs: **workers** an int value specifying how many files are downloaded, and directories listed,
+            concurrently. Default = **4**
+
+            **chunk_size** files up to this size are downloaded with one request, larger ones are streamed
+            with :py:meth:`download2stream` in chunks of this size. Default = **4Mb**
+        """
+        start_time = perf_counter()
+        path = (path.user_path if isinstance(path, FsNode) else path).strip("/")
+        local_dir = os.fspath(local_dir)
+        workers = max(int(kwargs.get("workers", 4)), 1)
+        chunk_size = kwargs.get("chunk_size", 4 * 1024 * 1024)
+        dirs: list[str] = []
+        files: list[tuple[FsNode, str, int]] = []
+        async for _, sub_dirs, sub_files in self.walk(path, workers=workers, properties="sync"):
+            dirs.extend(sync_relative_path(i, path) for i in sub_dirs)
+            files.extend((i, os.path.join(local_dir, sync_relative_path(i, path)), chunk_size) for i in sub_files)
+        os.makedirs(local_dir, exist_ok=True)
+        for i in dirs:
+            os.makedirs(os.path.join(local_dir, i), exist_ok=True)
+        size = await self.__transfer_pool(self.__download_tree_file, files, workers)
+        return TransferStats(len(files), len(dirs), size, perf_counter() - start_time)
+
+    async def sync(
+        self, local_dir: Union[str, Path], remote_dir: Union[str, FsNode] = "", direction: str = "download", **kwargs
+    ) -> SyncPlan:
+        """Makes the local directory a copy of the remote one or vice versa, transferring only the changed files.
+
+        The state of the objects after the sync is saved to the local database, so the next sync does not list
+        the remote directories whose ETag did not change, and does not transfer the files not changed on both sides.
+
+        :param local_dir: path to the local directory.
+        :param remote_dir: path to the directory on the server.
+        :param direction: ``download`` to update the local directory from the server, ``upload`` for the opposite.
+            Default = **download**
+        :param kwargs: **state** path to the local SQLite database with the state of the last sync.
+            Default = **local_dir/.nc_py_api_sync.db**
+
+            **workers** an int value specifying how many files are transferred, and directories are listed,
+            concurrently. Default = **4**
+
+            **dry_run** if ``True``, the changes are only returned and not made. Default = **False**
+        :returns: :py:class:`~nc_py_api.files.SyncPlan` with the changes made to the destination.
+
+        .. note:: Only the objects created by the previous syncs are deleted from the destination,
+            objects created there by other means are kept.
+        """
+        if direction not in ("download", "upload"):
+            raise ValueError("`direction` must be `download` or `upload`.")
+        download = direction == "download"
+        local_dir = os.fspath(local_dir)
+        remote_dir = (remote_dir.user_path if isinstance(remote_dir, FsNode) else remote_dir).strip("/")
+        state_path = os.fspath(kwargs.get("state", os.path.join(local_dir, SYNC_STATE_NAME)))
+        workers = max(int(kwargs.get("workers", 4)), 1)
+        origin = self._session.cfg.dav_endpoint + dav_get_obj_path(self._session.user, remote_dir)
+        if download:
+            os.makedirs(local_dir, exist_ok=True)
+        state = sync_state_load(state_path, origin)
+        remote = await self.__sync_remote(remote_dir, state, workers, not download)
+        local = sync_scan_local(local_dir, state_path)
+        plan = build_sync_plan(download, remote, local, state)
+        if kwargs.get("dry_run", False):
+            return plan
+        try:
+            await self.__sync_apply(download, local_dir, remote_dir, plan, remote, state, workers)
+            sync_state_finalize(state, download, remote, local, plan)
+        finally:
+            sync_state_save(state_path, origin, state)
+        return plan
+
+    async def _find(self, req: Union[list, SearchQuery], path: str, **kwargs) -> list[FsNode]:
+        request_info = f"find: {self._session.user}, {req}, {path}"
+        headers = {"Content-Type": "text/xml"}
+        properties = resolve_properties(kwargs.pop("properties", None))
+        data = build_find_request(req, path, self._session.user, properties=properties, **kwargs)
+        return [
+            i
+            async for i in self._iter_dav_nodes(
+                "SEARCH", "", data, headers, request_info, unavailable=unavailable_info(properties)
+            )
+        ]
+
+    async def __destination_node(self, path: str) -> FsNode:
+        fs_node = (await self._listdir(self._session.user, path, PROPFIND_PROPERTIES, 0, False))[0]
+        self.__cache_put(fs_node)
+        return fs_node
+
+    async def __cache_get(self, key: tuple):
+        if self.cache is None:
+            return None
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        if self.cache.expired(entry):
+            if await self.__etag(entry.path) != entry.etag:
+                self.cache.remove(key)
+                return None
+            self.cache.refresh(entry)
+        return entry.value
+
+    def __cache_put(self, fs_node: Optional[FsNode]) -> None:
+        if self.cache is not None and fs_node is not None:
+            self.cache.put(("by_path", fs_node.full_path.strip("/")), fs_node, fs_node.full_path, fs_node.etag)
+
+    def __cache_invalidate(self, *paths: str) -> None:
+        self._known_dirs.forget(self._session.user, paths)
+        if self.cache is not None:
+            self.cache.invalidate(*(dav_get_obj_path(self._session.user, i) for i in paths))
+
+    async def __etag(self, full_path: str) -> str:
+        full_path = "/" + full_path.strip("/")
+        try:
+            result = [
+                i
+                async for i in self._iter_dav_nodes(
+                    "PROPFIND", full_path, build_listdir_req(ETAG_PROPERTIES), {"Depth": "0"}, f"etag: {full_path}"
+                )
+            ]
+        except NextcloudException as e:
+            if e.status_code != 404:
+                raise
+            return ""
+        return result[0].etag if result else ""
+
+    async def _iter_dav_nodes(
+        self, method: str, path: str, data: str, headers: dict, info: str, **kwargs
+    ) -> AsyncIterator[FsNode]:
+        async with self._session.dav_stream(method, path, data=data, headers=headers) as response:
+            self._session.response_headers = response.headers
+            check_webdav_multistatus(response, info)
+            parser = WebDavParser(self._session.cfg.dav_url_suffix, info, **kwargs)
+            async for data_chunk in response.aiter_bytes():
+                for fs_node in parser.feed(data_chunk):
+                    yield fs_node
+            for fs_node in parser.close():
+                yield fs_node
+
+    async def _listdir(
+        self, user: str, path: str, properties: list[str], depth: int, exclude_self: bool
+    ) -> list[FsNode]:
+        return [i async for i in self._iter_listdir(user, path, properties, depth, exclude_self)]
+
+    async def _iter_listdir(
+        self, user: str, path: str, properties: list[str], depth: int, exclude_self: bool
+    ) -> AsyncIterator[FsNode]:
+        headers = {"Depth": "infinity" if depth == -1 else str(depth)}
+        request_info = f"list: {user}, {path}, {properties}"
+        async for fs_node in self._iter_dav_nodes(
+            "PROPFIND",
+            dav_get_obj_path(user, path),
+            build_listdir_req(properties),
+            headers,
+            request_info,
+            unavailable=unavailable_info(properties),
+        ):
+            if exclude_self and is_listdir_self(fs_node, path):
+                exclude_self = False
+                continue
+            yield fs_node
+
+    async def __walk_level(self, path: str, properties: list[str]) -> tuple[FsNode, list[FsNode], list[FsNode]]:
+        return build_walk_level(await self._listdir(self._session.user, path, properties, 1, False))
+
+    @asynccontextmanager
+    async def __zip_stream(self, path: str) -> AsyncIterator[Response]:
+        async with self._session.get_stream(
+            "/index.php/apps/files/ajax/download.php", params={"dir": path}
+        ) as response:  # type: ignore
+            self._session.response_headers = response.headers
+            check_error(response.status_code, f"download_directory_as_zip: user={self._session.user}, path={path}")
+            yield response
+
+    async def __download2stream(self, path: str, fp, etag: str, **kwargs) -> str:
+        if download_resumable(fp, **kwargs):
+            if await self.__download_remainder(path, fp, etag, **kwargs):
+                return ""
+            fp.seek(0)
+            fp.truncate()
+        plan = RangedDownload(fp, **kwargs)
+        info = f"download_stream: user={self._session.user}, path={path}"
+        async with self._session.dav_stream(
+            "GET", dav_get_obj_path(self._session.user, path), headers=plan.first_headers()
+        ) as response:
+            self._session.response_headers = response.headers
+            check_error(response.status_code, info)
+            etag = response.headers.get("ETag", "")
+            cache_key = kwargs.get("cache_key", "")
+            cached = self.download_cache.open(cache_key, etag) if self.download_cache and cache_key else None
+            if cached is not None:  # the body is not read, the content is taken from the cache
+                with cached:
+                    shutil.copyfileobj(cached, fp, plan.chunk_size)
+                return ""
+            checksum = download_checksum(response.headers, info) if plan.verify else None
+            async for data_chunk in response.aiter_raw(chunk_size=plan.chunk_size):
+                fp.write(data_chunk)
+                if checksum is not None:
+                    checksum.update(data_chunk)
+            check_checksum(checksum, response.headers, info)
+            parts = plan.parts(response, etag)
+        if parts:  # the server honored `Range`, download the rest of the file in parallel
+            await self.__download_ranges(path, fp, parts, **kwargs)
+            fp.seek(plan.end)
+        return etag
+
+    async def __download_remainder(self, path: str, fp, etag: str, **kwargs) -> bool:
+        headers = build_range_headers(fp.tell(), None, etag)
+        async with self._session.dav_stream(
+            "GET", dav_get_obj_path(self._session.user, path), headers=headers
+        ) as response:
+            self._session.response_headers = response.headers
+            if response.status_code != 416:
+                check_error(response.status_code, f"download_stream: user={self._session.user}, path={path}")
+                if response.status_code != 206:  # file was changed, the response contains it from the start
+                    fp.seek(0)
+                    fp.truncate()
+                async for data_chunk in response.aiter_raw(chunk_size=kwargs.get("chunk_size", 4 * 1024 * 1024)):
+                    fp.write(data_chunk)
+                return True
+        # nothing left to download, or local data is bigger than the file: the server does not tell the file size
+        fs_node = (await self._listdir(self._session.user, path, resolve_properties(["size"]), 0, False))[0]
+        return fs_node.info.size == fp.tell() and fs_node.etag == etag
+
+    async def __download_ranges(self, path: str, fp, parts: list[tuple[dict, int]], **kwargs) -> None:
+        chunk_size = kwargs.get("chunk_size", 4 * 1024 * 1024)
+        semaphore = asyncio.Semaphore(int(kwargs["workers"]))
+        tasks = [asyncio.create_task(self.__download_range(path, fp, semaphore, *i, chunk_size)) for i in parts]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for i in tasks:
+                i.cancel()
+
+    async def __download_range(
+        self, path: str, fp, semaphore: asyncio.Semaphore, headers: dict, offset: int, chunk_size: int
+    ) -> None:
+        dav_path = dav_get_obj_path(self._session.user, path)
+        async with semaphore, self._session.dav_stream("GET", dav_path, headers=headers) as response:
+            check_error(response.status_code, f"download_stream: user={self._session.user}, path={path}")
+            if response.status_code != 206:
+                raise NextcloudException(412, "File was changed during download.", info=f"path={path}")
+            async for data_chunk in response.aiter_raw(chunk_size=chunk_size):
+                fp.seek(offset)
+                fp.write(data_chunk)
+                offset += len(data_chunk)
+
+    @staticmethod
+    async def __transfer_pool(func, args_list: list[tuple], workers: int) -> int:
+        semaphore = asyncio.Semaphore(workers)
+
+        async def run(args: tuple) -> int:
+            async with semaphore:
+                return await func(*args)
+
+        tasks = [asyncio.create_task(run(i)) for i in args_list]
+        try:
+            return sum(await asyncio.gather(*tasks))
+        finally:
+            for i in tasks:
+                i.cancel()
+
+    async def __existing_depth(self, prefixes: list[str]) -> int:
+        lo, hi = self._known_dirs.depth(self._session.user, prefixes), len(prefixes)
+        while lo < hi - 1:  # binary search of the deepest existing directory, the last one is simply created
+            mid = (lo + hi + 1) // 2
+            if await self.__etag(dav_get_obj_path(self._session.user, prefixes[mid - 1])):
+                lo = mid
+            else:
+                hi = mid - 1
+        self._known_dirs.add(self._session.user, prefixes[:lo])
+        return lo
+
+    async def __makedirs_missing(self, prefixes: list[str]) -> Optional[FsNode]:
+        result = None
+        for i in prefixes[await self.__existing_depth(prefixes) :]:
+            result = await self.__mkdir_known(i)
+        return result
+
+    async def __makedirs_many_missing(self, leaves: list[str], workers: int) -> None:
+        missing: set[str] = set()
+        for leaf in leaves:
+            prefixes = build_path_prefixes(leaf)
+            missing.update(prefixes[await self.__existing_depth(prefixes) :])
+        for level in build_tree_levels(missing):
+            await self.__transfer_pool(self.__mkdir_exist_ok, [(i,) for i in level], workers)
+
+    async def __mkdir_known(self, path: str) -> Optional[FsNode]:
+        try:
+            result = await self.mkdir(path)
+        except NextcloudException as e:
+            if e.status_code != 405:  # it was created meanwhile
+                raise
+            result = None
+        self._known_dirs.add(self._session.user, [path])
+        return result
+
+    async def __mkdir_exist_ok(self, path: str) -> int:
+        await self.__mkdir_known(path)
+        return 0
+
+    async def __upload_tree_file(self, path: str, local_path: str, size: int, chunk_size: int, verify: bool) -> int:
+        if size > chunk_size:
+            await self.upload_stream(path, local_path, chunk_size=chunk_size, verify=verify)
+        else:
+            with builtins.open(local_path, "rb") as f:
+                await self.upload(path, f.read(), verify=verify)
+        return size
+
+    async def __upload_tree_remote(self, path: str, workers: int) -> dict[str, FsNode]:
+        result: dict[str, FsNode] = {}
+        try:
+            async for dir_node, dirs, files in self.walk(path, workers=workers, properties="sync"):
+                result.update((sync_relative_path(i, path), i) for i in [dir_node, *dirs, *files])
+        except NextcloudException as e:
+            if e.status_code != 404:
+                raise
+        return result
+
+    @staticmethod
+    async def __upload_tree_changed(
+        files: list[tuple[str, str, int]], remote: dict[str, FsNode], workers: int
+    ) -> list[tuple[str, str, int]]:
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            unchanged = await asyncio.gather(
+                *(loop.run_in_executor(executor, upload_tree_unchanged, i[1], i[2], remote.get(i[0])) for i in files)
+            )
+        return [i for i, skip in zip(files, unchanged) if not skip]
+
+    async def __download_tree_file(self, fs_node: FsNode, local_path: str, chunk_size: int) -> int:
+        if fs_node.info.size > chunk_size:
+            await self.download2stream(fs_node, local_path, chunk_size=chunk_size)
+            return os.path.getsize(local_path)
+        content = await self.download(fs_node)
+        with builtins.open(local_path, "wb") as f:
+            f.write(content)
+        return len(content)
+
+    async def __sync_remote(
+        self, remote_dir: str, state: dict[str, SyncEntry], workers: int, missing_ok: bool
+    ) -> dict[str, SyncEntry]:
+        remote: dict[str, SyncEntry] = {}
+        pruned = set()
+        try:
+            async for _, dirs, files in self.walk(remote_dir, workers=workers, properties="sync"):
+                for i in files + dirs:
+                    path = sync_relative_path(i, remote_dir)
+                    remote[path] = sync_entry_from_node(i)
+                    saved = state.get(path)
+                    if i.is_dir and saved is not None and saved.is_dir and saved.etag == remote[path].etag:
+                        pruned.add(path)  # nothing was changed inside since the last sync
+                dirs[:] = [i for i in dirs if sync_relative_path(i, remote_dir) not in pruned]
+        except NextcloudException as e:
+            if e.status_code != 404 or not missing_ok:
+                raise
+            return {}
+        remote.update(sync_state_subtrees(state, pruned))
+        return remote
+
+    async def __sync_apply(
+        self,
+        download: bool,
+        local_dir: str,
+        remote_dir: str,
+        plan: SyncPlan,
+        remote: dict[str, SyncEntry],
+        state: dict[str, SyncEntry],
+        workers: int,
+    ) -> None:
+        if not download and remote_dir and not remote:
+            await self.makedirs(remote_dir, exist_ok=True)
+        for i in plan.delete:
+            if download:
+                sync_remove_local(os.path.join(local_dir, i))
+            else:
+                await self.delete(sync_remote_path(remote_dir, i), not_fail=True)
+            sync_state_remove(state, i)
+        for i in plan.mkdir:
+            if download:
+                os.makedirs(os.path.join(local_dir, i), exist_ok=True)
+            else:
+                await self.mkdir(sync_remote_path(remote_dir, i))
+        semaphore = asyncio.Semaphore(workers)
+        transfer = self.__sync_download_file if download else self.__sync_upload_file
+        tasks = {
+            i: asyncio.create_task(transfer(semaphore, local_dir, remote_dir, i, remote.get(i))) for i in plan.transfer
+        }
+        try:
+            for path, task in tasks.items():
+                state[path] = await task
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+    async def __sync_download_file(
+        self, semaphore: asyncio.Semaphore, local_dir: str, remote_dir: str, path: str, entry: Optional[SyncEntry]
+    ) -> SyncEntry:
+        local_path = os.path.join(local_dir, path)
+        async with semaphore:
+            await self.download2stream(sync_remote_path(remote_dir, path), local_path)
+        stat = os.stat(local_path)
+        return entry._replace(size=stat.st_size, mtime=stat.st_mtime)  # type: ignore
+
+    async def __sync_upload_file(
+        self, semaphore: asyncio.Semaphore, local_dir: str, remote_dir: str, path: str, _entry: Optional[SyncEntry]
+    ) -> SyncEntry:
+        local_path = os.path.join(local_dir, path)
+        stat = os.stat(local_path)  # the file changed during the upload is uploaded again on the next sync
+        async with semaphore:
+            fs_node = await self.upload_stream(sync_remote_path(remote_dir, path), local_path)
+        return SyncEntry(fs_node.etag.strip('"'), stat.st_size, stat.st_mtime, fs_node.file_id, False)
+
+    async def __download2stream_cached(self, path: Union[str, FsNode], fp, **kwargs) -> None:
+        if not isinstance(fp, (str, Path)) and not hasattr(fp, "write"):
+            raise TypeError("`fp` must be a path to file or an object with `write` method.")
+        download_cache: DownloadCache = self.download_cache  # type: ignore
+        chunk_size = kwargs.get("chunk_size", 4 * 1024 * 1024)
+        with builtins.open(fp, "wb") if isinstance(fp, (str, Path)) else nullcontext(fp) as f:
+            if isinstance(path, FsNode) and path.file_id and path.etag:
+                cached = download_cache.open(path.file_id, path.etag)
+                if cached is not None:
+                    with cached:
+                        shutil.copyfileobj(cached, f, chunk_size)
+                    return
+                cache_key, path = path.file_id, path.user_path
+            else:  # the file ID is not known without a request, the content is cached by path and checked by ETag
+                path = path.user_path if isinstance(path, FsNode) else path
+                cache_key = dav_get_obj_path(self._session.user, path)
+                kwargs["cache_key"] = cache_key
+            with download_cache.writer() as tmp_path:
+                with builtins.open(tmp_path, "w+b") as tmp:
+                    etag = await self.__download2stream(path, tmp, "", **kwargs)
+                    tmp.seek(0)
+                    shutil.copyfileobj(tmp, f, chunk_size)
+                download_cache.put(cache_key, etag, tmp_path)
+
+    async def __upload_chunk(self, upload: ChunkedUpload, start_bytes: int, chunk: UploadChunk) -> None:
+        chunk_path, headers = upload.chunk_request(start_bytes, chunk)
+        response = await self._session.dav("PUT", chunk_path, data=chunk[0], headers=headers, data_hash=chunk[1])
+        check_error(response.status_code, upload.info(cur_size=start_bytes + len(chunk[0])))
+        upload.chunk_done(start_bytes, chunk[0])
+
+    async def __upload_folder_chunks(self, dav_path: str) -> Optional[dict[str, int]]:
+        response = await self._session.dav("PROPFIND", dav_path, data=build_upload_folder_req(), headers={"Depth": "1"})
+        return None if response.status_code == 404 else parse_upload_folder_response(response)
+
+    async def __upload_prepare(self, upload: ChunkedUpload) -> None:
+        if upload.dav_path and upload.resume(await self.__upload_folder_chunks(upload.dav_path)):
+            return
+        # no upload to resume or its folder expired on the server
+        response = await self._session.dav("MKCOL", upload.new_folder())
+        check_error(response.status_code)
+        upload.started()
+
+    async def __upload_chunks(self, upload: ChunkedUpload, fp, workers: int) -> None:
+        pending: set[asyncio.Task] = set()
+        try:
+            async for chunk in aiter_upload_chunks(fp, upload.chunk_size, self._session.data_hasher, upload.checksum):
+                start_bytes = upload.next_chunk(chunk)
+                if start_bytes is None:
+                    pass  # the chunk was uploaded by a previous attempt
+                elif workers == 1:
+                    await self.__upload_chunk(upload, start_bytes, chunk)
+                else:
+                    if len(pending) >= workers:  # no more than `workers` chunks are kept in memory
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        for i in done:
+                            i.result()
+                    pending.add(asyncio.create_task(self.__upload_chunk(upload, start_bytes, chunk)))
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            for i in pending:
+                i.cancel()
+
+    async def __upload_remove_stale(self, upload: ChunkedUpload) -> None:
+        for i in upload.stale_chunks():
+            response = await self._session.dav("DELETE", i)
+            check_error(response.status_code, upload.info(chunk=i))
+
+    async def __upload_stream(self, path: str, fp, **kwargs) -> FsNode:
+        upload = ChunkedUpload(self._session.user, path, **kwargs)
+        await self.__upload_prepare(upload)
+        completed = False
+        try:
+            await self.__upload_chunks(upload, fp, max(int(kwargs.get("workers", 1)), 1))
+            await self.__upload_remove_stale(upload)  # chunks not in the new file are left by the previous attempt
+            response = await self._session.dav(
+                "MOVE", upload.dav_path + "/.file", headers=upload.move_headers(self._session.cfg.dav_endpoint)
+            )
+            check_error(response.status_code, upload.info(total_size=upload.size))
+            self.__cache_invalidate(path)
+            completed = True
+            return FsNode(upload.full_path.strip("/"), **etag_fileid_from_response(response))
+        finally:
+            if upload.finish(completed):
+                await self._session.dav("DELETE", upload.dav_path)
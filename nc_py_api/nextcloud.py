@@ -6,20 +6,34 @@ from fastapi import Request
 from httpx import Headers as HttpxHeaders
 
 from ._misc import check_capabilities
-from ._preferences import PreferencesAPI
-from ._preferences_ex import AppConfigExAPI, PreferencesExAPI
-from ._session import AppConfig, NcSession, NcSessionApp, NcSessionBasic, ServerVersion
+from ._preferences import AsyncPreferencesAPI, PreferencesAPI
+from ._preferences_ex import (
+    AppConfigExAPI,
+    AsyncAppConfigExAPI,
+    AsyncPreferencesExAPI,
+    PreferencesExAPI,
+)
+from ._session import (
+    AppConfig,
+    AsyncNcSession,
+    AsyncNcSessionApp,
+    AsyncNcSessionBasic,
+    NcSession,
+    NcSessionApp,
+    NcSessionBasic,
+    ServerVersion,
+)
 from ._theming import ThemingInfo, get_parsed_theme
-from .apps import _AppsAPI
+from .apps import _AppsAPI, _AsyncAppsAPI
 from .ex_app.defs import ApiScope, LogLvl
-from .ex_app.ui.ui import UiApi
-from .files.files import FilesAPI
-from .notifications import _NotificationsAPI
-from .talk import _TalkAPI
-from .user_status import _UserStatusAPI
-from .users import _UsersAPI
-from .users_groups import _UsersGroupsAPI
-from .weather_status import _WeatherStatusAPI
+from .ex_app.ui.ui import AsyncUiApi, UiApi
+from .files.files import AsyncFilesAPI, FilesAPI
+from .notifications import _AsyncNotificationsAPI, _NotificationsAPI
+from .talk import _AsyncTalkAPI, _TalkAPI
+from .user_status import _AsyncUserStatusAPI, _UserStatusAPI
+from .users import _AsyncUsersAPI, _UsersAPI
+from .users_groups import _AsyncUsersGroupsAPI, _UsersGroupsAPI
+from .weather_status import _AsyncWeatherStatusAPI, _WeatherStatusAPI
 
 
 class _NextcloudBasic(ABC):  # pylint: disable=too-many-instance-attributes
@@ -89,6 +103,76 @@ class _NextcloudBasic(ABC):  # pylint: disable=too-many-instance-attributes
         return get_parsed_theme(self.capabilities["theming"]) if "theming" in self.capabilities else None
 
 
+class _AsyncNextcloudBasic(ABC):  # pylint: disable=too-many-instance-attributes
+    apps: _AsyncAppsAPI
+    """Nextcloud API for App management"""
+    files: AsyncFilesAPI
+    """Nextcloud API for File System and Files Sharing"""
+    preferences: AsyncPreferencesAPI
+    """Nextcloud User Preferences API"""
+    notifications: _AsyncNotificationsAPI
+    """Nextcloud API for managing user notifications"""
+    talk: _AsyncTalkAPI
+    """Nextcloud Talk Api"""
+    users: _AsyncUsersAPI
+    """Nextcloud API for managing users."""
+    users_groups: _AsyncUsersGroupsAPI
+    """Nextcloud API for managing user groups."""
+    user_status: _AsyncUserStatusAPI
+    """Nextcloud API for managing users statuses"""
+    weather_status: _AsyncWeatherStatusAPI
+    """Nextcloud API for managing user weather statuses"""
+    _session: AsyncNcSessionBasic
+
+    def _init_api(self, session: AsyncNcSessionBasic):
+        self.apps = _AsyncAppsAPI(session)
+        self.files = AsyncFilesAPI(session)
+        self.preferences = AsyncPreferencesAPI(session)
+        self.notifications = _AsyncNotificationsAPI(session)
+        self.talk = _AsyncTalkAPI(session)
+        self.users = _AsyncUsersAPI(session)
+        self.users_groups = _AsyncUsersGroupsAPI(session)
+        self.user_status = _AsyncUserStatusAPI(session)
+        self.weather_status = _AsyncWeatherStatusAPI(session)
+
+    async def capabilities(self) -> dict:
+        """Returns the capabilities of the Nextcloud instance."""
+        return await self._session.capabilities()
+
+    async def srv_version(self) -> ServerVersion:
+        """Returns dictionary with the server version."""
+        return await self._session.nc_version()
+
+    async def check_capabilities(self, capabilities: Union[str, list[str]]) -> list[str]:
+        """Returns the list with missing capabilities if any.
+
+        :param capabilities: one or more features to check for.
+        """
+        return check_capabilities(capabilities, await self.capabilities())
+
+    async def update_server_info(self) -> None:
+        """Updates the capabilities and the Nextcloud version.
+
+        *In normal cases, it is called automatically and there is no need to call it manually.*
+        """
+        await self._session.update_server_info()
+
+    @property
+    def response_headers(self) -> HttpxHeaders:
+        """Returns the `HTTPX headers <https://www.python-httpx.org/api/#headers>`_ from the last response."""
+        return self._session.response_headers
+
+    @property
+    async def theme(self) -> Optional[ThemingInfo]:
+        """Returns Theme information."""
+        capabilities = await self.capabilities()
+        return get_parsed_theme(capabilities["theming"]) if "theming" in capabilities else None
+
+    async def close(self) -> None:
+        """Closes all connections of the underlying ``httpx.AsyncClient``."""
+        await self._session.close()
+
+
 class Nextcloud(_NextcloudBasic):
     """Nextcloud client class.
 
@@ -203,3 +287,120 @@ class NextcloudApp(_NextcloudBasic):
             print(e)
             return False
         return True
+
+
+class AsyncNextcloud(_AsyncNextcloudBasic):
+    """Async Nextcloud client class.
+
+    Same as :py:class:`~nc_py_api.nextcloud.Nextcloud`, but all API calls are coroutines and share
+    one ``httpx.AsyncClient``, so many requests can be in flight at the same time.
+    """
+
+    _session: AsyncNcSession
+
+    def __init__(self, **kwargs):
+        """If the parameters are not specified, they will be taken from the environment.
+
+        :param nextcloud_url: url of the nextcloud instance.
+        :param nc_auth_user: login username.
+        :param nc_auth_pass: password or app-password for the username.
+        """
+        self._session = AsyncNcSession(**kwargs)
+        self._init_api(self._session)
+
+    @property
+    def user(self) -> str:
+        """Returns current user name."""
+        return self._session.user
+
+
+class AsyncNextcloudApp(_AsyncNextcloudBasic):
+    """Async class for creating Nextcloud applications.
+
+    Same as :py:class:`~nc_py_api.nextcloud.NextcloudApp`, but all API calls are coroutines.
+
+    .. note:: Instance of this class should not be created directly in ``normal`` applications,
+        it will be provided for each app endpoint call.
+    """
+
+    _session: AsyncNcSessionApp
+    appconfig_ex: AsyncAppConfigExAPI
+    """Nextcloud App Preferences API for ExApps"""
+    preferences_ex: AsyncPreferencesExAPI
+    """Nextcloud User Preferences API for ExApps"""
+    ui: AsyncUiApi
+    """Nextcloud UI API for ExApps"""
+
+    def __init__(self, **kwargs):
+        """The parameters will be taken from the environment.
+
+        They can be overridden by specifying them in **kwargs**, but this behavior is highly discouraged.
+        """
+        self._session = AsyncNcSessionApp(**kwargs)
+        self._init_api(self._session)
+        self.appconfig_ex = AsyncAppConfigExAPI(self._session)
+        self.preferences_ex = AsyncPreferencesExAPI(self._session)
+        self.ui = AsyncUiApi(self._session)
+
+    async def log(self, log_lvl: LogLvl, content: str) -> None:
+        """Writes log to the Nextcloud log file.
+
+        :param log_lvl: level of the log, content belongs to.
+        :param content: string to write into the log.
+        """
+        if await self.check_capabilities("app_ecosystem_v2"):
+            return
+        if int(log_lvl) < (await self.capabilities())["app_ecosystem_v2"].get("loglevel", 0):
+            return
+        await self._session.ocs(
+            method="POST", path=f"{self._session.ae_url}/log", json={"level": int(log_lvl), "message": content}
+        )
+
+    async def users_list(self) -> list[str]:
+        """Returns list of users on the Nextcloud instance. **Available** only for ``System`` applications."""
+        return await self._session.ocs("GET", path=f"{self._session.ae_url}/users", params={"format": "json"})
+
+    async def scope_allowed(self, scope: ApiScope) -> bool:
+        """Check if API scope is avalaible for application.
+
+        Useful for applications that declare optional scopes to check if they are allowed.
+        """
+        if await self.check_capabilities("app_ecosystem_v2"):
+            return False
+        return scope in (await self.capabilities())["app_ecosystem_v2"]["scopes"]
+
+    @property
+    def user(self) -> str:
+        """Property containing the current username.
+
+        *System Applications* can change it with :py:meth:`set_user` and impersonate the user.
+        For normal applications, it is set automatically.
+        """
+        return self._session.user
+
+    async def set_user(self, user_id: str):
+        """Changes current user, available only for the ``System`` applications."""
+        if self._session.user != user_id:
+            self._session.user = user_id
+            self.talk.config_sha = ""
+            self.talk.modified_since = 0
+            await self._session.update_server_info()
+
+    @property
+    def app_cfg(self) -> AppConfig:
+        """Returns deploy config, with AppEcosystem version, Application version and name."""
+        return self._session.cfg
+
+    async def request_sign_check(self, request: Request) -> bool:
+        """Verifies the signature and validity of an incoming request from the Nextcloud.
+
+        :param request: The `Starlette request <https://www.starlette.io/requests/>`_
+
+        .. note:: In most cases ``nc: Annotated[AsyncNextcloudApp, Depends(anc_app)]`` should be used.
+        """
+        try:
+            await self._session.sign_check(request)
+        except ValueError as e:
+            print(e)
+            return False
+        return True
@@ -6,7 +6,12 @@ import email.utils
 import typing
 
 from ._misc import check_capabilities, random_string, require_capabilities
-from ._session import NcSessionApp, NcSessionBasic
+from ._session import (
+    AsyncNcSessionApp,
+    AsyncNcSessionBasic,
+    NcSessionApp,
+    NcSessionBasic,
+)
 
 
 @dataclasses.dataclass
@@ -61,6 +66,35 @@ class Notification:
         self.info = NotificationInfo(raw_info)
 
 
+def _create_notification_params(
+    subject: str,
+    message: str,
+    subject_params: typing.Optional[dict],
+    message_params: typing.Optional[dict],
+    link: str,
+) -> dict:
+    if subject_params is None:
+        subject_params = {}
+    if message_params is None:
+        message_params = {}
+    params: dict = {
+        "params": {
+            "object": "app_ecosystem_v2",
+            "object_id": random_string(56),
+            "subject_type": "app_ecosystem_v2_ex_app",
+            "subject_params": {
+                "rich_subject": subject,
+                "rich_subject_params": subject_params,
+                "rich_message": message,
+                "rich_message_params": message_params,
+            },
+        }
+    }
+    if link:
+        params["params"]["subject_params"]["link"] = link
+    return params
+
+
 class _NotificationsAPI:
     """Class providing an API for managing user notifications on the Nextcloud server."""
 
@@ -91,25 +125,7 @@ class _NotificationsAPI:
         if not subject:
             raise ValueError("`subject` cannot be empty string.")
         require_capabilities(["app_ecosystem_v2", "notifications"], self._session.capabilities)
-        if subject_params is None:
-            subject_params = {}
-        if message_params is None:
-            message_params = {}
-        params: dict = {
-            "params": {
-                "object": "app_ecosystem_v2",
-                "object_id": random_string(56),
-                "subject_type": "app_ecosystem_v2_ex_app",
-                "subject_params": {
-                    "rich_subject": subject,
-                    "rich_subject_params": subject_params,
-                    "rich_message": message,
-                    "rich_message_params": message_params,
-                },
-            }
-        }
-        if link:
-            params["params"]["subject_params"]["link"] = link
+        params = _create_notification_params(subject, message, subject_params, message_params, link)
         return self._session.ocs(method="POST", path=f"{self._session.ae_url}/notification", json=params)["object_id"]
 
     def get_all(self) -> list[Notification]:
@@ -146,3 +162,74 @@ class _NotificationsAPI:
         """Checks the existence of notifications for the current user."""
         require_capabilities("notifications", self._session.capabilities)
         return self._session.ocs(method="POST", path=f"{self._ep_base}/exists", json={"ids": notification_ids})
+
+
+class _AsyncNotificationsAPI:
+    """Class providing an async API for managing user notifications on the Nextcloud server."""
+
+    _ep_base: str = "/ocs/v2.php/apps/notifications/api/v2/notifications"
+
+    def __init__(self, session: AsyncNcSessionBasic):
+        self._session = session
+
+    @property
+    async def available(self) -> bool:
+        """Returns True if the Nextcloud instance supports this feature, False otherwise."""
+        return not check_capabilities("notifications", await self._session.capabilities())
+
+    async def create(
+        self,
+        subject: str,
+        message: str = "",
+        subject_params: typing.Optional[dict] = None,
+        message_params: typing.Optional[dict] = None,
+        link: str = "",
+    ) -> str:
+        """Create a Notification for the current user and returns it's ObjectID.
+
+        .. note:: Does not work in Nextcloud client mode, only for NextcloudApp mode.
+        """
+        if not isinstance(self._session, AsyncNcSessionApp):
+            raise NotImplementedError("Sending notifications is only supported for `App` mode.")
+        if not subject:
+            raise ValueError("`subject` cannot be empty string.")
+        require_capabilities(["app_ecosystem_v2", "notifications"], await self._session.capabilities())
+        params = _create_notification_params(subject, message, subject_params, message_params, link)
+        return (await self._session.ocs(method="POST", path=f"{self._session.ae_url}/notification", json=params))[
+            "object_id"
+        ]
+
+    async def get_all(self) -> list[Notification]:
+        """Gets all notifications for a current user."""
+        require_capabilities("notifications", await self._session.capabilities())
+        return [Notification(i) for i in await self._session.ocs(method="GET", path=self._ep_base)]
+
+    async def get_one(self, notification_id: int) -> Notification:
+        """Gets a single notification for a current user."""
+        require_capabilities("notifications", await self._session.capabilities())
+        return Notification(await self._session.ocs(method="GET", path=f"{self._ep_base}/{notification_id}"))
+
+    async def by_object_id(self, object_id: str) -> typing.Optional[Notification]:
+        """Returns Notification if any by its object ID.
+
+        .. note:: this method is a temporary workaround until `create` can return `notification_id`.
+        """
+        for i in await self.get_all():
+            if i.object_id == object_id:
+                return i
+        return None
+
+    async def delete(self, notification_id: int) -> None:
+        """Deletes a notification for the current user."""
+        require_capabilities("notifications", await self._session.capabilities())
+        await self._session.ocs(method="DELETE", path=f"{self._ep_base}/{notification_id}")
+
+    async def delete_all(self) -> None:
+        """Deletes all notifications for the current user."""
+        require_capabilities("notifications", await self._session.capabilities())
+        await self._session.ocs(method="DELETE", path=self._ep_base)
+
+    async def exists(self, notification_ids: list[int]) -> list[int]:
+        """Checks the existence of notifications for the current user."""
+        require_capabilities("notifications", await self._session.capabilities())
+        return await self._session.ocs(method="POST", path=f"{self._ep_base}/exists", json={"ids": notification_ids})
@@ -5,7 +5,7 @@ import enum
 import typing
 
 from ._misc import check_capabilities, clear_from_params_empty
-from ._session import NcSessionBasic
+from ._session import AsyncNcSessionBasic, NcSessionBasic
 from .user_status import _UserStatus
 
 
@@ -419,6 +419,32 @@ class Conversation(_UserStatus):
         return CallRecordingStatus(self._raw_data.get("callRecording", CallRecordingStatus.NO_RECORDING))
 
 
+def _get_user_conversations_params(no_status_update: bool, include_status: bool, modified_since: int) -> dict:
+    params: dict = {}
+    if no_status_update:
+        params["noStatusUpdate"] = True
+    if include_status:
+        params["includeStatus"] = True
+    if modified_since:
+        params["modifiedSince"] = modified_since
+    return params
+
+
+def _create_conversation_params(
+    conversation_type: ConversationType, invite: str, source: str, room_name: str, object_type: str, object_id: str
+) -> dict:
+    params: dict = {
+        "roomType": int(conversation_type),
+        "invite": invite,
+        "source": source,
+        "roomName": room_name,
+        "objectType": object_type,
+        "objectId": object_id,
+    }
+    clear_from_params_empty(["invite", "source", "roomName", "objectType", "objectId"], params)
+    return params
+
+
 class _TalkAPI:
     """Class that implements work with Nextcloud Talk."""
 
@@ -453,14 +479,9 @@ class _TalkAPI:
                 will contain part of the conversations from the last call that was not modified(
                 their `last_activity` will be the same as ``talk.modified_since``).
         """
-        params: dict = {}
-        if no_status_update:
-            params["noStatusUpdate"] = True
-        if include_status:
-            params["includeStatus"] = True
-        if modified_since:
-            params["modifiedSince"] = self.modified_since if modified_since is True else modified_since
-
+        if modified_since is True:
+            modified_since = self.modified_since
+        params = _get_user_conversations_params(no_status_update, include_status, modified_since)
         result = self._session.ocs("GET", self._ep_base + "/room", params=params)
         self.modified_since = int(self._session.response_headers["X-Nextcloud-Talk-Modified-Before"])
         config_sha = self._session.response_headers["X-Nextcloud-Talk-Hash"]
@@ -493,15 +514,7 @@ class _TalkAPI:
             value is **"room"** to indicate the parent of a breakout room.
         :param object_id: ID of an object this room references, room token is used for the parent of a breakout room.
         """
-        params: dict = {
-            "roomType": int(conversation_type),
-            "invite": invite,
-            "source": source,
-            "roomName": room_name,
-            "objectType": object_type,
-            "objectId": object_id,
-        }
-        clear_from_params_empty(["invite", "source", "roomName", "objectType", "objectId"], params)
+        params = _create_conversation_params(conversation_type, invite, source, room_name, object_type, object_id)
         return Conversation(self._session.ocs("POST", self._ep_base + "/room", json=params))
 
     def delete_conversation(self, conversation: typing.Union[Conversation, str]) -> None:
@@ -526,3 +539,73 @@ class _TalkAPI:
         """
         token = conversation.token if isinstance(conversation, Conversation) else conversation
         self._session.ocs("DELETE", self._ep_base + f"/room/{token}/participants/self")
+
+
+class _AsyncTalkAPI:
+    """Class that implements async work with Nextcloud Talk."""
+
+    _ep_base: str = "/ocs/v2.php/apps/spreed/api/v4"
+    config_sha: str
+    """Sha1 value over Talk config. After receiving a different value on subsequent requests, settings got refreshed."""
+    modified_since: int
+    """Used by ``get_user_conversations``, when **modified_since** param is ``True``."""
+
+    def __init__(self, session: AsyncNcSessionBasic):
+        self._session = session
+        self.config_sha = ""
+        self.modified_since = 0
+
+    @property
+    async def available(self) -> bool:
+        """Returns True if the Nextcloud instance supports this feature, False otherwise."""
+        return not check_capabilities("spreed", await self._session.capabilities())
+
+    async def get_user_conversations(
+        self, no_status_update: bool = True, include_status: bool = False, modified_since: typing.Union[int, bool] = 0
+    ) -> list[Conversation]:
+        """Returns the list of the user's conversations.
+
+        See :py:meth:`~nc_py_api.talk._TalkAPI.get_user_conversations` for the parameters description.
+        """
+        if modified_since is True:
+            modified_since = self.modified_since
+        params = _get_user_conversations_params(no_status_update, include_status, modified_since)
+        result = await self._session.ocs("GET", self._ep_base + "/room", params=params)
+        self.modified_since = int(self._session.response_headers["X-Nextcloud-Talk-Modified-Before"])
+        config_sha = self._session.response_headers["X-Nextcloud-Talk-Hash"]
+        if self.config_sha != config_sha:
+            await self._session.update_server_info()
+            self.config_sha = config_sha
+        return [Conversation(i) for i in result]
+
+    async def create_conversation(
+        self,
+        conversation_type: ConversationType,
+        invite: str = "",
+        source: str = "",
+        room_name: str = "",
+        object_type: str = "",
+        object_id: str = "",
+    ) -> Conversation:
+        """Creates a new conversation.
+
+        See :py:meth:`~nc_py_api.talk._TalkAPI.create_conversation` for the parameters description.
+        """
+        params = _create_conversation_params(conversation_type, invite, source, room_name, object_type, object_id)
+        return Conversation(await self._session.ocs("POST", self._ep_base + "/room", json=params))
+
+    async def delete_conversation(self, conversation: typing.Union[Conversation, str]) -> None:
+        """Deletes a conversation.
+
+        :param conversation: conversation token or :py:class:`~nc_py_api.talk.Conversation`.
+        """
+        token = conversation.token if isinstance(conversation, Conversation) else conversation
+        await self._session.ocs("DELETE", self._ep_base + f"/room/{token}")
+
+    async def leave_conversation(self, conversation: typing.Union[Conversation, str]) -> None:
+        """Removes yourself from the conversation.
+
+        :param conversation: conversation token or :py:class:`~nc_py_api.talk.Conversation`.
+        """
+        token = conversation.token if isinstance(conversation, Conversation) else conversation
+        await self._session.ocs("DELETE", self._ep_base + f"/room/{token}/participants/self")
@@ -5,7 +5,7 @@ import typing
 
 from ._exceptions import NextcloudExceptionNotFound
 from ._misc import check_capabilities, kwargs_to_params, require_capabilities
-from ._session import NcSessionBasic
+from ._session import AsyncNcSessionBasic, NcSessionBasic
 
 
 @dataclasses.dataclass
@@ -211,3 +211,114 @@ class _UserStatusAPI:
         require_capabilities("user_status.restore", self._session.capabilities)
         result = self._session.ocs(method="DELETE", path=f"{self._ep_base}/user_status/revert/{status_id}")
         return result if result else None
+
+
+class _AsyncUserStatusAPI:
+    """Class providing the async user status management API on the Nextcloud server."""
+
+    _ep_base: str = "/ocs/v1.php/apps/user_status/api/v1"
+
+    def __init__(self, session: AsyncNcSessionBasic):
+        self._session = session
+
+    @property
+    async def available(self) -> bool:
+        """Returns True if the Nextcloud instance supports this feature, False otherwise."""
+        return not check_capabilities("user_status.enabled", await self._session.capabilities())
+
+    async def get_list(
+        self, limit: typing.Optional[int] = None, offset: typing.Optional[int] = None
+    ) -> list[UserStatus]:
+        """Returns statuses for all users.
+
+        :param limit: limits the number of results.
+        :param offset: offset of results.
+        """
+        require_capabilities("user_status.enabled", await self._session.capabilities())
+        data = kwargs_to_params(["limit", "offset"], limit=limit, offset=offset)
+        result = await self._session.ocs(method="GET", path=f"{self._ep_base}/statuses", params=data)
+        return [UserStatus(i) for i in result]
+
+    async def get_current(self) -> CurrentUserStatus:
+        """Returns the current user status."""
+        require_capabilities("user_status.enabled", await self._session.capabilities())
+        return CurrentUserStatus(await self._session.ocs(method="GET", path=f"{self._ep_base}/user_status"))
+
+    async def get(self, user_id: str) -> typing.Optional[UserStatus]:
+        """Returns the user status for the specified user.
+
+        :param user_id: User ID for getting status.
+        """
+        require_capabilities("user_status.enabled", await self._session.capabilities())
+        try:
+            return UserStatus(await self._session.ocs(method="GET", path=f"{self._ep_base}/statuses/{user_id}"))
+        except NextcloudExceptionNotFound:
+            return None
+
+    async def get_predefined(self) -> list[PredefinedStatus]:
+        """Returns a list of predefined statuses available for installation on this Nextcloud instance."""
+        if (await self._session.nc_version())["major"] < 27:
+            return []
+        require_capabilities("user_status.enabled", await self._session.capabilities())
+        result = await self._session.ocs(method="GET", path=f"{self._ep_base}/predefined_statuses")
+        return [PredefinedStatus(i) for i in result]
+
+    async def set_predefined(self, status_id: str, clear_at: int = 0) -> None:
+        """Set predefined status for the current user.
+
+        :param status_id: ``predefined`` status ID.
+        :param clear_at: *optional* time in seconds before the status is cleared.
+        """
+        if (await self._session.nc_version())["major"] < 27:
+            return
+        require_capabilities("user_status.enabled", await self._session.capabilities())
+        params: dict[str, typing.Union[int, str]] = {"messageId": status_id}
+        if clear_at:
+            params["clearAt"] = clear_at
+        await self._session.ocs(method="PUT", path=f"{self._ep_base}/user_status/message/predefined", params=params)
+
+    async def set_status_type(self, value: typing.Literal["online", "away", "dnd", "invisible", "offline"]) -> None:
+        """Sets the status type for the current user."""
+        require_capabilities("user_status.enabled", await self._session.capabilities())
+        await self._session.ocs(method="PUT", path=f"{self._ep_base}/user_status/status", params={"statusType": value})
+
+    async def set_status(self, message: typing.Optional[str] = None, clear_at: int = 0, status_icon: str = "") -> None:
+        """Sets current user status.
+
+        :param message: Message text to set in the status.
+        :param clear_at: Unix Timestamp, representing the time to clear the status.
+        :param status_icon: The icon picked by the user (must be one emoji)
+        """
+        require_capabilities("user_status.enabled", await self._session.capabilities())
+        if message is None:
+            await self._session.ocs(method="DELETE", path=f"{self._ep_base}/user_status/message")
+            return
+        if status_icon:
+            require_capabilities("user_status.supports_emoji", await self._session.capabilities())
+        params: dict[str, typing.Union[int, str]] = {"message": message}
+        if clear_at:
+            params["clearAt"] = clear_at
+        if status_icon:
+            params["statusIcon"] = status_icon
+        await self._session.ocs(method="PUT", path=f"{self._ep_base}/user_status/message/custom", params=params)
+
+    async def get_backup_status(self, user_id: str = "") -> typing.Optional[UserStatus]:
+        """Get the backup status of the user if any.
+
+        :param user_id: User ID for getting status.
+        """
+        require_capabilities("user_status.enabled", await self._session.capabilities())
+        user_id = user_id if user_id else self._session.user
+        if not user_id:
+            raise ValueError("user_id can not be empty.")
+        return await self.get(f"_{user_id}")
+
+    async def restore_backup_status(self, status_id: str) -> typing.Optional[CurrentUserStatus]:
+        """Restores the backup state as current for the current user.
+
+        :param status_id: backup status ID.
+        """
+        require_capabilities("user_status.enabled", await self._session.capabilities())
+        require_capabilities("user_status.restore", await self._session.capabilities())
+        result = await self._session.ocs(method="DELETE", path=f"{self._ep_base}/user_status/revert/{status_id}")
+        return result if result else None
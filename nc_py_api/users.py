@@ -3,7 +3,19 @@
 import typing
 
 from ._misc import kwargs_to_params
-from ._session import NcSessionBasic
+from ._session import AsyncNcSessionBasic, NcSessionBasic
+
+
+def _create_user_data(user_id: str, **kwargs) -> dict:
+    password = kwargs.get("password", None)
+    email = kwargs.get("email", None)
+    if not password and not email:
+        raise ValueError("Either password or email must be set")
+    data = {"userid": user_id}
+    for k in ("password", "displayname", "email", "groups", "subadmin", "quota", "language"):
+        if k in kwargs:
+            data[k] = kwargs[k]
+    return data
 
 
 class _UsersAPI:
@@ -57,15 +69,7 @@ class _UsersAPI:
             * ``quota`` - quota for the user, if needed.
             * ``language`` - default language for the user.
         """
-        password = kwargs.get("password", None)
-        email = kwargs.get("email", None)
-        if not password and not email:
-            raise ValueError("Either password or email must be set")
-        data = {"userid": user_id}
-        for k in ("password", "displayname", "email", "groups", "subadmin", "quota", "language"):
-            if k in kwargs:
-                data[k] = kwargs[k]
-        self._session.ocs(method="POST", path=self._ep_base, json=data)
+        self._session.ocs(method="POST", path=self._ep_base, json=_create_user_data(user_id, **kwargs))
 
     def delete(self, user_id: str) -> None:
         """Deletes user from the Nextcloud server.
@@ -139,3 +143,124 @@ class _UsersAPI:
         :param group_id: group where user should be removed from administrators.
         """
         self._session.ocs(method="DELETE", path=f"{self._ep_base}/{user_id}/subadmins", params={"groupid": group_id})
+
+
+class _AsyncUsersAPI:
+    """The class provides the async user, user groups, user status API on the Nextcloud server.
+
+    .. note:: In NextcloudApp mode, only ``get_list`` and ``get_details`` methods are available.
+    """
+
+    _ep_base: str = "/ocs/v1.php/cloud/users"
+
+    def __init__(self, session: AsyncNcSessionBasic):
+        self._session = session
+
+    async def get_list(
+        self, mask: typing.Optional[str] = "", limit: typing.Optional[int] = None, offset: typing.Optional[int] = None
+    ) -> list[str]:
+        """Returns list of user IDs.
+
+        :param mask: user ID mask to apply.
+        :param limit: limits the number of results.
+        :param offset: offset of results.
+        """
+        data = kwargs_to_params(["search", "limit", "offset"], search=mask, limit=limit, offset=offset)
+        response_data = await self._session.ocs(method="GET", path=self._ep_base, params=data)
+        return response_data["users"] if response_data else {}
+
+    async def get_details(self, user_id: str = "") -> dict:
+        """Returns detailed user information.
+
+        :param user_id: the identifier of the user about which information is to be returned.
+        """
+        if not user_id:
+            user_id = self._session.user
+        if not user_id:
+            raise ValueError("user_id can not be empty.")
+        return await self._session.ocs(method="GET", path=f"{self._ep_base}/{user_id}")
+
+    async def create(self, user_id: str, **kwargs) -> None:
+        """Create a new user on the Nextcloud server.
+
+        :param user_id: id of the user to create.
+        :param kwargs: See :py:meth:`~nc_py_api.users._UsersAPI.create`.
+        """
+        await self._session.ocs(method="POST", path=self._ep_base, json=_create_user_data(user_id, **kwargs))
+
+    async def delete(self, user_id: str) -> None:
+        """Deletes user from the Nextcloud server.
+
+        :param user_id: id of the user.
+        """
+        await self._session.ocs(method="DELETE", path=f"{self._ep_base}/{user_id}")
+
+    async def enable(self, user_id: str) -> None:
+        """Enables user on the Nextcloud server.
+
+        :param user_id: id of the user.
+        """
+        await self._session.ocs(method="PUT", path=f"{self._ep_base}/{user_id}/enable")
+
+    async def disable(self, user_id: str) -> None:
+        """Disables user on the Nextcloud server.
+
+        :param user_id: id of the user.
+        """
+        await self._session.ocs(method="PUT", path=f"{self._ep_base}/{user_id}/disable")
+
+    async def resend_welcome_email(self, user_id: str) -> None:
+        """Send welcome email for specified user again.
+
+        :param user_id: id of the user.
+        """
+        await self._session.ocs(method="POST", path=f"{self._ep_base}/{user_id}/welcome")
+
+    async def editable_fields(self) -> list[str]:
+        """Returns user fields that avalaible for edit."""
+        return await self._session.ocs(method="GET", path="/ocs/v1.php/cloud/user/fields")
+
+    async def edit(self, user_id: str, **kwargs) -> None:
+        """Edits user metadata.
+
+        :param user_id: id of the user.
+        :param kwargs: dictionary where keys are values from ``editable_fields`` method, and values to set.
+        """
+        for k, v in kwargs.items():
+            await self._session.ocs(method="PUT", path=f"{self._ep_base}/{user_id}", params={"key": k, "value": v})
+
+    async def add_to_group(self, user_id: str, group_id: str) -> None:
+        """Adds user to the group.
+
+        :param user_id: ID of the user.
+        :param group_id: the destination group to which add user to.
+        """
+        await self._session.ocs(method="POST", path=f"{self._ep_base}/{user_id}/groups", params={"groupid": group_id})
+
+    async def remove_from_group(self, user_id: str, group_id: str) -> None:
+        """Removes user from the group.
+
+        :param user_id: ID of the user.
+        :param group_id: group from which remove user.
+        """
+        await self._session.ocs(method="DELETE", path=f"{self._ep_base}/{user_id}/groups", params={"groupid": group_id})
+
+    async def promote_to_subadmin(self, user_id: str, group_id: str) -> None:
+        """Makes user admin of the group.
+
+        :param user_id: ID of the user.
+        :param group_id: group where user should become administrator.
+        """
+        await self._session.ocs(
+            method="POST", path=f"{self._ep_base}/{user_id}/subadmins", params={"groupid": group_id}
+        )
+
+    async def demote_from_subadmin(self, user_id: str, group_id: str) -> None:
+        """Removes user from the admin role of the group.
+
+        :param user_id: ID of the user.
+        :param group_id: group where user should be removed from administrators.
+        """
+        await self._session.ocs(
+            method="DELETE", path=f"{self._ep_base}/{user_id}/subadmins", params={"groupid": group_id}
+        )
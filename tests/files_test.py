@@ -1,18 +1,59 @@
+import dataclasses
+import hashlib
 import math
+import mmap
 import os
+import sys
 import zipfile
-from datetime import datetime
+from datetime import datetime, timezone
 from io import BytesIO
 from random import choice, randbytes
 from string import ascii_lowercase
-from tempfile import NamedTemporaryFile
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+from xml.etree import ElementTree
 from zlib import adler32
 
+import httpx
 import pytest
-from gfixture import NC_TO_TEST
+from gfixture import ANC_TO_TEST, NC_TO_TEST
 from PIL import Image
-
-from nc_py_api import FsNode, NextcloudException
+from xxhash import xxh64
+
+from nc_py_api import (
+    DownloadCache,
+    FilePermissions,
+    FilesCache,
+    FsNode,
+    FsNodeTable,
+    NextcloudException,
+    SearchQuery,
+    SyncPlan,
+)
+from nc_py_api._session import NcSessionBasic  # noqa
+from nc_py_api.files import FsNodeInfo
+from nc_py_api.files._files import (  # noqa
+    PROPFIND_PROPERTIES,
+    Checksum,
+    ChunkedUpload,
+    KnownDirs,
+    RangedDownload,
+    UploadChunkAssembler,
+    WalkFrontier,
+    build_find_request,
+    build_path_prefixes,
+    build_paths_parents,
+    build_report_req,
+    check_checksum,
+    clear_file_id,
+    download_checksum,
+    parse_checksums,
+    resolve_properties,
+    search_query_from_list,
+    unavailable_info,
+    upload_journal_load,
+)
+from nc_py_api.files._sync import SyncEntry, build_sync_plan  # noqa
+from nc_py_api.files._zip import ZipStreamParser  # noqa
 
 
 class MyBytesIO(BytesIO):
@@ -79,6 +120,72 @@ def test_list_empty_child_dir(nc):
         nc.files.delete("empty_child_folder")
 
 
+@pytest.mark.parametrize("nc", NC_TO_TEST[:1])
+def test_list_dir_properties(nc):
+    nc.files.makedirs("test_root_folder", exist_ok=True)
+    nc.files.upload("test_root_folder/test.txt", content=b"content")
+    try:
+        full = nc.files.listdir("test_root_folder")
+        result = nc.files.listdir("test_root_folder", properties="minimal")
+        assert result == full
+        assert result[0].etag == full[0].etag
+        assert result[0].info.fileid == full[0].info.fileid
+        assert not hasattr(result[0].info, "size")
+        with pytest.raises(AttributeError):
+            assert result[0].info.permissions
+        assert str(result[0])
+        result = nc.files.listdir("test_root_folder", properties=["size", "last_modified"])
+        assert result[0].info.size == 7
+        assert result[0].info.last_modified == full[0].info.last_modified
+        assert not hasattr(result[0].info, "favorite")
+        result = nc.files.find(["eq", "name", "test.txt"], path="test_root_folder", properties="sync")
+        assert result[0].info.size == 7
+        assert not hasattr(result[0].info, "permissions")
+        with pytest.raises(ValueError):
+            nc.files.listdir("test_root_folder", properties="unknown")
+    finally:
+        nc.files.delete("test_root_folder")
+
+
+def test_resolve_properties():
+    assert resolve_properties(None) == resolve_properties("full") == PROPFIND_PROPERTIES
+    assert unavailable_info(resolve_properties("full")) == ()
+    properties = resolve_properties(["size", "nc:lock"])
+    assert properties == ["d:getetag", "oc:id", "oc:fileid", "oc:size", "nc:lock"]
+    assert "size" not in unavailable_info(properties)
+    assert "permissions" in unavailable_info(properties)
+    with pytest.raises(ValueError):
+        resolve_properties(["unknown"])
+    fs_node = FsNode("files/admin/test.txt", file_id="1", unavailable=unavailable_info(resolve_properties("minimal")))
+    assert not hasattr(fs_node.info, "last_modified")
+    assert not hasattr(fs_node.info, "checksums")
+    assert fs_node.info.fileid == 0
+    assert "size" not in repr(fs_node)
+
+
+def test_fs_node_info_compare():
+    assert [i.name for i in dataclasses.fields(FsNodeInfo)] == [
+        "size",
+        "content_length",
+        "permissions",
+        "favorite",
+        "fileid",
+        "last_modified",
+        "checksums",
+    ]
+    kwargs = {"file_id": "1", "size": 3, "last_modified": "Wed, 01 Jan 2020 00:00:00 GMT", "checksums": "SHA1:AB"}
+    full = FsNode("files/admin/test.txt", **kwargs)
+    assert dataclasses.asdict(full.info)["last_modified"] == full.info.last_modified
+    assert dataclasses.asdict(full.info)["checksums"] == {"SHA1": "ab"}
+    unavailable = unavailable_info(resolve_properties(["size"]))
+    partial1 = FsNode("files/admin/test.txt", unavailable=unavailable, **kwargs)
+    partial2 = FsNode("files/admin/test.txt", unavailable=unavailable, file_id="1", size=3)
+    assert partial1.info == partial2.info
+    assert partial1.info != full.info
+    assert partial1.info != FsNode("files/admin/test.txt", unavailable=unavailable, file_id="1", size=4).info
+    assert partial1 == full
+
+
 @pytest.mark.parametrize("nc", NC_TO_TEST[:1])
 def test_list_dir_wrong_args(nc):
     with pytest.raises(ValueError):
@@ -98,6 +205,39 @@ def test_by_path(nc):
     assert result.user == nc.user
 
 
+@pytest.mark.parametrize("nc", NC_TO_TEST)
+def test_by_ids_by_paths(nc):
+    nc.files.makedirs("test_dir_bulk/sub", exist_ok=True)
+    try:
+        nodes = [nc.files.upload(f"test_dir_bulk/{i}.txt", content=str(i)) for i in range(3)]
+        nodes.append(nc.files.upload("test_dir_bulk/sub/3.txt", content="3"))
+        file_ids = [nodes[0].file_id, clear_file_id(nodes[1].file_id), str(clear_file_id(nodes[2].file_id)), nodes[3]]
+        result = nc.files.by_ids(file_ids + [999999999])
+        assert list(result) == [nodes[0].file_id, file_ids[1], file_ids[2], nodes[3].file_id, 999999999]
+        assert [result[i].user_path for i in list(result)[:4]] == [i.user_path for i in nodes]
+        assert result[999999999] is None
+        assert nc.files.by_ids([]) == {}
+        paths = ["test_dir_bulk/0.txt", "/test_dir_bulk/sub/3.txt", "test_dir_bulk/sub", "test_dir_bulk/no.txt", ""]
+        result = nc.files.by_paths(paths + ["no_such_dir/file.txt"])
+        assert result["test_dir_bulk/0.txt"].info.size == 1
+        assert result["/test_dir_bulk/sub/3.txt"].file_id == nodes[3].file_id
+        assert result["test_dir_bulk/sub"].is_dir
+        assert result[""].is_dir
+        assert result["test_dir_bulk/no.txt"] is None
+        assert result["no_such_dir/file.txt"] is None
+    finally:
+        nc.files.delete("test_dir_bulk")
+
+
+def test_by_ids_by_paths_helpers():
+    assert clear_file_id(123) == 123
+    assert clear_file_id("123") == 123
+    assert clear_file_id("00000123ocgj3d2") == 123
+    with pytest.raises(ValueError):
+        clear_file_id("oc123")
+    assert build_paths_parents(["a/b.txt", "/a/c/", "d", "", "a/c/e"]) == ["", "a", "a/c"]
+
+
 @pytest.mark.parametrize("nc", NC_TO_TEST)
 def test_file_download(nc):
     content = randbytes(64)
@@ -108,6 +248,20 @@ def test_file_download(nc):
     assert srv_admin_manual1 == content
 
 
+@pytest.mark.asyncio(scope="session")
+@pytest.mark.parametrize("anc", ANC_TO_TEST)
+async def test_file_download_async(anc):
+    content = randbytes(64)
+    new_file = await anc.files.upload("test_file.txt", content=content)
+    srv_admin_manual1 = await anc.files.download(new_file)
+    srv_admin_manual2 = await anc.files.download("/test_file.txt")
+    assert srv_admin_manual1 == srv_admin_manual2
+    assert srv_admin_manual1 == content
+    buf = BytesIO()
+    await anc.files.download2stream("/test_file.txt", buf, chunk_size=15)
+    assert buf.getvalue() == content
+
+
 @pytest.mark.parametrize("nc", NC_TO_TEST)
 @pytest.mark.parametrize("data_type", ("str", "bytes"))
 @pytest.mark.parametrize("chunk_size", (15, 32, 64, None))
@@ -128,6 +282,51 @@ def test_file_download2stream(nc, data_type, chunk_size):
         assert srv_admin_manual_buf.n_write_calls == math.ceil(64 / chunk_size)
 
 
+@pytest.mark.parametrize("nc", NC_TO_TEST)
+@pytest.mark.parametrize("workers", (2, 5))
+def test_file_download2stream_workers(nc, workers):
+    content = randbytes(1000)
+    nc.files.upload("test_file.bin", content=content)
+    buf = BytesIO(b"123")
+    buf.seek(3)
+    nc.files.download2stream("test_file.bin", buf, chunk_size=99, workers=workers)
+    assert buf.getvalue() == b"123" + content
+    assert buf.tell() == 1003
+    nc.files.delete("test_file.bin")
+
+
+@pytest.mark.parametrize("nc", NC_TO_TEST)
+def test_file_download2stream_resume(nc):
+    content = randbytes(1000)
+    new_file = nc.files.upload("test_file.bin", content=content)
+    new_file = nc.files.by_id(new_file)
+    buf = BytesIO(content[:300])
+    buf.seek(300)
+    nc.files.download2stream(new_file, buf, resume=True)
+    assert buf.getvalue() == content
+    methods = []
+    request_hooks = nc._session.adapter.event_hooks["request"]
+    request_hooks.append(lambda request: methods.append(request.method))
+    try:
+        nc.files.download2stream(new_file, buf, resume=True)
+    finally:
+        request_hooks.pop()
+    assert buf.getvalue() == content
+    assert methods == ["GET", "PROPFIND"]  # local copy is complete, only its size is checked
+    buf = BytesIO(content + b"extra")
+    buf.seek(0, os.SEEK_END)
+    nc.files.download2stream(new_file, buf, resume=True)  # local data is bigger than the file
+    assert buf.getvalue() == content
+    buf = BytesIO(randbytes(300))
+    buf.seek(300)
+    nc.files.upload("test_file.bin", content=content[::-1])
+    nc.files.download2stream(new_file, buf, resume=True)  # etag was changed, file should be downloaded again
+    assert buf.getvalue() == content[::-1]
+    with pytest.raises(ValueError):
+        nc.files.download2stream("test_file.bin", buf, resume=True)  # the local data can not be checked
+    nc.files.delete("test_file.bin")
+
+
 @pytest.mark.parametrize("nc", NC_TO_TEST)
 def test_file_download2file(nc):
     content = randbytes(64)
@@ -217,6 +416,251 @@ def test_file_upload_chunked(nc, chunk_size):
     assert upload_crc == download_crc
 
 
+@pytest.mark.parametrize("nc", NC_TO_TEST)
+@pytest.mark.parametrize("workers", (2, 5))
+def test_file_upload_chunked_workers(nc, workers):
+    file_name = "chunked_workers.bin"
+    random_bytes = randbytes(1000)
+    result = nc.files.upload_stream(file_name, fp=BytesIO(random_bytes), chunk_size=99, workers=workers)
+    assert nc.files.by_id(result.file_id).info.size == 1000
+    assert nc.files.download(file_name) == random_bytes
+    nc.files.delete(file_name)
+
+
+@pytest.mark.parametrize("nc", NC_TO_TEST)
+def test_file_upload_buffers(nc):
+    random_bytes = randbytes(1000)
+    nc.files.upload("buffer.bin", bytearray(random_bytes))
+    assert nc.files.download("buffer.bin") == random_bytes
+    nc.files.upload("buffer.bin", memoryview(random_bytes)[100:200])
+    assert nc.files.download("buffer.bin") == random_bytes[100:200]
+    result = nc.files.upload_stream("buffer.bin", memoryview(random_bytes), chunk_size=99, workers=2)
+    assert nc.files.by_id(result.file_id).info.size == 1000
+    assert nc.files.download("buffer.bin") == random_bytes
+    with NamedTemporaryFile(delete=False) as f:
+        f.write(random_bytes)
+    try:
+        nc.files.upload_stream("buffer.bin", f.name, chunk_size=99)
+        assert nc.files.download("buffer.bin") == random_bytes
+        with open(f.name, "rb") as f_read, mmap.mmap(f_read.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            nc.files.upload("buffer.bin", mm)
+            assert nc.files.download("buffer.bin") == random_bytes
+        with pytest.raises(TypeError):
+            nc.files.upload_stream("buffer.bin", 1)
+    finally:
+        os.remove(f.name)
+        nc.files.delete("buffer.bin")
+
+
+def test_file_upload_buffers_redirect():
+    class Transport(httpx.BaseTransport):
+        def handle_request(self, request):
+            body = b"".join(request.stream)  # unlike `httpx.MockTransport`, the body is not buffered by `read`
+            if request.url.path == "/redirect":
+                return httpx.Response(307, headers={"Location": "/target"})
+            return httpx.Response(201, content=body)
+
+    data = memoryview(randbytes(3 * 1024 * 1024 + 5))
+    headers = {}
+    content = NcSessionBasic._dav_content(headers, data)
+    with httpx.Client(base_url="http://nc", transport=Transport(), follow_redirects=True) as client:
+        response = client.put("/redirect", content=content, headers=headers)
+    assert response.status_code == 201
+    assert response.content == data  # the body is sent again to the redirect target
+
+
+@pytest.mark.parametrize("nc", NC_TO_TEST)
+def test_file_upload_generator(nc):
+    random_bytes = randbytes(1000)
+
+    def pieces():
+        for i in range(0, len(random_bytes), 77):
+            yield random_bytes[i : i + 77]
+
+    result = nc.files.upload_stream("generator.bin", pieces(), chunk_size=100, workers=2)
+    assert nc.files.by_id(result.file_id).info.size == 1000
+    assert nc.files.download("generator.bin") == random_bytes
+    nc.files.delete("generator.bin")
+
+
+@pytest.mark.asyncio(scope="session")
+@pytest.mark.parametrize("anc", ANC_TO_TEST)
+async def test_file_upload_generator_async(anc):
+    random_bytes = randbytes(1000)
+
+    async def pieces():
+        for i in range(0, len(random_bytes), 77):
+            yield random_bytes[i : i + 77]
+
+    result = await anc.files.upload_stream("generator.bin", pieces(), chunk_size=100, workers=2)
+    assert (await anc.files.by_id(result.file_id)).info.size == 1000
+    assert await anc.files.download("generator.bin") == random_bytes
+    await anc.files.delete("generator.bin")
+
+
+def test_upload_chunk_assembler():
+    data = randbytes(1000)
+    assembler = UploadChunkAssembler(300, xxh64)
+    chunks = []
+    for i in range(0, len(data), 77):
+        chunks += assembler.add(data[i : i + 77])
+    chunks += assembler.flush()
+    assert [bytes(i[0]) for i in chunks] == [data[:300], data[300:600], data[600:900], data[900:]]
+    assert [i[1] for i in chunks] == [xxh64(bytes(i[0])).hexdigest() for i in chunks]
+    assembler = UploadChunkAssembler(3, lambda: None)
+    assert [(bytes(i[0]), i[1]) for i in assembler.add("abcd")] == [(b"abc", None)]
+    assert [bytes(i[0]) for i in assembler.add(b"")] == []
+    assert [bytes(i[0]) for i in assembler.flush()] == [b"d"]
+    assert not assembler.flush()
+
+
+def test_upload_chunk_assembler_checksum():
+    data = randbytes(1000)
+    checksum = Checksum("MD5")
+    assembler = UploadChunkAssembler(300, lambda: None, checksum)
+    chunks = assembler.add(data) + assembler.flush()
+    for i in chunks:
+        chunk_checksum = Checksum("MD5")
+        chunk_checksum.update(bytes(i[0]))
+        assert i[2] == str(chunk_checksum)
+    assert str(checksum) == "MD5:" + hashlib.md5(data).hexdigest()
+
+
+def test_checksum():
+    checksum = Checksum("adler32")
+    checksum.update(b"abc")
+    checksum.update(b"def")
+    assert str(checksum) == f"ADLER32:{adler32(b'abcdef'):08x}"
+    checksum = Checksum()
+    checksum.update(memoryview(b"abcdef"))
+    assert str(checksum) == "SHA1:" + hashlib.sha1(b"abcdef").hexdigest()
+    with pytest.raises(ValueError):
+        Checksum("CRC32")
+    assert parse_checksums("SHA1:ABC md5:def ADLER32:") == {"SHA1": "abc", "MD5": "def"}
+    assert parse_checksums("") == {}
+
+
+def test_download_checksum():
+    headers = httpx.Headers({"OC-Checksum": "MD5:" + hashlib.md5(b"abc").hexdigest()})
+    check_checksum(download_checksum(headers, ""), headers, "", b"abc")
+    with pytest.raises(NextcloudException):
+        check_checksum(download_checksum(headers, ""), headers, "", b"abd")
+    with pytest.raises(NextcloudException):
+        download_checksum(httpx.Headers({}), "")  # nothing to verify the data with
+
+
+@pytest.mark.parametrize("nc", NC_TO_TEST)
+def test_file_upload_download_verify(nc):
+    random_bytes = randbytes(1000)
+    nc.files.upload("verify.bin", random_bytes, verify=True)
+    assert nc.files.by_path("verify.bin").info.checksums["SHA1"] == hashlib.sha1(random_bytes).hexdigest()
+    assert nc.files.download("verify.bin", verify=True) == random_bytes
+    nc.files.upload_stream("verify.bin", BytesIO(random_bytes), chunk_size=300, verify="MD5")
+    assert nc.files.by_path("verify.bin").info.checksums["MD5"] == hashlib.md5(random_bytes).hexdigest()
+    buf = BytesIO()
+    nc.files.download2stream("verify.bin", buf, verify=True)
+    assert buf.getvalue() == random_bytes
+    with pytest.raises(ValueError):
+        nc.files.download2stream("verify.bin", BytesIO(), verify=True, resume=True)
+    nc.files.upload("verify.bin", random_bytes)
+    with pytest.raises(NextcloudException):
+        nc.files.download("verify.bin", verify=True)
+    buf = BytesIO()
+    with pytest.raises(NextcloudException):
+        nc.files.download2stream("verify.bin", buf, verify=True)
+    assert not buf.getvalue()
+    nc.files.delete("verify.bin")
+
+
+@pytest.mark.asyncio(scope="session")
+@pytest.mark.parametrize("anc", ANC_TO_TEST)
+async def test_file_upload_download_verify_async(anc):
+    random_bytes = randbytes(1000)
+    await anc.files.upload("verify.bin", random_bytes, verify=True)
+    assert (await anc.files.by_path("verify.bin")).info.checksums["SHA1"] == hashlib.sha1(random_bytes).hexdigest()
+    assert await anc.files.download("verify.bin", verify=True) == random_bytes
+    buf = BytesIO()
+    await anc.files.download2stream("verify.bin", buf, verify=True)
+    assert buf.getvalue() == random_bytes
+    await anc.files.delete("verify.bin")
+
+
+@pytest.mark.parametrize("nc", NC_TO_TEST)
+def test_file_upload_chunked_resume(nc):
+    class FailingBytesIO(MyBytesIO):
+        def read(self, *args, **kwargs):
+            if self.n_read_calls == 5:
+                raise OSError("read error")
+            return super().read(*args, **kwargs)
+
+    file_name = "chunked_resume.bin"
+    random_bytes = randbytes(1000)
+    with NamedTemporaryFile(delete=False) as journal:
+        journal_path = journal.name
+    buf_upload = FailingBytesIO()
+    buf_upload.write(random_bytes)
+    buf_upload.seek(0)
+    with pytest.raises(OSError):
+        nc.files.upload_stream(file_name, fp=buf_upload, chunk_size=100, journal=journal_path)
+    assert os.path.exists(journal_path)
+    journal_header = {"user": nc.user, "path": file_name, "chunk_size": 100}
+    uploaded = upload_journal_load(journal_path, journal_header)[1]
+    assert 0 < len(uploaded) < 10
+    buf_upload = MyBytesIO()
+    buf_upload.write(random_bytes)
+    buf_upload.seek(0)
+    old_headers = nc.response_headers
+    methods = []
+    request_hooks = nc._session.adapter.event_hooks["request"]
+    request_hooks.append(lambda request: methods.append(request.method))
+    try:
+        result = nc.files.upload_stream(file_name, fp=buf_upload, chunk_size=100, journal=journal_path)
+    finally:
+        request_hooks.pop()
+    assert nc.response_headers != old_headers
+    assert methods.count("PUT") == 10 - len(uploaded)  # chunks already on the server are not sent again
+    assert not os.path.exists(journal_path)
+    assert nc.files.by_id(result.file_id).info.size == 1000
+    assert nc.files.download(file_name) == random_bytes
+    nc.files.delete(file_name)
+
+
+@pytest.mark.parametrize("nc", NC_TO_TEST[:1])
+@pytest.mark.parametrize("size", (950, 1100))
+def test_file_upload_chunked_resume_changed_size(nc, size):
+    class FailingBytesIO(MyBytesIO):
+        def read(self, *args, **kwargs):
+            if self.n_read_calls == 10:  # all chunks are uploaded, the file is not assembled
+                raise OSError("read error")
+            return super().read(*args, **kwargs)
+
+    file_name = "chunked_resume.bin"
+    random_bytes = randbytes(1100)
+    with NamedTemporaryFile(delete=False) as journal:
+        journal_path = journal.name
+    buf_upload = FailingBytesIO()
+    buf_upload.write(random_bytes[:1000])
+    buf_upload.seek(0)
+    with pytest.raises(OSError):
+        nc.files.upload_stream(file_name, fp=buf_upload, chunk_size=100, journal=journal_path)
+    result = nc.files.upload_stream(file_name, fp=BytesIO(random_bytes[:size]), chunk_size=100, journal=journal_path)
+    assert nc.files.by_id(result.file_id).info.size == size
+    assert nc.files.download(file_name) == random_bytes[:size]  # chunks of the longer source are not joined
+    nc.files.delete(file_name)
+
+
+@pytest.mark.asyncio(scope="session")
+@pytest.mark.parametrize("anc", ANC_TO_TEST)
+@pytest.mark.parametrize("chunk_size", (63, 64, 65))
+async def test_file_upload_chunked_async(anc, chunk_size):
+    file_name = "chunked.bin"
+    random_bytes = randbytes(64)
+    result = await anc.files.upload_stream(file_name, fp=BytesIO(random_bytes), chunk_size=chunk_size, workers=3)
+    assert (await anc.files.by_id(result.file_id)).info.size == 64
+    assert await anc.files.download(file_name) == random_bytes
+    assert [i for i in await anc.files.listdir() if i.user_path == file_name]
+
+
 @pytest.mark.parametrize("nc", NC_TO_TEST)
 def test_file_upload_file(nc):
     content = randbytes(64)
@@ -317,6 +761,11 @@ def test_favorites(nc):
     assert len(favorites) == 3
     for favorite in favorites:
         assert isinstance(favorite, FsNode)
+        assert favorite.file_id
+        assert favorite.info.favorite
+        assert favorite.info.size == 8
+    assert len(nc.files.report({"favorite": True})) == 3
+    for favorite in favorites:
         nc.files.setfav(favorite, False)
     assert len(nc.files.listfav()) == 0
     for n in files:
@@ -340,6 +789,8 @@ def test_copy_file(nc):
         copied_file = nc.files.copy(src, dest, overwrite=True)
         assert copied_file.file_id
         assert not copied_file.is_dir
+        assert copied_file.user_path == dest
+        assert nc.files.copy(src, dest, overwrite=True, return_node=False) is None
     finally:
         nc.files.delete(dest)
 
@@ -441,6 +892,21 @@ def test_find_files_listdir_depth(nc):
     assert len(result) == 6  # 1 sub dir + 3 images + 2 text files
     result = nc.files.find(["like", "mime", "text/%"], path="test_root_folder")
     assert len(result) == 2
+    result = nc.files.find(["gte", "size", 0], path="test_root_folder", limit=2, order_by="-size")
+    assert len(result) == 2
+    assert result[0].info.size >= result[1].info.size
+    result2 = nc.files.find(["gte", "size", 0], path="test_root_folder", limit=2, offset=1, order_by="-size")
+    assert result2[0] == result[1]
+    result = list(nc.files.iter_find(["gte", "size", 0], path="test_root_folder", page_size=4))
+    assert len(result) == 6
+    assert len({i.file_id for i in result}) == 6
+    images = (SearchQuery.prop("size") > SearchQuery.param("size")) & SearchQuery.prop("mime").like("image/%")
+    assert len(nc.files.find(images, path="test_root_folder", params={"size": 1 * 1024})) == 3
+    assert len(nc.files.find(images, path="test_root_folder", params={"size": 40 * 1024})) == 2
+    with pytest.raises(TypeError):
+        nc.files.find(images, path="test_root_folder", param={"size": 1})
+    result = nc.files.find(~SearchQuery.prop("mime").like("image/%"), path="test_root_folder")
+    assert len(result) == 3
     result = nc.files.listdir("test_root_folder/", depth=1)
     result2 = nc.files.listdir("test_root_folder/")
     assert result == result2
@@ -451,6 +917,320 @@ def test_find_files_listdir_depth(nc):
     assert len(result) == 6
 
 
+@pytest.mark.parametrize("nc", NC_TO_TEST[:1])
+@pytest.mark.parametrize("workers", (1, 3))
+def test_walk_iter_listdir(nc, workers):
+    nc.files.delete("test_root_folder", not_fail=True)
+    nc.files.makedirs("test_root_folder/child_folder/sub_child")
+    nc.files.mkdir("test_root_folder/child_folder2")
+    nc.files.upload("test_root_folder/1.txt", content="content!")
+    nc.files.upload("test_root_folder/child_folder/2.txt", content="content!")
+    nc.files.upload("test_root_folder/child_folder/sub_child/3.txt", content="content!")
+    try:
+        result = list(nc.files.walk("test_root_folder", workers=workers))
+        assert [i[0].user_path for i in result] == [
+            "test_root_folder/",
+            "test_root_folder/child_folder/",
+            "test_root_folder/child_folder/sub_child/",
+            "test_root_folder/child_folder2/",
+        ]
+        assert sorted(i.name for i in result[0][1]) == ["child_folder", "child_folder2"]
+        assert [i.name for i in result[0][2]] == ["1.txt"]
+        assert [i.name for i in result[2][2]] == ["3.txt"]
+        walked = []
+        for dir_node, dirs, _ in nc.files.walk("test_root_folder", workers=workers):
+            walked.append(dir_node.user_path)
+            dirs[:] = [i for i in dirs if i.name != "child_folder"]
+        assert walked == ["test_root_folder/", "test_root_folder/child_folder2/"]
+        assert list(nc.files.walk("test_root_folder/1.txt")) == []
+        result = list(nc.files.iter_listdir("test_root_folder", depth=-1))
+        assert result == nc.files.listdir("test_root_folder", depth=-1)
+        assert len(result) == 6
+        with pytest.raises(ValueError):
+            nc.files.iter_listdir(depth=0)
+    finally:
+        nc.files.delete("test_root_folder")
+
+
+@pytest.mark.parametrize("nc", NC_TO_TEST[:1])
+def test_listdir_find_table(nc):
+    nc.files.delete("test_root_folder", not_fail=True)
+    nc.files.makedirs("test_root_folder/child_folder")
+    nc.files.upload("test_root_folder/5_bytes.txt", content="12345")
+    nc.files.upload("test_root_folder/child_folder/3_bytes.txt", content="123")
+    try:
+        table = nc.files.listdir_table("test_root_folder")
+        assert isinstance(table, FsNodeTable)
+        nodes = nc.files.listdir("test_root_folder")
+        assert len(table) == len(nodes) == 2
+        assert sorted(table.fileid) == sorted(i.info.fileid for i in nodes)
+        assert sorted(table.full_path) == sorted(i.full_path for i in nodes)
+        assert sum(table.content_length) == 5
+        assert list(table.is_dir).count(1) == 1
+        for i, full_path in enumerate(table.full_path):
+            node = next(n for n in nodes if n.full_path == full_path)
+            assert table.last_modified[i] == node.info.last_modified.timestamp()
+            assert table.permissions[i] & FilePermissions.PERMISSION_READ
+        assert len(nc.files.listdir_table("test_root_folder", depth=-1)) == 3
+        assert len(nc.files.listdir_table("test_root_folder", exclude_self=False)) == 3
+        table = nc.files.find_table(["like", "name", "%_bytes.txt"], path="test_root_folder")
+        assert sorted(table.size) == [3, 5]
+        with pytest.raises(ValueError):
+            nc.files.listdir_table(depth=0)
+    finally:
+        nc.files.delete("test_root_folder")
+
+
+def test_fs_node_table():
+    table = FsNodeTable()
+    table.append("files/admin/a.txt", fileid=2, size=7, last_modified="Sat, 29 Jul 2023 11:56:31 GMT")
+    table.append("".join(["files/admin/", "dir/"]), fileid=3, permissions="RGDNVCK")
+    assert len(table) == 2
+    assert table.full_path[1] is sys.intern("files/admin/dir/")
+    assert list(table.is_dir) == [0, 1]
+    assert table.last_modified[0] == datetime(2023, 7, 29, 11, 56, 31).replace(tzinfo=timezone.utc).timestamp()
+    assert table.permissions[1] == FilePermissions.PERMISSION_READ | FilePermissions.PERMISSION_UPDATE | (
+        FilePermissions.PERMISSION_CREATE | FilePermissions.PERMISSION_DELETE | FilePermissions.PERMISSION_SHARE
+    )
+    table.remove(0)
+    assert table.full_path == ["files/admin/dir/"]
+    assert list(table.fileid) == [3]
+
+
+@pytest.mark.parametrize("nc", NC_TO_TEST[:1])
+def test_files_cache(nc):
+    nc.files.delete("test_root_folder", not_fail=True)
+    nc.files.makedirs("test_root_folder/child_folder")
+    nc.files.upload("test_root_folder/1.txt", content="1")
+    nc.files.cache = FilesCache(ttl=3600)
+    try:
+        result = nc.files.listdir("test_root_folder")
+        assert len(result) == 2
+        assert nc.files.listdir("test_root_folder") == result
+        assert len(nc.files.listdir("test_root_folder", exclude_self=False)) == 3
+        fs_node = nc.files.by_path("test_root_folder/1.txt")
+        assert nc.files.by_path("test_root_folder/1.txt") is fs_node
+        assert nc.files.by_id(fs_node.file_id) is fs_node
+        assert nc.files.by_id(fs_node.info.fileid) is fs_node
+        assert len(nc.files.find(["like", "name", "%.txt"], path="test_root_folder")) == 1
+        nc.files.upload("test_root_folder/2.txt", content="2")
+        assert len(nc.files.listdir("test_root_folder")) == 3
+        assert len(nc.files.find(["like", "name", "%.txt"], path="test_root_folder")) == 2
+        assert nc.files.by_path("test_root_folder/1.txt") is fs_node
+        nc.files.move("test_root_folder/1.txt", "test_root_folder/child_folder/1.txt")
+        with pytest.raises(NextcloudException):
+            nc.files.by_path("test_root_folder/1.txt")
+        assert len(nc.files.listdir("test_root_folder/child_folder")) == 1
+        nc.files.cache.ttl = 0
+        nc.files.cache.clear()
+        assert len(nc.files.listdir("test_root_folder")) == 2
+        nc.files.cache = None
+        nc.files.upload("test_root_folder/3.txt", content="3")
+        nc.files.cache = FilesCache(ttl=0)
+        assert len(nc.files.listdir("test_root_folder")) == 3
+    finally:
+        nc.files.cache = None
+        nc.files.delete("test_root_folder")
+
+
+def test_files_cache_eviction():
+    cache = FilesCache(max_size=2)
+    fs_node1 = FsNode("files/admin/a/1.txt", file_id="00000001oc", fileid=1, etag="1")
+    fs_node2 = FsNode("files/admin/b/2.txt", file_id="00000002oc", fileid=2, etag="2")
+    cache.put(("by_path", "files/admin/a/1.txt"), fs_node1, fs_node1.full_path, fs_node1.etag)
+    cache.put(("by_path", "files/admin/b/2.txt"), fs_node2, fs_node2.full_path, fs_node2.etag)
+    assert cache.path_by_id("1", "files/admin") == "files/admin/a/1.txt"
+    assert cache.path_by_id("00000002oc", "files/admin") == "files/admin/b/2.txt"
+    assert cache.path_by_id("1", "files/user") is None
+    assert cache.get(("by_path", "files/admin/a/1.txt")).value is fs_node1
+    cache.put(("listdir", "files/admin/a", 1), [fs_node1], "/files/admin/a", "3")
+    assert len(cache) == 2
+    assert cache.get(("by_path", "files/admin/b/2.txt")) is None
+    assert cache.path_by_id("2", "files/admin") is None
+    cache.invalidate("/files/admin/a/1.txt")
+    assert len(cache) == 0
+    cache.put(("listdir", "files/admin/ab", 1), [], "/files/admin/ab", "4")
+    cache.invalidate("/files/admin/a")
+    assert len(cache) == 1
+    cache.invalidate("/files/admin")
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize("nc", NC_TO_TEST[:1])
+def test_download_cache(nc):
+    content = randbytes(64 * 1024)
+    nc.files.upload("test_dir_tmp/download_cache.bin", content)
+    with TemporaryDirectory() as tmp_dir:
+        nc.files.download_cache = DownloadCache(tmp_dir)
+        try:
+            fs_node = nc.files.by_path("test_dir_tmp/download_cache.bin")
+            assert nc.files.download(fs_node) == content
+            assert len(os.listdir(tmp_dir)) == 1
+            assert nc.files.download(fs_node) == content
+            assert len(os.listdir(tmp_dir)) == 1
+            buf = BytesIO()
+            nc.files.download2stream(fs_node, buf)
+            assert buf.getvalue() == content
+            nc.files.upload("test_dir_tmp/download_cache.bin", content[:1024])
+            buf = BytesIO()
+            nc.files.download2stream("test_dir_tmp/download_cache.bin", buf, workers=2, chunk_size=256)
+            assert buf.getvalue() == content[:1024]
+            assert len(os.listdir(tmp_dir)) == 2
+            methods = []
+            request_hooks = nc._session.adapter.event_hooks["request"]
+            request_hooks.append(lambda request: methods.append(request.method))
+            try:
+                assert nc.files.download("test_dir_tmp/download_cache.bin") == content[:1024]
+            finally:
+                request_hooks.pop()
+            assert methods == ["GET"]  # the ETag of the response is checked, no separate PROPFIND
+            assert len(os.listdir(tmp_dir)) == 2
+        finally:
+            nc.files.download_cache = None
+            nc.files.delete("test_dir_tmp/download_cache.bin")
+
+
+def test_download_cache_eviction():
+    with TemporaryDirectory() as tmp_dir:
+        cache = DownloadCache(tmp_dir, max_size=150)
+        for i in range(3):
+            with cache.writer() as tmp_path:
+                with open(tmp_path, "wb") as f:
+                    f.write(bytes(60))
+                os.utime(tmp_path, (i, i))  # the oldest file is evicted first
+                cache.put(f"0000000{i}oc", f'"etag{i}"', tmp_path)
+        assert len(os.listdir(tmp_dir)) == 2
+        assert cache.open("00000000oc", "etag0") is None
+        with cache.open("00000002oc", "etag2") as f:
+            assert f.read() == bytes(60)
+        with cache.writer() as tmp_path:
+            pass  # not stored temporary files are removed
+        assert len(os.listdir(tmp_dir)) == 2
+        cache.clear()
+        assert not os.listdir(tmp_dir)
+
+
+@pytest.mark.parametrize("nc", NC_TO_TEST[:1])
+def test_upload_download_tree(nc):
+    nc.files.delete("test_root_folder", not_fail=True)
+    content = randbytes(64 * 1024)
+    with TemporaryDirectory() as src_dir, TemporaryDirectory() as dst_dir:
+        os.makedirs(os.path.join(src_dir, "child_folder", "sub_child"))
+        os.makedirs(os.path.join(src_dir, "empty_folder"))
+        with open(os.path.join(src_dir, "child_folder", "sub_child", "big.bin"), "wb") as f:
+            f.write(content)
+        for i in range(5):
+            with open(os.path.join(src_dir, "child_folder", f"{i}.txt"), "wb") as f:
+                f.write(str(i).encode())
+        try:
+            stats = nc.files.upload_tree("test_root_folder/tree", src_dir, chunk_size=16 * 1024, workers=3)
+            assert (stats.files, stats.directories, stats.size) == (6, 3, len(content) + 5)
+            assert stats.throughput > 0
+            assert nc.files.download("test_root_folder/tree/child_folder/sub_child/big.bin") == content
+            assert len(nc.files.listdir("test_root_folder/tree/empty_folder", exclude_self=False)) == 1
+            stats = nc.files.download_tree("test_root_folder/tree", dst_dir, chunk_size=16 * 1024)
+            assert (stats.files, stats.directories, stats.size) == (6, 3, len(content) + 5)
+            with open(os.path.join(dst_dir, "child_folder", "sub_child", "big.bin"), "rb") as f:
+                assert f.read() == content
+            with open(os.path.join(dst_dir, "child_folder", "3.txt"), "rb") as f:
+                assert f.read() == b"3"
+            assert os.path.isdir(os.path.join(dst_dir, "empty_folder"))
+            nc.files.upload_tree("test_root_folder/tree", src_dir)  # existing directories are not an error
+        finally:
+            nc.files.delete("test_root_folder")
+
+
+@pytest.mark.parametrize("nc", NC_TO_TEST[:1])
+def test_upload_tree_skip_unchanged(nc):
+    nc.files.delete("test_root_folder", not_fail=True)
+    with TemporaryDirectory() as src_dir:
+        os.makedirs(os.path.join(src_dir, "child_folder"))
+        for i in range(5):
+            with open(os.path.join(src_dir, "child_folder", f"{i}.txt"), "wb") as f:
+                f.write(str(i).encode())
+        try:
+            stats = nc.files.upload_tree("test_root_folder", src_dir, skip_unchanged=True)
+            assert (stats.files, stats.directories, stats.skipped) == (5, 1, 0)
+            assert nc.files.by_path("test_root_folder/child_folder/1.txt").info.checksums
+            stats = nc.files.upload_tree("test_root_folder", src_dir, skip_unchanged=True, workers=2)
+            assert (stats.files, stats.directories, stats.skipped, stats.size) == (0, 0, 5, 0)
+            with open(os.path.join(src_dir, "child_folder", "3.txt"), "wb") as f:
+                f.write(b"x")
+            stats = nc.files.upload_tree("test_root_folder", src_dir, skip_unchanged=True)
+            assert (stats.files, stats.skipped) == (1, 4)
+            assert nc.files.download("test_root_folder/child_folder/3.txt") == b"x"
+        finally:
+            nc.files.delete("test_root_folder")
+
+
+@pytest.mark.parametrize("nc", NC_TO_TEST[:1])
+def test_sync(nc):
+    nc.files.delete("test_root_folder", not_fail=True)
+    nc.files.makedirs("test_root_folder/child_folder/sub_child")
+    nc.files.upload("test_root_folder/1.txt", content="1")
+    nc.files.upload("test_root_folder/child_folder/2.txt", content="2")
+    nc.files.upload("test_root_folder/child_folder/sub_child/3.txt", content="3")
+    try:
+        with TemporaryDirectory() as tmp_dir:
+            plan = nc.files.sync(tmp_dir, "test_root_folder", workers=2)
+            assert plan.mkdir == ["child_folder", "child_folder/sub_child"]
+            assert sorted(plan.transfer) == ["1.txt", "child_folder/2.txt", "child_folder/sub_child/3.txt"]
+            with open(os.path.join(tmp_dir, "child_folder", "sub_child", "3.txt"), "rb") as f:
+                assert f.read() == b"3"
+            assert not nc.files.sync(tmp_dir, "test_root_folder")
+            nc.files.upload("test_root_folder/child_folder/2.txt", content="22")
+            nc.files.delete("test_root_folder/child_folder/sub_child")
+            with open(os.path.join(tmp_dir, "local.txt"), "wb") as f:
+                f.write(b"local")
+            assert nc.files.sync(tmp_dir, "test_root_folder", dry_run=True) == SyncPlan(
+                delete=["child_folder/sub_child"], transfer=["child_folder/2.txt"]
+            )
+            nc.files.sync(tmp_dir, "test_root_folder")
+            assert not os.path.exists(os.path.join(tmp_dir, "child_folder", "sub_child"))
+            assert os.path.isfile(os.path.join(tmp_dir, "local.txt"))
+            plan = nc.files.sync(tmp_dir, "test_root_folder", "upload")
+            assert plan == SyncPlan(transfer=["local.txt"])
+            assert nc.files.download("test_root_folder/local.txt") == b"local"
+            os.remove(os.path.join(tmp_dir, "1.txt"))
+            assert nc.files.sync(tmp_dir, "test_root_folder", "upload") == SyncPlan(delete=["1.txt"])
+            assert len(nc.files.listdir("test_root_folder")) == 2
+            assert not nc.files.sync(tmp_dir, "test_root_folder", "upload")
+            with pytest.raises(ValueError):
+                nc.files.sync(tmp_dir, "test_root_folder", "both")
+    finally:
+        nc.files.delete("test_root_folder")
+
+
+def test_build_sync_plan():
+    state = {
+        "a": SyncEntry("1", 0, 0.0, "1", True),
+        "a/1.txt": SyncEntry("2", 3, 10.0, "2", False),
+        "a/2.txt": SyncEntry("3", 3, 10.0, "3", False),
+        "b.txt": SyncEntry("4", 1, 10.0, "4", False),
+    }
+    remote = {
+        "a": SyncEntry("5", 0, 0.0, "1", True),
+        "a/1.txt": SyncEntry("2", 3, 0.0, "2", False),
+        "a/2.txt": SyncEntry("6", 4, 0.0, "3", False),
+        "c": SyncEntry("7", 0, 0.0, "7", True),
+        "c/3.txt": SyncEntry("8", 1, 0.0, "8", False),
+    }
+    local = {
+        "a": SyncEntry("", 0, 10.0, "", True),
+        "a/1.txt": SyncEntry("", 3, 10.0, "", False),
+        "a/2.txt": SyncEntry("", 3, 10.0, "", False),
+        "b.txt": SyncEntry("", 1, 10.0, "", False),
+        "untracked.txt": SyncEntry("", 1, 10.0, "", False),
+        "c": SyncEntry("", 1, 10.0, "", False),
+    }
+    assert build_sync_plan(True, remote, local, state) == SyncPlan(
+        delete=["b.txt", "c"], mkdir=["c"], transfer=["a/2.txt", "c/3.txt"]
+    )
+    assert build_sync_plan(False, remote, local, state) == SyncPlan(
+        delete=["c"], transfer=["a/2.txt", "b.txt", "c", "untracked.txt"]
+    )
+
+
 @pytest.mark.parametrize("nc", NC_TO_TEST[:1])
 def test_fs_node_fields(nc):
     nc.files.delete("test_root_folder", not_fail=True)
@@ -521,7 +1301,155 @@ def test_makedirs(nc):
     assert exc_info.value.status_code == 405
     result = nc.files.makedirs("abc/def", exist_ok=True)
     assert result is None
+    result = nc.files.makedirs("abc/def/ghi/jkl", exist_ok=True)
+    assert result.user_path == "abc/def/ghi/jkl/"
+    nc.files.delete("abc/def")
+    assert nc.files.makedirs("abc/def/ghi", exist_ok=True).is_dir  # deleted directories are forgotten
     nc.files.delete("abc")
+    nc.files.makedirs("abc", exist_ok=True)
+    nc.files._known_dirs.add(nc.user, ["abc/def"])  # the directory deleted by another client
+    assert nc.files.makedirs("abc/def/ghi", exist_ok=True).is_dir
+    nc.files._known_dirs.add(nc.user, ["abc/leaf"])  # the last directory is not trusted from the remembered ones
+    assert nc.files.makedirs("abc/leaf", exist_ok=True).is_dir
+    assert nc.files.makedirs("abc/leaf", exist_ok=True) is None
+    nc.files.delete("abc/leaf")
+    nc.files.makedirs_many(["abc/def/ghi", "abc/x/y", "/abc/x/z/", "abc/d"], workers=2)
+    assert sorted(i.name for i in nc.files.listdir("abc")) == ["d", "def", "x"]
+    assert sorted(i.name for i in nc.files.listdir("abc/x")) == ["y", "z"]
+    nc.files.delete("abc")
+
+
+def test_build_report_req():
+    req = build_report_req({"favorite": True, "systemtag": [1, 2]}, ["oc:fileid"])
+    root = ElementTree.fromstring(req)
+    assert [i.tag for i in root.find("{DAV:}prop")] == ["{http://owncloud.org/ns}fileid"]
+    rules = root.find("{http://owncloud.org/ns}filter-rules")
+    assert [(i.tag.split("}")[1], i.text) for i in rules] == [("favorite", "1"), ("systemtag", "1"), ("systemtag", "2")]
+
+
+def test_build_find_request_limit_order():
+    root = ElementTree.fromstring(build_find_request(["gt", "size", 0], "", "admin", 5, 10, ["name", "-size"]))
+    orders = root.find("{DAV:}basicsearch/{DAV:}orderby")
+    assert [(i[0][0].tag, i[1].tag) for i in orders] == [
+        ("{DAV:}displayname", "{DAV:}ascending"),
+        ("{http://owncloud.org/ns}size", "{DAV:}descending"),
+    ]
+    assert root.findtext("{DAV:}basicsearch/{DAV:}limit/{DAV:}nresults") == "5"
+    assert root.findtext("{DAV:}basicsearch/{DAV:}limit/{http://nextcloud.org/ns}firstresult") == "10"
+    root = ElementTree.fromstring(build_find_request(["gt", "size", 0], "", "admin"))
+    assert root.find("{DAV:}basicsearch/{DAV:}limit") is None
+
+
+def test_search_query():
+    query = (SearchQuery.prop("size") > 1) & (SearchQuery.prop("size") < 5) & SearchQuery.prop("name").like("a<b%")
+    root = ElementTree.fromstring(f'<d:where xmlns:d="DAV:" xmlns:oc="http://owncloud.org/ns">{query.xml()}</d:where>')
+    assert [i.tag for i in root[0]] == ["{DAV:}gt", "{DAV:}lt", "{DAV:}like"]
+    assert root[0][2].findtext("{DAV:}literal") == "a<b%"
+    assert (~query).xml() == f"<d:not>{query.xml()}</d:not>"
+    query = (SearchQuery.prop("fileid") == SearchQuery.param("id")) | (SearchQuery.prop("favorite") == 1)
+    assert query.xml({"id": 5}) != query.xml({"id": 6})
+    assert "<d:literal>6</d:literal>" in query.xml({"id": 6})
+    with pytest.raises(ValueError):
+        query.xml()
+    with pytest.raises(ValueError):
+        SearchQuery.prop("unknown")
+    req = ["or", "eq", "name", "a", "gt", "size", 3, "like", "mime", "image/%"]
+    expected = ((SearchQuery.prop("name") == "a") | (SearchQuery.prop("size") > 3)) & SearchQuery.prop("mime").like(
+        "image/%"
+    )
+    assert search_query_from_list(req).xml() == expected.xml()
+    assert len(req) == 10
+    assert build_find_request(req, "", "admin") == build_find_request(expected, "", "admin")
+
+
+def test_known_dirs():
+    assert build_path_prefixes("/a/b//c/") == ["a", "a/b", "a/b/c"]
+    assert build_path_prefixes("") == []
+    known_dirs = KnownDirs()
+    known_dirs.add("admin", ["a", "a/b", "a/bc", "a/b/c"])
+    assert known_dirs.depth("admin", ["a", "a/b", "a/b/c", "a/b/c/d"]) == 3
+    assert known_dirs.depth("admin", ["x", "x/y"]) == 0
+    assert known_dirs.depth("admin", ["a", "a/b", "a/b/c"]) == 2
+    assert known_dirs.depth("user", ["a", "a/b", "a/b/c", "a/b/c/d"]) == 0
+    known_dirs.forget("admin", ["/a/b/", "a/bc/file.txt"])
+    assert known_dirs.depth("admin", ["a", "a/b", "a/b/c", "a/b/c/d"]) == 1
+    assert known_dirs.depth("admin", ["a", "a/bc", "a/bc/d"]) == 2
+    known_dirs.clear("admin")
+    assert known_dirs.depth("admin", ["a", "a/bc", "a/bc/d"]) == 0
+
+
+def test_walk_frontier():
+    class Listing:  # stands for the future or the task of the directory listing
+        def __init__(self, path):
+            self.path = path
+            self.cancelled = False
+
+        def cancel(self):
+            self.cancelled = True
+
+    started = []
+
+    def start(path):
+        started.append(Listing(path))
+        return started[-1]
+
+    frontier = WalkFrontier("a", 2)
+    assert frontier.next(start).path == "a"
+    frontier.extend([FsNode(f"files/admin/a/{i}/") for i in ("b", "c", "d")])
+    assert frontier.next(start).path == "a/b/"  # the listing of the next directory is started ahead
+    assert [i.path for i in started] == ["a", "a/b/", "a/c/"]
+    frontier.extend([])
+    assert frontier.next(start).path == "a/c/"
+    assert [i.path for i in started] == ["a", "a/b/", "a/c/", "a/d/"]
+    assert frontier
+    frontier.cancel()
+    assert [i.path for i in started if i.cancelled] == ["a/d/"]
+
+
+def test_ranged_download():
+    fp = BytesIO(b"123")
+    fp.seek(3)
+    plan = RangedDownload(fp, chunk_size=100, workers=2)
+    assert plan.first_headers() == {"Range": "bytes=0-99"}
+    parts = plan.parts(httpx.Response(206, headers={"Content-Range": "bytes 0-99/250"}), '"etag"')
+    assert parts == [
+        ({"Range": "bytes=100-199", "If-Range": '"etag"'}, 103),
+        ({"Range": "bytes=200-249", "If-Range": '"etag"'}, 203),
+    ]
+    assert plan.end == 253
+    assert not plan.parts(httpx.Response(200), '"etag"')  # the server ignored `Range`
+    plan = RangedDownload(fp, chunk_size=100, workers=2, verify=True)
+    assert not plan.parallel
+    assert plan.first_headers() == {}
+
+
+def test_chunked_upload(tmp_path):
+    journal = tmp_path / "journal"
+    upload = ChunkedUpload("admin", "a.bin", chunk_size=100, journal=journal, verify=True)
+    assert not upload.dav_path
+    dav_path = upload.new_folder()
+    assert dav_path.startswith("/uploads/admin/")
+    upload.started()
+    chunk = (b"1" * 100, None, None)
+    assert upload.next_chunk(chunk) == 0
+    assert upload.chunk_request(0, chunk) == (dav_path + "/000000000000000-000000000000100", {})
+    upload.chunk_done(0, chunk[0])
+    assert not upload.finish(False)  # the folder is kept to resume the upload
+    upload = ChunkedUpload("admin", "a.bin", chunk_size=100, journal=journal)
+    assert upload.dav_path == dav_path
+    assert not upload.resume(None)  # the folder expired on the server
+    assert upload.resume({"000000000000000-000000000000100": 100, "000000000000100-000000000000200": 100})
+    assert upload.next_chunk(chunk) is None
+    assert upload.next_chunk((b"2" * 50, None, "SHA1:abc")) == 100
+    assert upload.chunk_request(100, (b"2" * 50, None, "SHA1:abc"))[1] == {"OC-Checksum": "SHA1:abc"}
+    assert upload.stale_chunks() == [dav_path + "/000000000000100-000000000000200"]
+    assert upload.size == 150
+    assert upload.move_headers("https://cloud/remote.php/dav") == {
+        "Destination": "https://cloud/remote.php/dav/files/admin/a.bin"
+    }
+    assert upload.finish(True)
+    assert not journal.exists()
+    assert not ChunkedUpload("admin", "b.bin", chunk_size=100, journal=journal).dav_path
 
 
 @pytest.mark.parametrize("nc", NC_TO_TEST[:1])
@@ -598,6 +1526,80 @@ def test_download_as_zip(nc):
         nc.files.delete("test_root_folder")
 
 
+@pytest.mark.parametrize("nc", NC_TO_TEST)
+def test_download_as_zip_stream(nc):
+    nc.files.makedirs("test_root_folder/test_subfolder", exist_ok=True)
+    try:
+        content = randbytes(64 * 1024)
+        nc.files.upload("test_root_folder/0.txt", content="")
+        nc.files.upload("test_root_folder/test_subfolder/1.bin", content=content)
+        buf = BytesIO()
+        nc.files.download_directory_as_zip2stream("test_root_folder", buf, chunk_size=1000)
+        with zipfile.ZipFile(buf, "r") as zip_ref:
+            assert zip_ref.read("test_root_folder/test_subfolder/1.bin") == content
+        assert b"".join(nc.files.iter_directory_as_zip("test_root_folder", chunk_size=333)) == buf.getvalue()
+        entries = {}
+        for name, data_chunk in nc.files.iter_directory_as_zip_entries("test_root_folder", chunk_size=777):
+            entries[name] = entries.get(name, b"") + data_chunk
+        assert entries == {
+            "test_root_folder/": b"",
+            "test_root_folder/0.txt": b"",
+            "test_root_folder/test_subfolder/": b"",
+            "test_root_folder/test_subfolder/1.bin": content,
+        }
+        with pytest.raises(TypeError):
+            nc.files.download_directory_as_zip2stream("test_root_folder", 1)
+    finally:
+        nc.files.delete("test_root_folder")
+
+
+@pytest.mark.asyncio(scope="session")
+@pytest.mark.parametrize("anc", ANC_TO_TEST)
+async def test_download_as_zip_stream_async(anc):
+    await anc.files.makedirs("test_root_folder", exist_ok=True)
+    try:
+        content = randbytes(64 * 1024)
+        await anc.files.upload("test_root_folder/1.bin", content=content)
+        buf = BytesIO()
+        await anc.files.download_directory_as_zip2stream("test_root_folder", buf)
+        assert b"".join([i async for i in anc.files.iter_directory_as_zip("test_root_folder")]) == buf.getvalue()
+        entries = {}
+        async for name, data_chunk in anc.files.iter_directory_as_zip_entries("test_root_folder", chunk_size=777):
+            entries[name] = entries.get(name, b"") + data_chunk
+        assert entries == {"test_root_folder/": b"", "test_root_folder/1.bin": content}
+    finally:
+        await anc.files.delete("test_root_folder")
+
+
+@pytest.mark.parametrize("compression", (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED))
+@pytest.mark.parametrize("force_zip64", (False, True))
+def test_zip_stream_parser(compression, force_zip64):
+    class NonSeekable(BytesIO):
+        def seek(self, *args):
+            raise OSError("not seekable")
+
+    files = {"dir/": b"", "dir/0.txt": b"", "dir/1.bin": randbytes(70000), "dir/2.txt": b"PK\x07\x08" * 1000}
+    for seekable in (True, False):
+        buf = BytesIO() if seekable else NonSeekable()  # non-seekable output makes the data descriptors
+        with zipfile.ZipFile(buf, "w", compression=compression) as zip_ref:
+            for name, data in files.items():
+                with zip_ref.open(name, "w", force_zip64=force_zip64) as f:
+                    f.write(data)
+        archive = buf.getvalue()
+        for step in (1, 1000, len(archive)):
+            parser = ZipStreamParser()
+            entries = {}
+            for i in range(0, len(archive), step):
+                for name, data_chunk in parser.feed(archive[i : i + step]):
+                    entries[name] = entries.get(name, b"") + data_chunk
+            parser.close()
+            assert entries == files
+        parser = ZipStreamParser()
+        parser.feed(archive[:1000])
+        with pytest.raises(zipfile.BadZipFile):
+            parser.close()
+
+
 @pytest.mark.parametrize("nc", NC_TO_TEST[:1])
 def test_fs_node_is_xx(nc):
     nc.files.delete("test_root_folder", not_fail=True)
@@ -623,3 +1625,12 @@ def test_fs_node_last_modified_time():
     assert fs_node.info.last_modified == datetime(2023, 7, 29, 11, 56, 31)
     fs_node = FsNode("", last_modified=datetime(2022, 4, 5, 1, 2, 3))
     assert fs_node.info.last_modified == datetime(2022, 4, 5, 1, 2, 3)
+
+
+def test_fs_node_slots():
+    fs_node = FsNode("files/admin/test.txt", last_modified="Sat, 29 Jul 2023 11:56:31 GMT", permissions="RGDNVW")
+    assert not hasattr(fs_node, "__dict__")
+    assert not hasattr(fs_node.info, "__dict__")
+    assert fs_node.info.last_modified.year == 2023
+    fs_node.info.last_modified = "Sun, 30 Jul 2023 11:56:31 GMT"
+    assert fs_node.info.last_modified.day == 30
@@ -1,6 +1,6 @@
 from os import environ
 
-from nc_py_api import Nextcloud, NextcloudApp
+from nc_py_api import AsyncNextcloud, AsyncNextcloudApp, Nextcloud, NextcloudApp
 
 if not environ.get("CI", False):  # For local tests
     environ["NC_AUTH_USER"] = "admin"
@@ -26,4 +26,13 @@ if NC:
 if NC_APP:
     NC_TO_TEST.append(NC_APP)
 
+ANC = None if NC is None else AsyncNextcloud()
+ANC_APP = None if NC_APP is None else AsyncNextcloudApp(user="admin")
+
+ANC_TO_TEST = []
+if ANC:
+    ANC_TO_TEST.append(ANC)
+if ANC_APP:
+    ANC_TO_TEST.append(ANC_APP)
+
 NC_VERSION = NC_TO_TEST[0].srv_version if NC_TO_TEST else {}
@@ -1,7 +1,7 @@
 from os import environ
 
 import pytest
-from gfixture import NC, NC_APP
+from gfixture import ANC_APP, NC, NC_APP
 
 from nc_py_api.ex_app import ApiScope
 
@@ -15,6 +15,13 @@ def test_get_users_list():
     assert NC_APP.user in users
 
 
+@pytest.mark.asyncio(scope="session")
+async def test_get_users_list_async():
+    users = await ANC_APP.users_list()
+    assert users
+    assert ANC_APP.user in users
+
+
 def test_scope_allowed():
     for i in ApiScope:
         assert NC_APP.scope_allowed(i)
@@ -52,3 +59,17 @@ def test_change_user():
     finally:
         NC_APP.user = orig_user
     assert orig_capabilities == NC_APP.capabilities
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_change_user_async():
+    orig_user = ANC_APP.user
+    try:
+        orig_capabilities = await ANC_APP.capabilities()
+        assert await ANC_APP.user_status.available
+        await ANC_APP.set_user("")
+        assert not await ANC_APP.user_status.available
+        assert orig_capabilities != await ANC_APP.capabilities()
+    finally:
+        await ANC_APP.set_user(orig_user)
+    assert orig_capabilities == await ANC_APP.capabilities()
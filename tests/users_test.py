@@ -1,7 +1,7 @@
 import contextlib
 
 import pytest
-from gfixture import NC_TO_TEST
+from gfixture import ANC_TO_TEST, NC_TO_TEST
 
 from nc_py_api import Nextcloud, NextcloudException, NextcloudExceptionNotFound
 
@@ -98,6 +98,15 @@ def test_users_get_list(nc):
     nc.users.delete(TEST_USER_NAME)
 
 
+@pytest.mark.asyncio(scope="session")
+@pytest.mark.parametrize("anc", ANC_TO_TEST[:1])
+async def test_users_get_list_async(anc):
+    users = await anc.users.get_list()
+    assert isinstance(users, list)
+    assert "admin" in users
+    assert await anc.users.get_details("admin")
+
+
 @pytest.mark.skipif(not isinstance(NC_TO_TEST[:1][0], Nextcloud), reason="Not available for NextcloudApp.")
 @pytest.mark.parametrize("nc", NC_TO_TEST[:1])
 def test_enable_disable_user(nc):